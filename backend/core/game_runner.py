@@ -1,12 +1,13 @@
 import asyncio
 import os
-from typing import Tuple
-import numpy as np
+from typing import Optional, Tuple
 from stable_baselines3 import PPO
 
 from src.constants import FPS
 from src.fighting_env import FightingEnv
-from src.rhythm_analyzer import RhythmAnalyzer
+from src.rhythm_analyzer import BatchedRhythmAnalyzer
+from src.rl_training.observation import ObservationBuilder, ObservationSchema
+from src.rl_training.vec_env import RHYTHM_WINDOW
 
 # Define MODEL_DIR
 MODEL_DIR = "./models/ppo_fighting_env_multi_agent"
@@ -18,7 +19,14 @@ class GameRunner:
     (gRPC streaming functionality removed as per user instruction)
     """
 
-    def __init__(self, match_id: str, player1_id: str, player2_id: str, backend_peer_id: str):
+    def __init__(
+        self,
+        match_id: str,
+        player1_id: str,
+        player2_id: str,
+        backend_peer_id: str,
+        observation_schema: Optional[ObservationSchema] = None,
+    ):
         self.match_id = match_id
         self.player1_id = player1_id
         self.player2_id = player2_id
@@ -26,9 +34,14 @@ class GameRunner:
         self.env = FightingEnv(backend_peer_id=backend_peer_id, test_mode=True)
         self.obs, _ = self.env.reset()  # Store initial observation
 
-        # Initialize RhythmAnalyzers for both players
-        self.player1_analyzer = RhythmAnalyzer(window_size=50, fps=FPS)
-        self.player2_analyzer = RhythmAnalyzer(window_size=50, fps=FPS)
+        # Policy observations are built exactly as FightingVecEnv builds them in training
+        self.observation_builder = ObservationBuilder(observation_schema)
+        self.rhythm_analyzer = None
+        if self.observation_builder.schema.rhythm:
+            # Rows: [Player 1, Player 2]
+            self.rhythm_analyzer = BatchedRhythmAnalyzer(2, RHYTHM_WINDOW, FPS)
+            self.rhythm_analyzer.get_feature_vectors(out=self.observation_builder.rhythm_input)
+        self.observation_builder.reset(self.obs)
 
         # Player action states
         self.player1_moving = 0  # 0 = not moving, -1 = left, 1 = right
@@ -100,41 +113,29 @@ class GameRunner:
         )
 
         tick_rate = 1.0 / FPS
+        # Frames stepped by this loop; the test-mode env has no game object to ask
+        frame = 0
 
         while self._running:
             loop_start_time = asyncio.get_event_loop().time()
 
-            # --- Enrich observation with Rhythm Analysis ---
-            p1_rhythm_vec = self.player1_analyzer.get_feature_vector()
-            p2_rhythm_vec = self.player2_analyzer.get_feature_vector()
-            enriched_obs = np.concatenate([self.obs, p1_rhythm_vec, p2_rhythm_vec])
-
             # --- Get AI actions (if model is loaded) ---
             ai_actions = (0, 0)
             if self.model:
-                # Use the enriched observation for prediction
-                actions_array, _ = self.model.predict(enriched_obs, deterministic=True)
+                # Same observation layout (rhythm features, history) the model was trained on
+                actions_array, _ = self.model.predict(self.observation_builder.observation, deterministic=True)
                 ai_actions = tuple(actions_array)
 
             # --- Step the environment ---
             next_obs, reward, done, _, info = self.env.step(ai_actions)
             self.obs = next_obs  # Update base observation for the next frame
+            frame += 1
 
-            # --- Update Rhythm Analyzers with the actions taken ---
-            # (Assuming ai_actions contains the actions for player1 and player2)
-            # We need a mapping from action ID to action name, this should be in constants
-            ACTION_MAP = {
-                0: "IDLE",
-                1: "MOVE",
-                2: "MOVE",
-                3: "JUMP",
-                4: "PUNCH",
-                5: "KICK",
-            }  # Example map
-            p1_action_name = ACTION_MAP.get(ai_actions[0], "UNKNOWN")
-            p2_action_name = ACTION_MAP.get(ai_actions[1], "UNKNOWN")
-            self.player1_analyzer.add_action(p1_action_name, self.env.game.frame_count)
-            self.player2_analyzer.add_action(p2_action_name, self.env.game.frame_count)
+            # --- Update rhythm features with the actions taken and append the frame ---
+            if self.rhythm_analyzer is not None:
+                self.rhythm_analyzer.add_actions(ai_actions, frame)
+                self.rhythm_analyzer.get_feature_vectors(out=self.observation_builder.rhythm_input)
+            self.observation_builder.push(self.obs)
 
             # Game state would have been streamed here via gRPC
             # For now, just print a message
@@ -143,16 +144,16 @@ class GameRunner:
             if done:
                 self._running = False
                 winner_id = "0"  # Draw by default
-                p1 = self.env.game.player1
-                p2 = self.env.game.player2
-                if p1.health <= 0:
+                # Normalised health from the observation ([p1_x, p1_y, p1_hp, p1_state, p2_x, ...])
+                p1_health, p2_health = self.obs[2], self.obs[6]
+                if p1_health <= 0:
                     winner_id = self.player2_id
-                elif p2.health <= 0:
+                elif p2_health <= 0:
                     winner_id = self.player1_id
                 else:  # Timer ran out
-                    if p1.health > p2.health:
+                    if p1_health > p2_health:
                         winner_id = self.player1_id
-                    elif p2.health > p1.health:
+                    elif p2_health > p1_health:
                         winner_id = self.player2_id
                 print(f"Match {self.match_id} ended. Winner: {winner_id}")
 
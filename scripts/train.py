@@ -6,11 +6,17 @@ import yaml # Import yaml
 from stable_baselines3.common.env_util import make_vec_env
 from stable_baselines3.common.callbacks import EvalCallback, StopTrainingOnRewardThreshold
 from stable_baselines3.common.monitor import Monitor
+from stable_baselines3.common.vec_env import DummyVecEnv, VecEnv
 
 from src.rl_training.environment import FightingEnv
 from src.simulation.simulation_manager import SimulationManager
 from src.rl_training.policies import PolicyManager # Import PolicyManager
 from src.rl_training.wrappers import FlattenActionSpaceWrapper # Import the custom wrapper
+from src.rl_training.vec_env import FightingVecEnv
+from src.rl_training.shm_vec_env import SharedMemoryVecEnv
+from src.rl_training.observation import ObservationSchema
+from src.rl_training.callbacks import LeagueCallback, StepTimingCallback
+from src.rl_training.league import LeagueVecEnv, OpponentPool
 
 # Configuration
 LOG_DIR = "./logs/ppo_fighting_env_multi_agent"
@@ -38,18 +44,53 @@ def train_agent(total_timesteps: int = None, seed: int = None, backend_peer_id:
     sim_manager = SimulationManager(seed=seed)
     sim_manager.start_logging(LOG_DIR)
 
-    # Create training environment
-    # Monitor wrapper is important for EvalCallback to log episode stats
-    env = FightingEnv(backend_peer_id=backend_peer_id)
-    env = FlattenActionSpaceWrapper(env)
-    env = Monitor(env, LOG_DIR)
-    # Vectorized environments are often used for faster training
-    vec_env = make_vec_env(lambda: env, n_envs=training_config['n_envs'])
+    env_backend = training_config.get('env_backend', 'webrtc')
+    # Policy observation layout (batched backend); GameRunner must serve the same schema
+    observation_schema = ObservationSchema(**training_config.get('observation', {}))
+    repeat_options = {
+        'action_repeat': training_config.get('action_repeat', 1),
+        'observation_pooling': training_config.get('observation_pooling'),
+    }
+    if env_backend == 'batched':
+        # All n_envs matches run in one batched simulation in this process
+        vec_env = FightingVecEnv(training_config['n_envs'], observation_schema=observation_schema, **repeat_options)
+        eval_env = FightingVecEnv(1, observation_schema=observation_schema, **repeat_options)
+    elif env_backend == 'subproc':
+        # One FightingEnv per worker process, each with its own peer id
+        def make_env(peer_id):
+            return lambda: Monitor(FlattenActionSpaceWrapper(FightingEnv(backend_peer_id=peer_id)))
 
-    # Create evaluation environment
-    eval_env = FightingEnv(backend_peer_id=backend_peer_id)
-    eval_env = FlattenActionSpaceWrapper(eval_env)
-    eval_env = Monitor(eval_env, LOG_DIR)
+        vec_env = SharedMemoryVecEnv(
+            [make_env(f"{backend_peer_id}_{i}") for i in range(training_config['n_envs'])]
+        )
+        eval_env = SharedMemoryVecEnv([make_env(f"{backend_peer_id}_eval")])
+    else:
+        # Create training environment
+        # Monitor wrapper is important for EvalCallback to log episode stats
+        env = FightingEnv(backend_peer_id=backend_peer_id)
+        env = FlattenActionSpaceWrapper(env)
+        env = Monitor(env, LOG_DIR)
+        # Vectorized environments are often used for faster training
+        vec_env = make_vec_env(lambda: env, n_envs=training_config['n_envs'])
+
+        # Create evaluation environment
+        eval_env = FightingEnv(backend_peer_id=backend_peer_id)
+        eval_env = FlattenActionSpaceWrapper(eval_env)
+        eval_env = Monitor(eval_env, LOG_DIR)
+
+    league_config = training_config.get('league', {})
+    opponent_pool = None
+    if league_config.get('enabled', False):
+        # Player 1 trains against frozen snapshots of itself playing Player 2
+        opponent_pool = OpponentPool(
+            max_size=league_config.get('pool_size', 20),
+            cache_size=league_config.get('cache_size', 4),
+            priority_exponent=league_config.get('priority_exponent', 2.0),
+        )
+        if not isinstance(eval_env, VecEnv):
+            eval_env = DummyVecEnv([lambda env=eval_env: env])
+        vec_env = LeagueVecEnv(vec_env, opponent_pool, seed=seed)
+        eval_env = LeagueVecEnv(eval_env, opponent_pool, deterministic=True, seed=seed, record_results=False)
 
     # Callback for evaluating and saving the best model
     # Stop training if the mean reward reaches a certain threshold
@@ -71,9 +112,15 @@ def train_agent(total_timesteps: int = None, seed: int = None, backend_peer_id:
     policy_manager = PolicyManager(active_policy_name, vec_env, policy_config, seed=sim_manager.seed_value)
     model = policy_manager.get_current_policy()
 
+    # Per-stage step latencies go to TensorBoard under timing/
+    callbacks = [eval_callback, StepTimingCallback()]
+    if opponent_pool is not None:
+        opponent_pool.add_policy("initial", model.model.policy)
+        callbacks.append(LeagueCallback(opponent_pool, league_config.get('snapshot_freq', 50000)))
+
     print(f"Starting training for {total_timesteps} timesteps using {active_policy_name} policy...")
     try:
-        model.learn(total_timesteps=total_timesteps, callback=eval_callback)
+        model.learn(total_timesteps=total_timesteps, callback=callbacks)
     except KeyboardInterrupt:
         print("Training interrupted by user.")
 
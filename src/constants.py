@@ -29,6 +29,21 @@ PUNCH_COOLDOWN = 0.5  # seconds
 ATTACK_DURATION = 0.2  # seconds
 HIT_STUN_DURATION = 0.3  # seconds
 
+# Deterministic fixed-point mode
+SUBPIXEL_SHIFT = 8  # 1 pixel = 2**8 sub-pixels
+
+# Round properties
+ROUND_TIME = 99  # seconds
+
+# Action ids (same numbering as the browser engine's applyExternalAction)
+ACTION_IDLE = 0
+ACTION_MOVE_RIGHT = 1
+ACTION_MOVE_LEFT = 2
+ACTION_JUMP = 3
+ACTION_ATTACK = 4
+ACTION_GUARD = 5
+NUM_ACTIONS = 6
+
 # AI properties
 AI_ACTION_INTERVAL = 0.5  # seconds (reduced for more aggressive AI)
 
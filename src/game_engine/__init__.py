@@ -1,17 +1,34 @@
 """
 Game Engine Module
 
-Core Pygame-based game logic including rendering, character mechanics,
-collision detection, and game state management.
+Core game logic including character mechanics, collision detection and
+game state management. `Simulation` runs without pygame; `Game` adds
+Pygame-based rendering and input on top of it.
 """
 
-from src.game_engine.game import Game
 from src.game_engine.player import Player
 from src.game_engine.collision import CollisionManager
 from src.game_engine.hitbox import Hitbox
+from src.game_engine.rect import Rect
+from src.game_engine.frame_data import MoveTable, compile_moves, compile_roster, load_roster
+from src.game_engine.motion import (
+    InputBuffer,
+    MotionAutomaton,
+    MotionInputReader,
+    MotionRecognizer,
+    compile_automaton,
+    compile_motions,
+)
+from src.game_engine.physics import FIXED_PHYSICS, FLOAT_PHYSICS, PhysicsProfile
+from src.game_engine.simulation import Simulation
+from src.game_engine.states import PlayerState, TRANSITIONS, encode_state
+from src.game_engine.batched import BatchedSimulation
 from src.game_engine.interfaces import (
+    OBSERVATION_SIZE,
+    write_observation,
     get_game_state,
     apply_ai_action,
+    apply_action,
 )
 
 __all__ = [
@@ -19,6 +36,37 @@ __all__ = [
     "Player",
     "CollisionManager",
     "Hitbox",
+    "Rect",
+    "Simulation",
+    "PlayerState",
+    "TRANSITIONS",
+    "encode_state",
+    "PhysicsProfile",
+    "FLOAT_PHYSICS",
+    "FIXED_PHYSICS",
+    "MoveTable",
+    "compile_moves",
+    "compile_roster",
+    "load_roster",
+    "InputBuffer",
+    "MotionAutomaton",
+    "MotionRecognizer",
+    "MotionInputReader",
+    "compile_automaton",
+    "compile_motions",
+    "BatchedSimulation",
+    "OBSERVATION_SIZE",
+    "write_observation",
     "get_game_state",
     "apply_ai_action",
+    "apply_action",
 ]
+
+
+def __getattr__(name):
+    # Game은 pygame을 필요로 하므로, 시뮬레이션 코어만 쓰는 경우 pygame을 import하지 않도록 지연 로드합니다.
+    if name == "Game":
+        from src.game_engine.game import Game
+
+        return Game
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
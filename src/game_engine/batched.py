@@ -0,0 +1,520 @@
+from typing import Optional
+
+import numpy as np
+
+from src.constants import (ACTION_ATTACK, ACTION_GUARD, ACTION_IDLE,
+                           ACTION_JUMP, ACTION_MOVE_LEFT, ACTION_MOVE_RIGHT,
+                           ATTACK_DURATION, FPS, GRAVITY, HIT_STUN_DURATION,
+                           INITIAL_HEALTH, JUMP_VELOCITY, PLAYER_HEIGHT,
+                           PLAYER_SPEED, PLAYER_WIDTH, PUNCH_COOLDOWN,
+                           PUNCH_DAMAGE, ROUND_TIME, SCREEN_HEIGHT,
+                           SCREEN_WIDTH)
+from src.game_engine.states import (EVENT_ATTACK, EVENT_ATTACK_END,
+                                    EVENT_GUARD, EVENT_GUARD_HIT,
+                                    EVENT_GUARD_HOLD, EVENT_GUARD_RELEASE,
+                                    EVENT_HIT, EVENT_KO, EVENT_LAND,
+                                    EVENT_SETTLE, EVENT_STUN_END,
+                                    FLAG_HIT_REACTION, FLAG_KEEPS_VELOCITY,
+                                    NUM_STATES, STATE_FLAGS, STATE_GUARD_HIT,
+                                    STATE_IDLE, TRANSITIONS)
+
+# Player.attack_hitbox 크기 (Hitbox(0, 0, width // 1.5, height // 4))
+HITBOX_WIDTH = int(PLAYER_WIDTH // 1.5)
+HITBOX_HEIGHT = PLAYER_HEIGHT // 4
+
+# write_observations() 정규화 상수 (interfaces.write_observation과 동일)
+_GROUND_Y = SCREEN_HEIGHT - PLAYER_HEIGHT
+_X_RANGE = SCREEN_WIDTH - PLAYER_WIDTH
+_STATE_SCALE = NUM_STATES - 1
+
+# 플레이어 축(axis 1)의 초기값: [Player 1, Player 2]
+_START_X = np.array([100, SCREEN_WIDTH - 100 - PLAYER_WIDTH], dtype=np.float64)
+_START_FACING = np.array([1, -1], dtype=np.int64)
+
+# Player와 같은 상태 전이/플래그 테이블 (state 배열로 바로 인덱싱)
+_TRANSITIONS = np.array(TRANSITIONS, dtype=np.int8)
+_STATE_FLAGS = np.array(STATE_FLAGS, dtype=np.int8)
+
+# step_repeat()의 관측값 풀링 방식
+POOL_MODES = ("max", "mean")
+
+# 이보다 긴 dt로 update하면 히트박스 판정을 스윕(연속) 방식으로 합니다
+_FRAME_DT = 1.0 / FPS + 1e-9
+
+
+def _sweep_interval(d0: np.ndarray, d1: np.ndarray, lo: float, hi: float):
+    """
+    상대 위치가 d0에서 d1로 선형 이동할 때 lo < d < hi인 시간 구간 (enter, exit).
+    움직이지 않으면 항상 겹치거나((-inf, inf)) 전혀 겹치지 않습니다((inf, -inf)).
+    """
+    delta = (d1 - d0).astype(np.float64)
+    moving = delta != 0
+    safe = np.where(moving, delta, 1.0)
+    t_lo = (lo - d0) / safe
+    t_hi = (hi - d0) / safe
+    inside = (lo < d0) & (d0 < hi)
+    enter = np.where(moving, np.minimum(t_lo, t_hi), np.where(inside, -np.inf, np.inf))
+    exit_ = np.where(moving, np.maximum(t_lo, t_hi), np.where(inside, np.inf, -np.inf))
+    return enter, exit_
+
+
+class BatchedSimulation:
+    """
+    N개의 매치를 NumPy 구조체 배열(struct-of-arrays)로 한 번에 진행하는 배치 엔진.
+
+    모든 플레이어별 배열은 (N, 2) 모양이며 axis 1은 [Player 1, Player 2]입니다.
+    중력, 화면 경계, 바닥 충돌, 공격/쿨다운/경직 타이머, 히트박스-허트박스 AABB
+    판정을 `Player.update`, `CollisionManager.check_player_attack`과 같은 순서와
+    규칙으로 벡터 연산하므로, 프레임 단위로 `Simulation` 결과와 비교할 수 있습니다.
+
+    Attributes:
+        num_matches (int): 동시에 진행하는 매치 수 N.
+        pos_x, pos_y (np.ndarray): 실수 위치 (Player._pos_x/_pos_y).
+        rect_x, rect_y (np.ndarray): 정수 위치 (Player.rect.x/y).
+        vel_x, vel_y (np.ndarray): 속도.
+        health (np.ndarray): 체력.
+        state (np.ndarray): PlayerState 상태 코드.
+        facing (np.ndarray): 방향 (1 또는 -1).
+        is_jumping, is_attacking, is_guarding (np.ndarray): 상태 플래그.
+        hitbox_active (np.ndarray): 공격 히트박스 활성화 여부.
+        hitbox_x, hitbox_y (np.ndarray): 공격 히트박스 위치.
+        attack_timer, punch_cooldown_timer, hit_stun_timer, hit_text_timer (np.ndarray): 타이머.
+        frame_count (np.ndarray): 매치별 진행 프레임 수 (N,).
+        round_timer (np.ndarray): 매치별 남은 라운드 시간 (N,).
+        timer_accumulator (np.ndarray): 매치별 라운드 타이머 누적 시간 (N,).
+        round_over (np.ndarray): 매치별 라운드 종료 여부 (N,).
+    """
+
+    def __init__(self, num_matches: int):
+        """
+        BatchedSimulation 객체를 초기화합니다.
+
+        Args:
+            num_matches (int): 동시에 진행할 매치 수.
+        """
+        if num_matches <= 0:
+            raise ValueError("num_matches must be a positive integer.")
+        self.num_matches = num_matches
+        shape = (num_matches, 2)
+
+        self.pos_x = np.zeros(shape, dtype=np.float64)
+        self.pos_y = np.zeros(shape, dtype=np.float64)
+        self.rect_x = np.zeros(shape, dtype=np.int64)
+        self.rect_y = np.zeros(shape, dtype=np.int64)
+        self.vel_x = np.zeros(shape, dtype=np.float64)
+        self.vel_y = np.zeros(shape, dtype=np.float64)
+        self.health = np.zeros(shape, dtype=np.int64)
+        self.state = np.zeros(shape, dtype=np.int8)
+        self.facing = np.zeros(shape, dtype=np.int64)
+        self.is_jumping = np.zeros(shape, dtype=bool)
+        self.is_attacking = np.zeros(shape, dtype=bool)
+        self.is_guarding = np.zeros(shape, dtype=bool)
+        self.hitbox_active = np.zeros(shape, dtype=bool)
+        self.hitbox_x = np.zeros(shape, dtype=np.int64)
+        self.hitbox_y = np.zeros(shape, dtype=np.int64)
+        self.attack_timer = np.zeros(shape, dtype=np.float64)
+        self.punch_cooldown_timer = np.zeros(shape, dtype=np.float64)
+        self.hit_stun_timer = np.zeros(shape, dtype=np.float64)
+        self.hit_text_timer = np.zeros(shape, dtype=np.float64)
+
+        self.frame_count = np.zeros(num_matches, dtype=np.int64)
+        self.round_timer = np.zeros(num_matches, dtype=np.int64)
+        self.timer_accumulator = np.zeros(num_matches, dtype=np.float64)
+        self.round_over = np.zeros(num_matches, dtype=bool)
+        self._all_matches = np.ones(num_matches, dtype=bool)
+
+        self.reset()
+
+    def reset(self, mask: Optional[np.ndarray] = None) -> None:
+        """
+        매치를 초기 상태로 되돌립니다.
+
+        Args:
+            mask (Optional[np.ndarray]): (N,) bool 배열. 지정하면 True인 매치만 초기화합니다.
+        """
+        m = slice(None) if mask is None else np.asarray(mask, dtype=bool)
+
+        self.pos_x[m] = _START_X
+        self.pos_y[m] = SCREEN_HEIGHT - PLAYER_HEIGHT
+        self.rect_x[m] = _START_X.astype(np.int64)
+        self.rect_y[m] = SCREEN_HEIGHT - PLAYER_HEIGHT
+        self.vel_x[m] = 0.0
+        self.vel_y[m] = 0.0
+        self.health[m] = INITIAL_HEALTH
+        self.state[m] = STATE_IDLE
+        self.facing[m] = _START_FACING
+        self.is_jumping[m] = False
+        self.is_attacking[m] = False
+        self.is_guarding[m] = False
+        self.hitbox_active[m] = False
+        self.hitbox_x[m] = 0
+        self.hitbox_y[m] = 0
+        self.attack_timer[m] = 0.0
+        self.punch_cooldown_timer[m] = 0.0
+        self.hit_stun_timer[m] = 0.0
+        self.hit_text_timer[m] = 0.0
+
+        self.frame_count[m] = 0
+        self.round_timer[m] = ROUND_TIME
+        self.timer_accumulator[m] = 0.0
+        self.round_over[m] = False
+
+    def write_observations(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        모든 매치의 관측 벡터를 기록합니다. `interfaces.write_observation`의 벡터 버전입니다.
+
+        Args:
+            out (Optional[np.ndarray]): 결과를 기록할 (N, 8) float32 배열.
+
+        Returns:
+            np.ndarray: (N, 8) 관측 배열. 열 순서는 [p1_x, p1_y, p1_hp, p1_state, p2_x, p2_y, p2_hp, p2_state].
+        """
+        if out is None:
+            out = np.empty((self.num_matches, 8), dtype=np.float32)
+        view = out.reshape(self.num_matches, 2, 4)  # (매치, 플레이어, 필드)
+        view[:, :, 0] = self.rect_x / _X_RANGE
+        view[:, :, 1] = (_GROUND_Y - self.rect_y) / _GROUND_Y
+        view[:, :, 2] = self.health / INITIAL_HEALTH
+        view[:, :, 3] = self.state / _STATE_SCALE
+        return out
+
+    def step(
+        self, p1_actions: np.ndarray, p2_actions: np.ndarray, dt: float = 1.0 / FPS
+    ) -> np.ndarray:
+        """
+        모든 매치에 행동을 적용하고 한 프레임을 진행합니다. `Simulation.step`과 동일합니다.
+
+        Args:
+            p1_actions (np.ndarray): (N,) Player 1 행동 id 배열.
+            p2_actions (np.ndarray): (N,) Player 2 행동 id 배열.
+            dt (float): 프레임 시간 (초).
+
+        Returns:
+            np.ndarray: (N,) 라운드 종료 여부 (내부 배열이므로 복사해서 보관하세요).
+        """
+        actions = np.stack(
+            (np.asarray(p1_actions, dtype=np.int64), np.asarray(p2_actions, dtype=np.int64)),
+            axis=1,
+        )
+        self._apply_actions(actions)
+        self.update(dt)
+        return self.round_over
+
+    def step_repeat(
+        self,
+        p1_actions: np.ndarray,
+        p2_actions: np.ndarray,
+        repeat: int,
+        dt: float = 1.0 / FPS,
+        substeps: Optional[int] = None,
+        pooled: Optional[np.ndarray] = None,
+        pool: str = "max",
+    ) -> np.ndarray:
+        """
+        같은 행동으로 `repeat` 프레임을 진행합니다 (action repeat).
+
+        기본값(substeps=None)은 프레임마다 행동을 적용하고 update하므로 `step`을
+        repeat번 호출한 것과 같습니다. substeps를 repeat보다 작게 주면 여러 프레임을
+        update 한 번으로 묶는 거친 모드가 됩니다. 한 프레임보다 긴 update는 스윕 히트박스
+        판정을 하므로 공격이 상대를 통과하지는 않지만, 점프 같은 물리와 행동 적용 시점이
+        프레임 단위 진행과 달라집니다.
+
+        호출 시점에 이미 끝난 매치와 도중에 라운드가 끝난 매치는 남은 서브스텝의
+        update에서 제외되어 그 상태로 남습니다.
+
+        Args:
+            p1_actions (np.ndarray): (N,) Player 1 행동 id 배열.
+            p2_actions (np.ndarray): (N,) Player 2 행동 id 배열.
+            repeat (int): 진행할 프레임 수 (1 이상).
+            dt (float): 프레임 시간 (초).
+            substeps (Optional[int]): update 횟수 (1 이상, repeat 이하로 잘림). None이면
+                repeat. 앞쪽 서브스텝이 나머지 프레임을 하나씩 더 맡습니다.
+            pooled (Optional[np.ndarray]): 지정하면 서브스텝들의 관측값을 `pool` 방식으로
+                모아 이 (N, 8) float32 배열에 기록합니다. 진행하지 않은 매치는 현재 관측값.
+            pool (str): "max" (원소별 최댓값) 또는 "mean" (프레임 수 가중 평균).
+
+        Returns:
+            np.ndarray: (N,) 라운드 종료 여부 (내부 배열이므로 복사해서 보관하세요).
+        """
+        if repeat < 1 or (substeps is not None and substeps < 1):
+            raise ValueError("repeat and substeps must be at least 1.")
+        if pool not in POOL_MODES:
+            raise ValueError(f"Unknown pool mode {pool!r}; expected one of {POOL_MODES}.")
+        actions = np.stack(
+            (np.asarray(p1_actions, dtype=np.int64), np.asarray(p2_actions, dtype=np.int64)),
+            axis=1,
+        )
+        substeps = repeat if substeps is None else min(substeps, repeat)
+        frames, extra = divmod(repeat, substeps)
+        if pooled is not None:
+            frame_obs = np.empty_like(pooled)
+            weight = np.zeros(self.num_matches, dtype=np.int64)
+            pooled[:] = -np.inf if pool == "max" else 0.0
+        active = ~self.round_over
+        for i in range(substeps):
+            if not active.any():
+                break
+            length = frames + (i < extra)
+            self._apply_actions(actions, active)
+            self.update(length * dt, active, length)
+            if pooled is not None:
+                self.write_observations(frame_obs)
+                if pool == "max":
+                    np.maximum(pooled, frame_obs, out=pooled, where=active[:, None])
+                else:
+                    pooled[active] += length * frame_obs[active]
+                weight[active] += length
+            active &= ~self.round_over
+
+        if pooled is not None:
+            stepped = weight > 0
+            if pool == "mean":
+                pooled[stepped] /= weight[stepped, None]
+            if not stepped.all():
+                self.write_observations(frame_obs)
+                pooled[~stepped] = frame_obs[~stepped]
+        return self.round_over
+
+    def _apply_actions(self, actions: np.ndarray, mask: Optional[np.ndarray] = None) -> None:
+        """
+        `apply_action`의 벡터 버전. 행동 적용 순서는 플레이어 간에 독립적입니다.
+        mask (N,)를 지정하면 True인 매치에만 적용합니다.
+        """
+        players = (self._all_matches if mask is None else mask)[:, None]
+        free = ~self.is_attacking & ~self.is_guarding & players
+
+        # move(direction)
+        for action, direction in ((ACTION_MOVE_RIGHT, 1), (ACTION_MOVE_LEFT, -1)):
+            m = (actions == action) & free
+            self.vel_x[m] = direction * PLAYER_SPEED
+            self.facing[m] = direction
+
+        # jump()
+        m = (actions == ACTION_JUMP) & free & ~self.is_jumping
+        self.vel_y[m] = JUMP_VELOCITY
+        self.is_jumping[m] = True
+
+        # attack()
+        m = (actions == ACTION_ATTACK) & ~self.is_attacking & (self.punch_cooldown_timer <= 0) & players
+        self._transition(m, EVENT_ATTACK)
+        self.is_attacking[m] = True
+        self.hitbox_active[m] = True
+        self.attack_timer[m] = ATTACK_DURATION
+        self.punch_cooldown_timer[m] = PUNCH_COOLDOWN
+
+        # guard()
+        m = (actions == ACTION_GUARD) & ~self.is_attacking & ~self.is_jumping & players
+        self._transition(m, EVENT_GUARD)
+        self.is_guarding[m] = True
+
+        # idle
+        m = (actions == ACTION_IDLE) & players
+        self.vel_x[m] = 0.0
+        self.is_guarding[m] = False
+
+    def _transition(self, mask: np.ndarray, event: int) -> None:
+        """
+        mask가 True인 플레이어에 상태 전이 이벤트를 적용합니다 (`TRANSITIONS` 테이블 조회).
+        """
+        self.state[mask] = _TRANSITIONS[self.state[mask], event]
+
+    def update(self, dt: float, mask: Optional[np.ndarray] = None, frames: int = 1) -> None:
+        """
+        라운드 타이머, 플레이어 물리/상태, 공격 충돌을 dt만큼 진행합니다.
+
+        dt가 한 프레임(1 / FPS)보다 길면 공격 판정을 스윕 방식으로 합니다. 히트박스와
+        상대의 이동을 update 시작 위치에서 끝 위치까지의 선형 이동으로 보고, 그 사이
+        한 시점에라도 겹치면 맞은 것으로 처리합니다. 이 update 안에서 끝난 공격도
+        판정합니다. 큰 dt에서 공격이 상대를 통과하지 않게 하기 위함입니다.
+
+        Args:
+            dt (float): 진행할 시간 (초).
+            mask (Optional[np.ndarray]): (N,) bool 배열. 지정하면 True인 매치만 진행합니다.
+            frames (int): 이 update가 나타내는 프레임 수 (frame_count 증가량).
+        """
+        active = self._all_matches if mask is None else mask
+        swept = dt > _FRAME_DT
+        start = (self.rect_x.copy(), self.rect_y.copy(), self.hitbox_active.copy()) if swept else None
+        self.frame_count[active] += frames
+
+        # Round timer
+        self.timer_accumulator[active] += dt
+        tick = active & (self.timer_accumulator >= 1.0)
+        self.round_timer[tick] -= 1
+        self.timer_accumulator[tick] -= 1.0
+        time_out = self.round_timer < 0
+        self.round_timer[time_out] = 0
+        self.round_over |= time_out
+
+        players = active[:, None]
+        self._update_players(dt, players)
+        if swept:
+            self._check_attacks_swept(*start, players)
+        else:
+            self._check_attacks(players)
+
+        self.round_over |= active & ((self.health[:, 0] <= 0) | (self.health[:, 1] <= 0))
+
+    def _update_players(self, dt: float, players: np.ndarray) -> None:
+        """
+        `Player.update`의 벡터 버전. players (N, 1)가 True인 매치만 진행합니다.
+        """
+        # Hit stun timer
+        stunned = (self.hit_stun_timer > 0) & players
+        self.hit_stun_timer[stunned] -= dt
+        self._transition(stunned & (self.hit_stun_timer <= 0), EVENT_STUN_END)
+
+        self.hit_text_timer[(self.hit_text_timer > 0) & players] -= dt
+
+        # Restrict actions during hit stun; the rest of the update is skipped
+        stunned = (self.hit_stun_timer > 0) & players
+        self.vel_x[stunned] = 0.0
+        self.vel_y[stunned] = 0.0
+        self.is_attacking[stunned] = False
+        self.hitbox_active[stunned] = False
+        self.is_guarding[stunned] = False
+        live = players & ~stunned
+
+        # Gravity and integration
+        self.vel_y[live] += GRAVITY * dt
+        self.pos_x[live] += self.vel_x[live] * dt
+        self.pos_y[live] += self.vel_y[live] * dt
+        self.rect_x[live] = self.pos_x[live].astype(np.int64)
+        self.rect_y[live] = self.pos_y[live].astype(np.int64)
+
+        # Stop horizontal movement if no input
+        keeps_velocity = (_STATE_FLAGS[self.state] & FLAG_KEEPS_VELOCITY) != 0
+        self.vel_x[live & ~keeps_velocity & ~self.is_guarding] = 0.0
+
+        # Keep player on screen
+        m = live & (self.rect_x < 0)
+        self.rect_x[m] = 0
+        m = live & (self.rect_x + PLAYER_WIDTH > SCREEN_WIDTH)
+        self.rect_x[m] = SCREEN_WIDTH - PLAYER_WIDTH
+
+        # Ground collision
+        grounded = live & (self.rect_y + PLAYER_HEIGHT > SCREEN_HEIGHT)
+        self.pos_y[grounded] = SCREEN_HEIGHT - PLAYER_HEIGHT
+        self.rect_y[grounded] = SCREEN_HEIGHT - PLAYER_HEIGHT
+        self.vel_y[grounded] = 0.0
+        self.is_jumping[grounded] = False
+        self._transition(grounded, EVENT_LAND)
+
+        # Attack timer and hitbox placement
+        attacking = live & self.is_attacking
+        self.attack_timer[attacking] -= dt
+        ended = attacking & (self.attack_timer <= 0)
+        self._ended_attacks = ended
+        self.is_attacking[ended] = False
+        self.hitbox_active[ended] = False
+        self._transition(ended, EVENT_ATTACK_END)
+        ongoing = attacking & ~ended
+        hitbox_x, hitbox_y = self._hitbox_position(self.rect_x, self.rect_y)
+        self.hitbox_x[ongoing] = hitbox_x[ongoing]
+        self.hitbox_y[ongoing] = hitbox_y[ongoing]
+
+        # Punch cooldown
+        self.punch_cooldown_timer[live & (self.punch_cooldown_timer > 0)] -= dt
+
+        # Reset guard state
+        event = np.where(
+            self.is_guarding,
+            EVENT_GUARD_HOLD,
+            np.where(self.is_attacking | self.is_jumping, EVENT_GUARD_RELEASE, EVENT_SETTLE),
+        )
+        self.state[live] = _TRANSITIONS[self.state[live], event[live]]
+
+    def _hitbox_position(self, rect_x: np.ndarray, rect_y: np.ndarray):
+        """
+        주어진 위치와 현재 방향에서의 공격 히트박스 위치 (`Player.update`와 동일).
+        """
+        offset_x = np.where(self.facing == 1, PLAYER_WIDTH, -HITBOX_WIDTH)
+        hitbox_x = np.where(
+            self.facing == 1,
+            rect_x + offset_x,
+            rect_x + PLAYER_WIDTH - offset_x - HITBOX_WIDTH,
+        )
+        return hitbox_x, rect_y + PLAYER_HEIGHT // 4
+
+    def _check_attacks(self, players: np.ndarray) -> None:
+        """
+        `CollisionManager.check_player_attack`의 벡터 버전 (P1->P2, P2->P1).
+        두 방향의 판정은 서로의 결과에 영향을 주지 않으므로 동시에 계산합니다.
+        players (N, 1)가 True인 매치만 판정합니다.
+        """
+        # Defender arrays are the attacker arrays with the player axis flipped
+        def_x = self.rect_x[:, ::-1]
+        def_y = self.rect_y[:, ::-1]
+        def_state = self.state[:, ::-1]
+        def_guarding = self.is_guarding[:, ::-1]
+
+        overlap = (
+            (self.hitbox_x < def_x + PLAYER_WIDTH)
+            & (def_x < self.hitbox_x + HITBOX_WIDTH)
+            & (self.hitbox_y < def_y + PLAYER_HEIGHT)
+            & (def_y < self.hitbox_y + HITBOX_HEIGHT)
+        )
+        can_be_hit = ((_STATE_FLAGS[def_state] & FLAG_HIT_REACTION) == 0) | (
+            (def_state == STATE_GUARD_HIT) & ~def_guarding
+        )
+        hits = self.is_attacking & self.hitbox_active & overlap & can_be_hit & players
+        self._apply_hits(hits)
+
+    def _check_attacks_swept(
+        self,
+        start_x: np.ndarray,
+        start_y: np.ndarray,
+        start_hitbox_active: np.ndarray,
+        players: np.ndarray,
+    ) -> None:
+        """
+        `_check_attacks`의 스윕 버전. 히트박스는 update 시작 위치에서 끝 위치까지,
+        상대도 같은 구간을 선형으로 움직인다고 보고, 두 축의 겹침 시간 구간이 [0, 1]
+        안에서 교차하면 맞은 것으로 처리합니다.
+
+        Args:
+            start_x, start_y (np.ndarray): update 시작 시점의 rect_x / rect_y.
+            start_hitbox_active (np.ndarray): update 시작 시점의 히트박스 활성화 여부.
+            players (np.ndarray): (N, 1) 판정할 매치.
+        """
+        hitbox_x0, hitbox_y0 = self._hitbox_position(start_x, start_y)
+        hitbox_x1, hitbox_y1 = self._hitbox_position(self.rect_x, self.rect_y)
+        # Hitbox position relative to the defender at the start and end of the update
+        enter_x, exit_x = _sweep_interval(
+            hitbox_x0 - start_x[:, ::-1], hitbox_x1 - self.rect_x[:, ::-1], -HITBOX_WIDTH, PLAYER_WIDTH
+        )
+        enter_y, exit_y = _sweep_interval(
+            hitbox_y0 - start_y[:, ::-1], hitbox_y1 - self.rect_y[:, ::-1], -HITBOX_HEIGHT, PLAYER_HEIGHT
+        )
+        overlap = np.maximum(np.maximum(enter_x, enter_y), 0.0) < np.minimum(np.minimum(exit_x, exit_y), 1.0)
+
+        def_state = self.state[:, ::-1]
+        def_guarding = self.is_guarding[:, ::-1]
+        can_be_hit = ((_STATE_FLAGS[def_state] & FLAG_HIT_REACTION) == 0) | (
+            (def_state == STATE_GUARD_HIT) & ~def_guarding
+        )
+        # Attacks still running, plus those that ended during this update with their hitbox unused
+        attacking = (self.is_attacking & self.hitbox_active) | (self._ended_attacks & start_hitbox_active)
+        self._apply_hits(attacking & overlap & can_be_hit & players)
+
+    def _apply_hits(self, hits: np.ndarray) -> None:
+        """
+        hits[i, j]: 매치 i의 플레이어 j가 상대를 맞혔는지. 방어자에게 피해와 경직을 적용합니다.
+        """
+        if not hits.any():
+            return
+
+        # take_damage() on the defender side
+        taken = hits[:, ::-1]
+        guarded = taken & self.is_guarding
+        clean = taken & ~self.is_guarding
+        self.health[guarded] -= PUNCH_DAMAGE // 2
+        self._transition(guarded, EVENT_GUARD_HIT)
+        self.health[clean] -= PUNCH_DAMAGE
+        self._transition(clean, EVENT_HIT)
+        np.maximum(self.health, 0, out=self.health)
+        self._transition(taken & (self.health == 0), EVENT_KO)
+        self.hit_stun_timer[taken] = HIT_STUN_DURATION
+        self.hit_text_timer[taken] = HIT_STUN_DURATION * 2
+
+        self.hitbox_active[hits] = False  # Deactivate hitbox after hit
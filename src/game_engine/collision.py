@@ -1,5 +1,7 @@
 from typing import Tuple
 from src.game_engine.player import Player
+from src.game_engine.states import FLAG_HIT_REACTION, STATE_FLAGS, PlayerState
+from src.utils.tracing import EV_COLLISION, TRACE_COMBAT, TRACER
 
 
 class CollisionManager:
@@ -21,30 +23,15 @@ class CollisionManager:
             attacker (Player): 공격자 캐릭터 객체.
             defender (Player): 방어자 캐릭터 객체.
         """
-        print(
-            f"CollisionManager: Checking attack from {attacker.color} to {defender.color}"
-        )
         if attacker.is_attacking and attacker.attack_hitbox.active:
-            print(
-                f"CollisionManager: Attacker {attacker.color} is attacking and hitbox is active."
-            )
             if attacker.attack_hitbox.is_colliding(defender.hurtbox):
-                print(
-                    f"CollisionManager: Hitbox rect={attacker.attack_hitbox.rect}, Hurtbox rect={defender.hurtbox.rect}"
-                )
-                print(
-                    f"CollisionManager: Collision detected! Attacker {attacker.color} hitbox with Defender {defender.color} hurtbox."
-                )
-                if attacker.color == (255, 0, 0) and defender.color == (
-                    0,
-                    0,
-                    255,
-                ):  # If Player 2 attacks Player 1
-                    print("Player 2 attack collided with Player 1 hurtbox!")
+                if TRACER.mask & TRACE_COMBAT:
+                    TRACER.record(
+                        EV_COLLISION, attacker.trace_id, defender.trace_id, attacker.attack_hitbox.damage
+                    )
                 # Ensure damage is applied only once per attack
-                if defender.state not in ["hit", "guard_hit"] or (
-                    defender.state == "guard_hit" and not defender.is_guarding
+                if not STATE_FLAGS[defender.state] & FLAG_HIT_REACTION or (
+                    defender.state == PlayerState.GUARD_HIT and not defender.is_guarding
                 ):
-                    print(f"CollisionManager: Defender {defender.color} taking damage.")
                     defender.take_damage(attacker.attack_hitbox.damage)
                     attacker.attack_hitbox.active = False  # Deactivate hitbox after hit
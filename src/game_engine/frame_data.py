@@ -0,0 +1,204 @@
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from src.constants import PLAYER_HEIGHT, PLAYER_WIDTH, PUNCH_DAMAGE
+
+# 프레임별 단계 코드
+PHASE_STARTUP = 0
+PHASE_ACTIVE = 1
+PHASE_RECOVERY = 2
+PHASE_NAMES: Tuple[str, ...] = ("startup", "active", "recovery")
+
+# 기본 펀치와 같은 히트박스: 캐릭터 앞쪽, 높이 1/4 지점
+DEFAULT_HITBOX: Tuple[int, int, int, int] = (
+    PLAYER_WIDTH,
+    PLAYER_HEIGHT // 4,
+    int(PLAYER_WIDTH // 1.5),
+    PLAYER_HEIGHT // 4,
+)
+
+_FRAME_DATA_PATTERN = re.compile(
+    r"Startup:\s*(\d+)f\s*,\s*Active:\s*(\d+)f\s*,\s*Recovery:\s*(\d+)f", re.IGNORECASE
+)
+
+
+class MoveFrame(NamedTuple):
+    """
+    기술의 한 프레임. 엔진은 (기술, 프레임) 인덱스로 이 행을 조회만 합니다.
+
+    Attributes:
+        phase (int): PHASE_STARTUP / PHASE_ACTIVE / PHASE_RECOVERY.
+        hitbox_x (int): 캐릭터 rect 기준 히트박스 x 오프셋 (오른쪽을 볼 때 기준).
+        hitbox_y (int): 캐릭터 rect 기준 히트박스 y 오프셋.
+        hitbox_width (int): 히트박스 너비 (비활성 프레임은 0).
+        hitbox_height (int): 히트박스 높이 (비활성 프레임은 0).
+        cancelable (bool): 이 프레임에서 다른 기술로 캔슬할 수 있는지 여부.
+    """
+
+    phase: int
+    hitbox_x: int
+    hitbox_y: int
+    hitbox_width: int
+    hitbox_height: int
+    cancelable: bool
+
+
+class MoveTable:
+    """
+    한 캐릭터의 모든 기술을 컴파일한 정수 테이블.
+
+    `frames[move][frame]`이 해당 프레임의 `MoveFrame`이고, 기술 길이와 데미지는
+    기술별 튜플로 보관합니다. 문자열 파싱은 컴파일할 때 한 번만 하므로 매 프레임
+    비용은 로스터 크기와 관계없이 인덱스 조회 한 번입니다.
+
+    Attributes:
+        names (Tuple[str, ...]): 기술 이름.
+        frames (Tuple[Tuple[MoveFrame, ...], ...]): 기술별 프레임 테이블.
+        lengths (Tuple[int, ...]): 기술별 전체 프레임 수 (startup + active + recovery).
+        damage (Tuple[int, ...]): 기술별 데미지.
+        inputs (Tuple[str, ...]): 기술별 커맨드 표기 (예: "↓↘→ + P", 없으면 "").
+    """
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        frames: Sequence[Sequence[MoveFrame]],
+        damage: Sequence[int],
+        inputs: Optional[Sequence[str]] = None,
+    ):
+        self.names: Tuple[str, ...] = tuple(names)
+        self.frames: Tuple[Tuple[MoveFrame, ...], ...] = tuple(tuple(f) for f in frames)
+        self.lengths: Tuple[int, ...] = tuple(len(f) for f in self.frames)
+        self.damage: Tuple[int, ...] = tuple(damage)
+        self.inputs: Tuple[str, ...] = tuple(inputs) if inputs is not None else ("",) * len(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def index(self, name: str) -> int:
+        """
+        기술 이름으로 인덱스를 찾습니다.
+
+        Args:
+            name (str): 기술 이름 (예: "Hadoken").
+
+        Returns:
+            int: 기술 인덱스.
+        """
+        return self.names.index(name)
+
+
+def parse_frame_data(frame_data: str) -> Tuple[int, int, int]:
+    """
+    "Startup: 10f, Active: 5f, Recovery: 15f" 형식의 문자열을 파싱합니다.
+
+    Args:
+        frame_data (str): MOVES_DATA의 frameData 문자열.
+
+    Returns:
+        Tuple[int, int, int]: (startup, active, recovery) 프레임 수.
+    """
+    match = _FRAME_DATA_PATTERN.search(frame_data)
+    if match is None:
+        raise ValueError(f"Invalid frame data: {frame_data!r}")
+    startup, active, recovery = (int(value) for value in match.groups())
+    if active == 0:
+        raise ValueError(f"Move must have at least one active frame: {frame_data!r}")
+    return startup, active, recovery
+
+
+def compile_move(move: Dict[str, Any]) -> Tuple[Tuple[MoveFrame, ...], int]:
+    """
+    MOVES_DATA의 기술 하나를 프레임 테이블로 컴파일합니다.
+
+    frameData 외에 선택 키 "damage" (기본 PUNCH_DAMAGE), "hitbox"
+    ((x, y, width, height), 기본 DEFAULT_HITBOX), "cancel" ((시작, 끝) 프레임,
+    끝 미포함. 기본은 활성 프레임 구간)을 사용할 수 있습니다.
+
+    Args:
+        move (Dict[str, Any]): 기술 데이터.
+
+    Returns:
+        Tuple[Tuple[MoveFrame, ...], int]: 프레임 테이블과 데미지.
+    """
+    startup, active, recovery = parse_frame_data(move["frameData"])
+    hitbox_x, hitbox_y, width, height = move.get("hitbox", DEFAULT_HITBOX)
+    cancel_start, cancel_end = move.get("cancel", (startup, startup + active))
+
+    frames: List[MoveFrame] = []
+    for frame in range(startup + active + recovery):
+        if frame < startup:
+            phase = PHASE_STARTUP
+        elif frame < startup + active:
+            phase = PHASE_ACTIVE
+        else:
+            phase = PHASE_RECOVERY
+        size = (width, height) if phase == PHASE_ACTIVE else (0, 0)
+        frames.append(
+            MoveFrame(phase, hitbox_x, hitbox_y, *size, cancel_start <= frame < cancel_end)
+        )
+    return tuple(frames), int(move.get("damage", PUNCH_DAMAGE))
+
+
+def compile_moves(moves: Sequence[Dict[str, Any]]) -> MoveTable:
+    """
+    한 캐릭터의 기술 목록을 `MoveTable`로 컴파일합니다.
+
+    Args:
+        moves (Sequence[Dict[str, Any]]): MOVES_DATA[character_id].
+
+    Returns:
+        MoveTable: 컴파일된 기술 테이블.
+    """
+    compiled = [compile_move(move) for move in moves]
+    return MoveTable(
+        [move["name"] for move in moves],
+        [frames for frames, _ in compiled],
+        [damage for _, damage in compiled],
+        [move.get("input", "") for move in moves],
+    )
+
+
+def compile_roster(moves_data: Dict[int, Sequence[Dict[str, Any]]]) -> Dict[int, MoveTable]:
+    """
+    전체 로스터(캐릭터 id -> 기술 목록)를 컴파일합니다.
+
+    Args:
+        moves_data (Dict[int, Sequence[Dict[str, Any]]]): MOVES_DATA 형식의 딕셔너리.
+
+    Returns:
+        Dict[int, MoveTable]: 캐릭터 id별 기술 테이블.
+    """
+    return {character_id: compile_moves(moves) for character_id, moves in moves_data.items()}
+
+
+@lru_cache(maxsize=None)
+def load_roster() -> Dict[int, MoveTable]:
+    """
+    backend의 MOVES_DATA를 한 번만 컴파일해 캐시합니다.
+
+    Returns:
+        Dict[int, MoveTable]: 캐릭터 id별 기술 테이블.
+    """
+    from backend.data.game_data import MOVES_DATA
+
+    return compile_roster(MOVES_DATA)
+
+
+def get_move_table(character_id: Optional[int]) -> Optional[MoveTable]:
+    """
+    캐릭터 id의 기술 테이블을 반환합니다. None이면 기술 없이 기본 펀치만 사용합니다.
+
+    Args:
+        character_id (Optional[int]): 캐릭터 id.
+
+    Returns:
+        Optional[MoveTable]: 기술 테이블 또는 None.
+    """
+    if character_id is None:
+        return None
+    roster = load_roster()
+    if character_id not in roster:
+        raise KeyError(f"Unknown character id: {character_id}")
+    return roster[character_id]
@@ -1,22 +1,33 @@
-from typing import Tuple
+from typing import List, Optional, Tuple, Union
 
 import pygame
 from src.game_engine.collision import CollisionManager
 from src.constants import (
-    BLACK, BLUE, CAPTION, FPS, GREEN, HEALTH_BAR_HEIGHT,
+    BLACK, FPS, GREEN, HEALTH_BAR_HEIGHT,
     HEALTH_BAR_MARGIN, HEALTH_BAR_WIDTH, INITIAL_HEALTH,
-    PLAYER_HEIGHT, PLAYER_WIDTH, RED, SCREEN_HEIGHT,
-    SCREEN_WIDTH, WHITE
+    RED, SCREEN_WIDTH, WHITE
 )
+from src.game_engine.motion import BUTTON_KICK, BUTTON_PUNCH, MotionInputReader
 from src.game_engine.player import Player
+from src.game_engine.simulation import Simulation
+from src.utils.tracing import EV_MOTION, TRACE_INPUT, TRACER
 
 
 class Game:
     """
-    Pygame 초기화, 메인 게임 루프 관리, 이벤트 처리, 게임 상태 업데이트 및 렌더링을 담당하는 핵심 클래스.
+    Pygame 초기화, 메인 게임 루프 관리, 이벤트 처리 및 렌더링을 담당하는 클래스.
+    게임 상태 업데이트는 `Simulation` 코어에 위임합니다.
     """
 
-    def __init__(self, width: int, height: int, caption: str, headless: bool = False):
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        caption: str,
+        headless: bool = False,
+        deterministic: bool = False,
+        characters: Tuple[Optional[int], Optional[int]] = (None, None),
+    ):
         """
         Game 객체를 초기화합니다.
 
@@ -24,7 +35,9 @@ class Game:
             width (int): 화면 너비.
             height (int): 화면 높이.
             caption (str): 창 제목.
-            headless (bool): True이면 Pygame 디스플레이를 초기화하지 않습니다.
+            headless (bool): True이면 pygame을 초기화하지 않고 시뮬레이션 코어만 사용합니다.
+            deterministic (bool): True이면 1/FPS 고정 틱과 고정소수점 물리로 진행합니다.
+            characters (Tuple[Optional[int], Optional[int]]): 캐릭터 id. 지정하면 커맨드 기술을 사용할 수 있습니다.
         """
         self.headless = headless
         if not self.headless:
@@ -32,99 +45,181 @@ class Game:
             pygame.font.init()  # Initialize font module
             self.screen: pygame.Surface = pygame.display.set_mode((width, height))
             pygame.display.set_caption(caption)
-        else:
-            # Initialize Pygame modules that don't require a display
-            pygame.init()
-            pygame.font.init()  # Initialize font module
-            pygame.display.set_mode(
-                (1, 1), pygame.HIDDEN
-            )  # Create a minimal hidden display
+            self.clock: pygame.time.Clock = pygame.time.Clock()
 
-        self.clock: pygame.time.Clock = pygame.time.Clock()
         self.running: bool = True
-
-        self.player1: Player = Player(
-            100, SCREEN_HEIGHT - PLAYER_HEIGHT, PLAYER_WIDTH, PLAYER_HEIGHT, BLUE, 1
-        )
-        self.player2: Player = Player(
-            SCREEN_WIDTH - 100 - PLAYER_WIDTH,
-            SCREEN_HEIGHT - PLAYER_HEIGHT,
-            PLAYER_WIDTH,
-            PLAYER_HEIGHT,
-            RED,
-            -1,
+        self.simulation: Simulation = Simulation(deterministic=deterministic, characters=characters)
+        # Player 1 키보드 입력의 커맨드(↓↘→ + P 등) 판정기
+        self.motion_reader: Optional[MotionInputReader] = (
+            MotionInputReader(self.player1.move_table) if self.player1.move_table else None
         )
-
-        self.collision_manager: CollisionManager = CollisionManager()
-        self.frame_count: int = 0
-        self.round_timer: int = 99
-        self.timer_accumulator: float = 0.0
+        self._frame_time_accumulator: float = 0.0
+        # 키보드에서 읽은 Player 1 입력. 시뮬레이션 틱마다 한 번 `_apply_input`이 소비합니다.
+        # 커맨드 판정기 입력 (가로, 세로, 버튼). 아직 키보드를 읽지 않았으면 None.
+        self._held_input: Optional[Tuple[int, int, int]] = None
+        # 누르고 있는 이동 방향 (-1 왼쪽, 1 오른쪽, 0 없음)
+        self._move_direction: int = 0
+        # 아직 적용하지 않은 키 이벤트 (이벤트 종류, 키), 발생 순서대로
+        self._pending_keys: List[Tuple[int, int]] = []
         # self.ai_controller: AIController = AIController(self.player2, self.player1) # Disabled for multi-agent control
 
+    @property
+    def player1(self) -> Player:
+        return self.simulation.player1
+
+    @property
+    def player2(self) -> Player:
+        return self.simulation.player2
+
+    @property
+    def collision_manager(self) -> CollisionManager:
+        return self.simulation.collision_manager
+
+    @property
+    def frame_count(self) -> int:
+        return self.simulation.frame_count
+
+    @property
+    def round_timer(self) -> int:
+        return self.simulation.round_timer
+
     def reset_game_state(self) -> None:
         """
         게임의 상태를 초기화합니다. Pygame 자체는 종료하지 않습니다.
         """
-        self.player1 = Player(
-            100, SCREEN_HEIGHT - PLAYER_HEIGHT, PLAYER_WIDTH, PLAYER_HEIGHT, BLUE, 1
-        )
-        self.player2 = Player(
-            SCREEN_WIDTH - 100 - PLAYER_WIDTH,
-            SCREEN_HEIGHT - PLAYER_HEIGHT,
-            PLAYER_WIDTH,
-            PLAYER_HEIGHT,
-            RED,
-            -1,
-        )
-        self.collision_manager = (
-            CollisionManager()
-        )  # Re-initialize collision manager if it holds state
+        self.simulation.reset()
+        self._frame_time_accumulator = 0.0
+        self._held_input = None
+        self._move_direction = 0
+        self._pending_keys.clear()
+        if self.motion_reader is not None:
+            self.motion_reader.recognizer.reset()
         # self.ai_controller = AIController(self.player2, self.player1) # Disabled for multi-agent control
         self.running = True  # Ensure game loop can run
 
+    def save_state(
+        self, buffer: Optional[bytearray] = None, offset: int = 0
+    ) -> Union[bytes, bytearray]:
+        """
+        게임 상태를 고정 크기 바이너리로 직렬화합니다. `Simulation.save_state` 참고.
+        """
+        return self.simulation.save_state(buffer, offset)
+
+    def load_state(self, buffer: Union[bytes, bytearray, memoryview], offset: int = 0) -> None:
+        """
+        `save_state`로 직렬화한 상태를 복원합니다. `Simulation.load_state` 참고.
+        """
+        self.simulation.load_state(buffer, offset)
+        self.running = not self.simulation.round_over
+
+    def step(self, p1_action: int, p2_action: int, dt: Optional[float] = None) -> bool:
+        """
+        두 플레이어의 행동을 적용하고 한 프레임을 진행합니다. `Simulation.step` 참고.
+
+        Args:
+            p1_action (int): Player 1의 행동 id.
+            p2_action (int): Player 2의 행동 id.
+            dt (Optional[float]): 프레임 시간 (초). 기본값은 1/FPS.
+
+        Returns:
+            bool: 라운드가 끝났으면 True.
+        """
+        done = self.simulation.step(p1_action, p2_action, dt)
+        if done:
+            self.running = False
+        return done
+
     def run(self) -> None:
         """
         메인 게임 루프를 실행합니다. 이벤트 처리, 업데이트, 그리기를 반복합니다.
+        헤드리스 모드에서는 벽시계 대신 고정된 1/FPS 간격으로 진행하고, 결정론 모드에서는
+        벽시계 시간을 누적해 1/FPS 고정 틱 단위로만 시뮬레이션을 진행합니다.
         """
+        tick = self.simulation.physics.tick
         while self.running:
+            if self.headless:
+                self._update(tick)
+                continue
             dt = self.clock.tick(FPS) / 1000.0  # Delta time in seconds
-            if not self.headless:
-                self._handle_input()
-            self._update(dt)
-            if not self.headless:
-                self._draw()
+            self._handle_input()
+            if self.simulation.deterministic:
+                self._frame_time_accumulator += dt
+                while self.running and self._frame_time_accumulator >= 1.0 / FPS:
+                    self._update(tick)
+                    self._frame_time_accumulator -= 1.0 / FPS
+            else:
+                self._update(dt)
+            self._draw()
 
-        pygame.quit()
+        if not self.headless:
+            pygame.quit()
 
     def _handle_input(self) -> None:
         """
-        Pygame 이벤트(키보드 입력, 창 닫기 등)를 처리합니다.
+        Pygame 이벤트(키보드 입력, 창 닫기 등)를 처리합니다. 키 입력은 기록만 해 두고
+        다음 시뮬레이션 틱에서 `_apply_input`으로 적용하므로, 결정론 모드의 진행이 렌더링
+        속도와 무관하게 틱별 입력만으로 정해집니다.
         """
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_UP:
-                    self.player1.jump()
-                elif event.key == pygame.K_SPACE:
-                    self.player1.attack()
-                elif event.key == pygame.K_DOWN:
-                    self.player1.guard()
-            elif event.type == pygame.KEYUP:
-                if event.key == pygame.K_DOWN:
-                    self.player1.is_guarding = False
+            elif event.type in (pygame.KEYDOWN, pygame.KEYUP):
+                self._pending_keys.append((event.type, event.key))
 
         # Check for continuous key presses for movement
         keys = pygame.key.get_pressed()
+        attack_pressed = (pygame.KEYDOWN, pygame.K_SPACE) in self._pending_keys
+
+        self._held_input = (
+            keys[pygame.K_RIGHT] - keys[pygame.K_LEFT],
+            keys[pygame.K_UP] - keys[pygame.K_DOWN],
+            (BUTTON_PUNCH if keys[pygame.K_SPACE] or attack_pressed else 0)
+            | (BUTTON_KICK if keys[pygame.K_LSHIFT] else 0),
+        )
         if keys[pygame.K_LEFT]:
-            self.player1.move(-1)
+            self._move_direction = -1
         elif keys[pygame.K_RIGHT]:
-            self.player1.move(1)
+            self._move_direction = 1
         else:
+            self._move_direction = 0
+
+    def _apply_input(self) -> None:
+        """
+        마지막으로 읽은 Player 1 입력을 이번 틱에 적용합니다. 쌓인 키 이벤트(점프, 가드,
+        가드 해제, 공격)를 순서대로 적용한 뒤 누르고 있는 이동 방향을 적용합니다. 커맨드
+        판정기도 렌더 프레임이 아니라 시뮬레이션 틱마다 한 번 입력을 받으므로 허용 프레임
+        수가 렌더링 속도와 무관합니다.
+        """
+        attack_pressed = False
+        for event_type, key in self._pending_keys:
+            if event_type == pygame.KEYDOWN:
+                if key == pygame.K_UP:
+                    self.player1.jump()
+                elif key == pygame.K_SPACE:
+                    attack_pressed = True
+                elif key == pygame.K_DOWN:
+                    self.player1.guard()
+            elif key == pygame.K_DOWN:
+                self.player1.is_guarding = False
+        self._pending_keys.clear()
+
+        if self._held_input is None:
+            return  # 키보드 입력이 없는 헤드리스 진행
+        if self._move_direction:
+            self.player1.move(self._move_direction)
+        elif not self.player1.is_attacking and not self.player1.is_guarding:
             # Stop horizontal movement if no left/right key is pressed
             # Only if not attacking or guarding, as those states might override movement
-            if not self.player1.is_attacking and not self.player1.is_guarding:
-                self.player1.vel_x = 0
+            self.player1.vel_x = 0
+
+        # 커맨드 기술이 발동하면 같은 틱의 일반 펀치는 생략합니다.
+        move_id = -1
+        if self.motion_reader is not None:
+            move_id = self.motion_reader.feed(*self._held_input, self.player1.facing)
+            if move_id >= 0 and TRACER.mask & TRACE_INPUT:
+                TRACER.record(EV_MOTION, self.player1.trace_id, move_id)
+        if not (move_id >= 0 and self.player1.perform_move(move_id)) and attack_pressed:
+            self.player1.attack()
 
     def _update(self, dt: float) -> None:
         """
@@ -133,31 +228,13 @@ class Game:
         Args:
             dt (float): 마지막 프레임 이후 경과 시간 (델타 타임).
         """
-        print(f"[Game._update] Updating players and AI. dt={dt:.4f}")
-        self.frame_count += 1
-
-        # Update timer
-        self.timer_accumulator += dt
-        if self.timer_accumulator >= 1.0:
-            self.round_timer -= 1
-            self.timer_accumulator -= 1.0
-            if self.round_timer < 0:
-                self.round_timer = 0
-                self.running = False  # Game over on time out
-        self.player1.update(dt, self.player2)
-        self.player2.update(dt, self.player1)
+        self._apply_input()
+        self.simulation.update(dt)
 
         # self.ai_controller.update(dt) # Disabled for multi-agent control
 
-        print(f"[Game._update] Checking collisions.")
-        self.collision_manager.check_player_attack(self.player1, self.player2)
-        self.collision_manager.check_player_attack(self.player2, self.player1)
-
         # Check for game over condition
-        if self.player1.health <= 0 or self.player2.health <= 0:
-            print(
-                f"[Game._update] Game Over! Player1 Health: {self.player1.health}, Player2 Health: {self.player2.health}"
-            )
+        if self.simulation.round_over:
             self.running = False
 
     def _draw_health_bar(
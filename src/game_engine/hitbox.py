@@ -1,4 +1,4 @@
-import pygame
+from src.game_engine.rect import Rect
 
 
 class Hitbox:
@@ -6,7 +6,7 @@ class Hitbox:
     충돌 판정을 위한 사각형 영역을 정의하는 클래스.
 
     Attributes:
-        rect (pygame.Rect): 히트박스의 위치와 크기.
+        rect (Rect): 히트박스의 위치와 크기.
         damage (int): 이 히트박스가 주는 데미지 (공격용).
         active (bool): 히트박스 활성화 여부.
     """
@@ -22,18 +22,18 @@ class Hitbox:
             height (int): 히트박스의 높이.
             damage (int): 이 히트박스가 주는 데미지. 기본값은 0.
         """
-        self.rect: pygame.Rect = pygame.Rect(x, y, width, height)
+        self.rect: Rect = Rect(x, y, width, height)
         self.damage: int = damage
         self.active: bool = False
 
     def update_position(
-        self, parent_rect: pygame.Rect, offset_x: int, offset_y: int, facing: int
+        self, parent_rect: Rect, offset_x: int, offset_y: int, facing: int
     ) -> None:
         """
         부모 객체(캐릭터)의 위치와 방향에 따라 히트박스 위치를 업데이트합니다.
 
         Args:
-            parent_rect (pygame.Rect): 부모 객체의 Rect.
+            parent_rect (Rect): 부모 객체의 Rect.
             offset_x (int): 부모 객체로부터의 x축 오프셋.
             offset_y (int): 부모 객체로부터의 y축 오프셋.
             facing (int): 부모 객체의 방향 (1: 오른쪽, -1: 왼쪽).
@@ -45,12 +45,6 @@ class Hitbox:
         self.rect.y = parent_rect.y + offset_y
 
     def is_colliding(self, other_hitbox: "Hitbox") -> bool:
-        print(
-            f"Hitbox.is_colliding: self.active={self.active}, other_hitbox.active={other_hitbox.active}"
-        )
-        print(
-            f"Hitbox.is_colliding: self.rect={self.rect}, other_hitbox.rect={other_hitbox.rect}"
-        )
         return (
             self.active
             and other_hitbox.active
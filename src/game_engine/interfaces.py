@@ -1,6 +1,24 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
+import numpy as np
+
+from src.constants import (ACTION_ATTACK, ACTION_GUARD, ACTION_IDLE,
+                           ACTION_JUMP, ACTION_MOVE_LEFT, ACTION_MOVE_RIGHT,
+                           INITIAL_HEALTH, PLAYER_HEIGHT, PLAYER_WIDTH,
+                           SCREEN_HEIGHT, SCREEN_WIDTH)
 from src.game_engine.player import Player
+from src.game_engine.states import NUM_STATES
+from src.utils.tracing import EV_ACTION, TRACE_INPUT, TRACER
+
+# AI 행동 문자열 -> 숫자 행동 id
+ACTION_IDS: Dict[str, int] = {
+    "idle": ACTION_IDLE,
+    "move_right": ACTION_MOVE_RIGHT,
+    "move_left": ACTION_MOVE_LEFT,
+    "jump": ACTION_JUMP,
+    "attack": ACTION_ATTACK,
+    "guard": ACTION_GUARD,
+}
 
 
 def get_game_state(player1: Player, player2: Player) -> Dict[str, Any]:
@@ -47,6 +65,43 @@ def get_game_state(player1: Player, player2: Player) -> Dict[str, Any]:
     return state
 
 
+# 관측 벡터: [p1_x, p1_y, p1_hp, p1_state, p2_x, p2_y, p2_hp, p2_state] (모두 [0, 1])
+OBSERVATION_SIZE = 8
+_GROUND_Y = SCREEN_HEIGHT - PLAYER_HEIGHT
+_X_RANGE = SCREEN_WIDTH - PLAYER_WIDTH
+
+
+def write_observation(
+    player1: Player, player2: Player, out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    두 캐릭터 상태를 FightingEnv 관측 벡터로 직접 기록합니다. 중간 딕셔너리를 만들지 않으며,
+    `out`을 넘기면 새 배열을 할당하지 않습니다.
+
+    x는 화면 안 위치, y는 지면 기준 높이(지면 0), 체력은 INITIAL_HEALTH 대비 비율,
+    상태는 `encode_state`와 같은 인코딩입니다.
+
+    Args:
+        player1 (Player): Player 1 객체.
+        player2 (Player): Player 2 객체.
+        out (Optional[np.ndarray]): 결과를 기록할 (OBSERVATION_SIZE,) float32 배열.
+
+    Returns:
+        np.ndarray: 관측 벡터 (`out`을 넘겼으면 같은 배열).
+    """
+    if out is None:
+        out = np.empty(OBSERVATION_SIZE, dtype=np.float32)
+    out[0] = player1.rect.x / _X_RANGE
+    out[1] = (_GROUND_Y - player1.rect.y) / _GROUND_Y
+    out[2] = player1.health / INITIAL_HEALTH
+    out[3] = player1.state / (NUM_STATES - 1)
+    out[4] = player2.rect.x / _X_RANGE
+    out[5] = (_GROUND_Y - player2.rect.y) / _GROUND_Y
+    out[6] = player2.health / INITIAL_HEALTH
+    out[7] = player2.state / (NUM_STATES - 1)
+    return out
+
+
 def apply_ai_action(player: Player, action: str) -> None:
     """
     PyTorch AI 모델이 결정한 행동 문자열을 받아,
@@ -56,17 +111,31 @@ def apply_ai_action(player: Player, action: str) -> None:
         player (Player): 행동을 적용할 Player 객체.
         action (str): AI가 결정한 행동 문자열.
     """
-    print(f"[apply_ai_action] Player {player.color} applying action: {action}")
-    if action == "move_left":
+    action_id = ACTION_IDS.get(action)
+    if action_id is not None:
+        apply_action(player, action_id)
+
+
+def apply_action(player: Player, action: int) -> None:
+    """
+    숫자 행동 id(환경의 Discrete(6) 행동)를 `Player` 객체에 반영합니다.
+
+    Args:
+        player (Player): 행동을 적용할 Player 객체.
+        action (int): 0:Idle, 1:MoveRight, 2:MoveLeft, 3:Jump, 4:Attack, 5:Guard.
+    """
+    if TRACER.mask & TRACE_INPUT:
+        TRACER.record(EV_ACTION, player.trace_id, action)
+    if action == ACTION_MOVE_LEFT:
         player.move(-1)
-    elif action == "move_right":
+    elif action == ACTION_MOVE_RIGHT:
         player.move(1)
-    elif action == "jump":
+    elif action == ACTION_JUMP:
         player.jump()
-    elif action == "attack":
+    elif action == ACTION_ATTACK:
         player.attack()
-    elif action == "guard":
+    elif action == ACTION_GUARD:
         player.guard()
-    elif action == "idle":
+    elif action == ACTION_IDLE:
         player.vel_x = 0
         player.is_guarding = False
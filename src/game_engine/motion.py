@@ -0,0 +1,345 @@
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Tuple
+
+import numpy as np
+
+from src.game_engine.frame_data import MoveTable
+
+# 방향은 넘패드 표기(1~9, 5: 중립)이며 캐릭터가 바라보는 방향 기준입니다 (6: 앞, 4: 뒤).
+DIRECTION_NEUTRAL = 5
+ARROW_DIRECTIONS = {"↙": 1, "↓": 2, "↘": 3, "←": 4, "→": 6, "↖": 7, "↑": 8, "↗": 9}
+
+BUTTON_PUNCH = 1
+BUTTON_KICK = 2
+BUTTON_CODES = {"P": BUTTON_PUNCH, "K": BUTTON_KICK}
+# 한 프레임의 버튼 비트 조합 수 (상태 기계 테이블의 열 수)
+NUM_BUTTON_STATES = 1 << len(BUTTON_CODES)
+# 넘패드 방향 1~9를 그대로 열 인덱스로 씁니다 (0열은 사용하지 않음)
+NUM_DIRECTIONS = 10
+
+# 커맨드 단계 사이에 허용하는 최대 프레임 수와, 커맨드 완료 후 버튼 입력 허용 프레임 수
+DEFAULT_MOTION_WINDOW = 8
+DEFAULT_BUTTON_WINDOW = 6
+# 컴파일한 상태 기계의 최대 상태 수
+MAX_MOTION_STATES = 1 << 16
+
+
+def numpad_direction(horizontal, vertical, facing):
+    """
+    절대 방향 입력을 캐릭터 기준 넘패드 방향으로 변환합니다. NumPy 배열도 받습니다.
+
+    Args:
+        horizontal: -1(왼쪽), 0, 1(오른쪽).
+        vertical: -1(아래), 0, 1(위).
+        facing: 캐릭터 방향 (1: 오른쪽, -1: 왼쪽).
+
+    Returns:
+        넘패드 방향 (1~9).
+    """
+    return DIRECTION_NEUTRAL + horizontal * facing + 3 * vertical
+
+
+def encode_input(direction, buttons):
+    """
+    한 프레임의 입력을 1바이트로 묶습니다 (하위 4비트: 방향, 상위 4비트: 버튼). NumPy 배열도 받습니다.
+    """
+    return direction | (buttons << 4)
+
+
+def parse_motion(notation: str) -> Tuple[Tuple[int, ...], int]:
+    """
+    "↓↘→ + P" 형식의 커맨드 표기를 파싱합니다.
+
+    Args:
+        notation (str): 오른쪽을 보고 있을 때 기준의 커맨드 표기.
+
+    Returns:
+        Tuple[Tuple[int, ...], int]: (넘패드 방향 시퀀스, 버튼 비트).
+    """
+    motion, _, button = notation.partition("+")
+    sequence = tuple(ARROW_DIRECTIONS[arrow] for arrow in motion.strip())
+    button = button.strip()
+    if not sequence or button not in BUTTON_CODES:
+        raise ValueError(f"Invalid motion input: {notation!r}")
+    return sequence, BUTTON_CODES[button]
+
+
+class MotionTable(NamedTuple):
+    """
+    기술 목록에서 파싱한 커맨드 목록. `compile_automaton`의 입력입니다.
+
+    `sequences[m, progress]`가 커맨드 m이 progress개의 방향을 맞춘 뒤 다음에
+    기다리는 방향입니다. 긴 커맨드가 먼저 판정되도록 길이 내림차순으로 정렬합니다.
+
+    Attributes:
+        move_ids (np.ndarray): (M,) 커맨드에 대응하는 MoveTable 기술 인덱스.
+        sequences (np.ndarray): (M, L + 1) 방향 시퀀스 (남는 칸은 0).
+        lengths (np.ndarray): (M,) 커맨드 방향 수.
+        buttons (np.ndarray): (M,) 필요한 버튼 비트.
+    """
+
+    move_ids: np.ndarray
+    sequences: np.ndarray
+    lengths: np.ndarray
+    buttons: np.ndarray
+
+
+def compile_motions(move_table: MoveTable) -> MotionTable:
+    """
+    MoveTable의 커맨드 표기를 `MotionTable`로 컴파일합니다. 표기가 없는 기술은 제외합니다.
+
+    Args:
+        move_table (MoveTable): 캐릭터의 기술 테이블.
+
+    Returns:
+        MotionTable: 커맨드 전이 테이블.
+    """
+    motions = [
+        (move_id, *parse_motion(notation))
+        for move_id, notation in enumerate(move_table.inputs)
+        if notation
+    ]
+    motions.sort(key=lambda motion: -len(motion[1]))  # 안정 정렬: 같은 길이는 기술 순서 유지
+    max_length = max((len(sequence) for _, sequence, _ in motions), default=0)
+    sequences = np.zeros((len(motions), max_length + 1), dtype=np.int16)
+    for m, (_, sequence, _) in enumerate(motions):
+        sequences[m, : len(sequence)] = sequence
+    return MotionTable(
+        np.array([move_id for move_id, _, _ in motions], dtype=np.int64),
+        sequences,
+        np.array([len(sequence) for _, sequence, _ in motions], dtype=np.int16),
+        np.array([button for _, _, button in motions], dtype=np.int16),
+    )
+
+
+class InputBuffer:
+    """
+    플레이어의 프레임별 입력(방향 + 버튼)을 저장하는 고정 크기 링 버퍼.
+
+    Attributes:
+        size (int): 보관하는 프레임 수.
+        frame (int): 지금까지 기록한 프레임 수.
+    """
+
+    def __init__(self, size: int = 64):
+        """
+        InputBuffer 객체를 초기화합니다.
+
+        Args:
+            size (int): 보관할 프레임 수.
+        """
+        self.size = size
+        self._data = bytearray([DIRECTION_NEUTRAL] * size)
+        self.frame = 0
+
+    def push(self, value: int) -> None:
+        """
+        한 프레임의 입력(`encode_input` 값)을 기록합니다.
+        """
+        self._data[self.frame % self.size] = value
+        self.frame += 1
+
+    def __getitem__(self, age: int) -> int:
+        """
+        age 프레임 전의 입력을 반환합니다 (0: 가장 최근).
+        """
+        if not 0 <= age < min(self.size, self.frame):
+            raise IndexError(age)
+        return self._data[(self.frame - 1 - age) % self.size]
+
+    def recent(self, count: int) -> List[int]:
+        """
+        최근 count 프레임의 입력을 오래된 순서로 반환합니다.
+        """
+        count = min(count, self.size, self.frame)
+        return [self[age] for age in range(count - 1, -1, -1)]
+
+
+class MotionAutomaton(NamedTuple):
+    """
+    MotionTable의 모든 커맨드를 하나로 합친 결정적 상태 기계.
+
+    상태 하나가 모든 커맨드의 (진행도, 타이머) 조합을 나타내므로, 한 프레임 판정은
+    커맨드 수와 관계없이 테이블 조회 세 번입니다. 상태 0이 초기 상태입니다.
+    테이블이 NumPy 배열이므로 여러 플레이어의 상태 배열도
+    `transitions[states, directions]`처럼 같은 조회로 한 번에 갱신할 수 있습니다.
+
+    Attributes:
+        transitions (np.ndarray): (S, NUM_DIRECTIONS) 방향 입력 후의 상태.
+        fired (np.ndarray): (S, NUM_BUTTON_STATES) 새로 누른 버튼 비트별로 발동하는
+            기술의 MoveTable 인덱스 (없으면 -1).
+        after_press (np.ndarray): (S, NUM_BUTTON_STATES) 버튼 처리 후의 상태.
+    """
+
+    transitions: np.ndarray
+    fired: np.ndarray
+    after_press: np.ndarray
+
+
+def compile_automaton(
+    motion_table: MotionTable,
+    motion_window: int = DEFAULT_MOTION_WINDOW,
+    button_window: int = DEFAULT_BUTTON_WINDOW,
+) -> MotionAutomaton:
+    """
+    커맨드별 판정 규칙을 초기 상태에서 도달 가능한 조합만 탐색해 `MotionAutomaton`으로 컴파일합니다.
+
+    규칙: 다음 방향이 들어오면 진행도가 오르고 타이머가 0이 됩니다. 진행 중인 커맨드는
+    다음 방향이 `motion_window` 프레임 안에 들어오지 않으면 초기화되고(이번 방향이 첫
+    방향이면 진행도 1), 완료된 커맨드는 `button_window` 프레임 안에 버튼을 눌러야 합니다.
+    방향을 먼저 반영한 뒤 버튼을 판정하므로 마지막 방향과 같은 프레임의 버튼도 인정하며,
+    여러 커맨드가 완료되어 있으면 긴 커맨드가 먼저 발동하고 그 커맨드만 초기화됩니다.
+
+    Args:
+        motion_table (MotionTable): `compile_motions` 결과.
+        motion_window (int): 커맨드 단계 사이 허용 프레임 수.
+        button_window (int): 커맨드 완료 후 버튼 허용 프레임 수.
+
+    Returns:
+        MotionAutomaton: 합쳐진 상태 기계.
+
+    Raises:
+        ValueError: 상태 수가 MAX_MOTION_STATES를 넘는 경우.
+    """
+    move_ids = motion_table.move_ids.tolist()
+    sequences = motion_table.sequences.tolist()
+    lengths = motion_table.lengths.tolist()
+    buttons = motion_table.buttons.tolist()
+
+    def advance(state, direction):
+        next_state = []
+        for (progress, timer), sequence, length in zip(state, sequences, lengths):
+            if progress < length and direction == sequence[progress]:
+                progress, timer = progress + 1, 0
+            elif progress:
+                timer += 1
+                if timer > (button_window if progress >= length else motion_window):
+                    progress, timer = (1 if direction == sequence[0] else 0), 0
+            next_state.append((progress, timer))
+        return tuple(next_state)
+
+    def press(state, pressed):
+        for m, (progress, _) in enumerate(state):
+            if progress >= lengths[m] and pressed & buttons[m]:
+                return move_ids[m], state[:m] + ((0, 0),) + state[m + 1 :]
+        return -1, state
+
+    states = [((0, 0),) * len(move_ids)]
+    index: Dict[tuple, int] = {states[0]: 0}
+
+    def intern(state) -> int:
+        i = index.get(state)
+        if i is None:
+            if len(states) >= MAX_MOTION_STATES:
+                raise ValueError(f"Motion state machine exceeds {MAX_MOTION_STATES} states")
+            i = index[state] = len(states)
+            states.append(state)
+        return i
+
+    transitions, fired, after_press = [], [], []
+    i = 0
+    while i < len(states):  # 새로 도달한 상태는 목록 끝에 추가되어 차례로 처리됩니다
+        state = states[i]
+        transitions.append([i] + [intern(advance(state, d)) for d in range(1, NUM_DIRECTIONS)])
+        presses = [press(state, pressed) for pressed in range(NUM_BUTTON_STATES)]
+        fired.append([move_id for move_id, _ in presses])
+        after_press.append([intern(pressed_state) for _, pressed_state in presses])
+        i += 1
+    return MotionAutomaton(
+        np.array(transitions, dtype=np.int32),
+        np.array(fired, dtype=np.int64),
+        np.array(after_press, dtype=np.int32),
+    )
+
+
+@lru_cache(maxsize=None)
+def get_motion_automaton(
+    move_table: MoveTable,
+    motion_window: int = DEFAULT_MOTION_WINDOW,
+    button_window: int = DEFAULT_BUTTON_WINDOW,
+) -> MotionAutomaton:
+    """
+    기술 테이블의 상태 기계를 한 번만 컴파일해 캐시합니다 (`load_roster`의 테이블은 캐릭터당 하나).
+    """
+    return compile_automaton(compile_motions(move_table), motion_window, button_window)
+
+
+class MotionRecognizer:
+    """
+    한 플레이어의 커맨드 입력을 `MotionAutomaton`으로 판정합니다.
+
+    상태는 정수 하나이며 프레임당 비용은 커맨드 수와 관계없이 테이블 조회 세 번입니다.
+    """
+
+    def __init__(self, automaton: MotionAutomaton):
+        """
+        MotionRecognizer 객체를 초기화합니다.
+
+        Args:
+            automaton (MotionAutomaton): `compile_automaton` 결과.
+        """
+        self.automaton = automaton
+        # 파이썬 스칼라 조회가 빠르도록 리스트로 보관합니다.
+        self._transitions = automaton.transitions.tolist()
+        self._fired = automaton.fired.tolist()
+        self._after_press = automaton.after_press.tolist()
+        self.state = 0
+
+    def reset(self) -> None:
+        self.state = 0
+
+    def update(self, direction: int, pressed: int) -> int:
+        """
+        한 프레임의 입력으로 상태를 갱신합니다.
+
+        Args:
+            direction (int): 캐릭터 기준 넘패드 방향.
+            pressed (int): 이번 프레임에 새로 누른 버튼 비트.
+
+        Returns:
+            int: 발동한 기술의 MoveTable 인덱스. 없으면 -1.
+        """
+        state = self._transitions[self.state][direction]
+        self.state = self._after_press[state][pressed]
+        return self._fired[state][pressed]
+
+
+class MotionInputReader:
+    """
+    키 입력 상태를 프레임마다 `InputBuffer`에 기록하고 `MotionRecognizer`로 판정하는 도우미.
+    시뮬레이션 프레임(틱)마다 한 번씩 `feed`해야 프레임 단위 허용 시간이 맞습니다.
+
+    Attributes:
+        buffer (InputBuffer): 프레임별 입력 기록.
+        recognizer (MotionRecognizer): 커맨드 판정기.
+    """
+
+    def __init__(
+        self,
+        move_table: MoveTable,
+        buffer_size: int = 64,
+        motion_window: int = DEFAULT_MOTION_WINDOW,
+        button_window: int = DEFAULT_BUTTON_WINDOW,
+    ):
+        self.buffer = InputBuffer(buffer_size)
+        self.recognizer = MotionRecognizer(get_motion_automaton(move_table, motion_window, button_window))
+        self._held_buttons = 0
+
+    def feed(self, horizontal: int, vertical: int, buttons: int, facing: int) -> int:
+        """
+        이번 프레임에 눌려 있는 입력을 기록하고 판정합니다.
+
+        Args:
+            horizontal (int): -1(왼쪽), 0, 1(오른쪽).
+            vertical (int): -1(아래), 0, 1(위).
+            buttons (int): 눌려 있는 버튼 비트 (BUTTON_PUNCH | BUTTON_KICK).
+            facing (int): 캐릭터 방향.
+
+        Returns:
+            int: 발동한 기술의 MoveTable 인덱스. 없으면 -1.
+        """
+        direction = numpad_direction(horizontal, vertical, facing)
+        pressed = buttons & ~self._held_buttons
+        self._held_buttons = buttons
+        self.buffer.push(encode_input(direction, buttons))
+        return self.recognizer.update(direction, pressed)
@@ -0,0 +1,70 @@
+from typing import NamedTuple, Union
+
+from src.constants import (ATTACK_DURATION, FPS, GRAVITY, HIT_STUN_DURATION,
+                           JUMP_VELOCITY, PLAYER_SPEED, PUNCH_COOLDOWN,
+                           SUBPIXEL_SHIFT)
+
+Number = Union[int, float]
+
+
+class PhysicsProfile(NamedTuple):
+    """
+    캐릭터 물리와 타이머가 사용하는 단위 묶음.
+
+    `FLOAT_PHYSICS`는 기존과 같이 픽셀/초 단위 실수와 초 단위 타이머를 사용하고,
+    `FIXED_PHYSICS`는 1/FPS 고정 틱마다 정수 서브픽셀 물리와 프레임 단위 타이머를
+    사용합니다. 후자는 같은 입력에 대해 기기와 부하에 관계없이 비트 단위로 같은
+    상태를 만듭니다.
+
+    Attributes:
+        fixed_point (bool): 정수 서브픽셀/프레임 단위를 사용하는지 여부.
+        tick (Number): 한 프레임의 시간 (초 또는 1 프레임).
+        subpixels (int): 1픽셀당 위치 단위 수.
+        speed (Number): 이동 속도 (단위/tick).
+        jump_velocity (Number): 점프 초기 속도.
+        gravity (Number): 중력 가속도.
+        attack_duration (Number): 공격 지속 시간.
+        punch_cooldown (Number): 펀치 쿨다운.
+        hit_stun_duration (Number): 피격 경직 시간.
+        second (Number): 라운드 타이머의 1초.
+    """
+
+    fixed_point: bool
+    tick: Number
+    subpixels: int
+    speed: Number
+    jump_velocity: Number
+    gravity: Number
+    attack_duration: Number
+    punch_cooldown: Number
+    hit_stun_duration: Number
+    second: Number
+
+
+FLOAT_PHYSICS = PhysicsProfile(
+    fixed_point=False,
+    tick=1.0 / FPS,
+    subpixels=1,
+    speed=PLAYER_SPEED,
+    jump_velocity=JUMP_VELOCITY,
+    gravity=GRAVITY,
+    attack_duration=ATTACK_DURATION,
+    punch_cooldown=PUNCH_COOLDOWN,
+    hit_stun_duration=HIT_STUN_DURATION,
+    second=1.0,
+)
+
+_SUBPIXELS = 1 << SUBPIXEL_SHIFT
+
+FIXED_PHYSICS = PhysicsProfile(
+    fixed_point=True,
+    tick=1,
+    subpixels=_SUBPIXELS,
+    speed=round(PLAYER_SPEED * _SUBPIXELS / FPS),
+    jump_velocity=round(JUMP_VELOCITY * _SUBPIXELS / FPS),
+    gravity=round(GRAVITY * _SUBPIXELS / FPS**2),
+    attack_duration=round(ATTACK_DURATION * FPS),
+    punch_cooldown=round(PUNCH_COOLDOWN * FPS),
+    hit_stun_duration=round(HIT_STUN_DURATION * FPS),
+    second=FPS,
+)
@@ -1,13 +1,41 @@
-from typing import Tuple
+import struct
+from typing import TYPE_CHECKING, Optional, Tuple, Union
 
-import pygame
-
-from src.constants import (ATTACK_DURATION, BLACK, BLUE, GRAVITY, GRAY, GREEN,
-                           HIT_STUN_DURATION, INITIAL_HEALTH, JUMP_VELOCITY,
-                           PLAYER_HEIGHT, PLAYER_SPEED, PLAYER_WIDTH,
-                           PUNCH_COOLDOWN, PUNCH_DAMAGE, RED, SCREEN_HEIGHT,
-                           SCREEN_WIDTH, YELLOW)
+from src.constants import (BLACK, BLUE, GRAY, INITIAL_HEALTH, PUNCH_DAMAGE,
+                           RED, SCREEN_HEIGHT, SCREEN_WIDTH, SUBPIXEL_SHIFT,
+                           YELLOW)
+from src.game_engine.frame_data import PHASE_ACTIVE, MoveTable
 from src.game_engine.hitbox import Hitbox
+from src.game_engine.physics import FLOAT_PHYSICS, PhysicsProfile
+from src.game_engine.rect import Rect
+from src.game_engine.states import (EVENT_ATTACK, EVENT_ATTACK_END,
+                                    EVENT_GUARD, EVENT_GUARD_HIT,
+                                    EVENT_GUARD_HOLD, EVENT_GUARD_RELEASE,
+                                    EVENT_HIT, EVENT_KO, EVENT_LAND,
+                                    EVENT_SETTLE, EVENT_STUN_END,
+                                    FLAG_HIT_REACTION, FLAG_KEEPS_VELOCITY,
+                                    STATE_FLAGS, TRANSITIONS, PlayerState)
+from src.utils.tracing import (EV_ATTACK_END, EV_ATTACK_START, EV_DAMAGE,
+                               EV_GUARD, EV_GUARD_DAMAGE, EV_JUMP, EV_KO,
+                               EV_LAND, EV_MOVE, EV_MOVE_START, EV_STUN_END,
+                               TRACE_COMBAT, TRACE_PHYSICS, TRACER,
+                               subject_id)
+
+if TYPE_CHECKING:
+    import pygame
+
+# save_state() 레이아웃:
+# pos_x, pos_y, rect.x, rect.y, vel_x, vel_y, health, state, facing, flags,
+# attack_hitbox.x, attack_hitbox.y, attack_timer, punch_cooldown_timer,
+# hit_stun_timer, hit_text_timer, move_id, move_frame
+_STATE_STRUCT = struct.Struct("<ddiiddiBbBiiddddbh")
+# 고정소수점 모드: 같은 레이아웃에서 실수 필드를 64비트 정수로 저장 (크기 동일)
+_FIXED_STATE_STRUCT = struct.Struct("<qqiiqqiBbBiiqqqqbh")
+_FLAG_JUMPING = 1
+_FLAG_ATTACKING = 2
+_FLAG_GUARDING = 4
+_FLAG_HITBOX_ACTIVE = 8
+_FLAG_MOVE_CONNECTED = 16
 
 
 class Player:
@@ -15,11 +43,11 @@ class Player:
     게임 내 캐릭터의 상태, 움직임, 공격, 체력 등을 관리하는 클래스.
 
     Attributes:
-        rect (pygame.Rect): 캐릭터의 위치와 크기.
+        rect (Rect): 캐릭터의 위치와 크기.
         vel_x (float): X축 속도.
         vel_y (float): Y축 속도.
         health (int): 현재 체력.
-        state (str): 현재 상태 (예: "idle", "walk", "jump", "attack", "guard", "hit").
+        state (PlayerState): 현재 상태. 변경은 `TRANSITIONS[state][event]` 전이 테이블로만 합니다.
         facing (int): 바라보는 방향 (1: 오른쪽, -1: 왼쪽).
         is_jumping (bool): 점프 중인지 여부.
         is_attacking (bool): 공격 중인지 여부.
@@ -29,8 +57,14 @@ class Player:
         color (Tuple[int, int, int]): 캐릭터의 색상.
         attack_timer (float): 공격 지속 시간 타이머.
         punch_cooldown_timer (float): 펀치 쿨다운 타이머.
+        move_table (Optional[MoveTable]): 컴파일된 기술 테이블 (없으면 기본 펀치만 사용).
+        move_id (int): 진행 중인 기술 인덱스 (-1: 없음).
+        move_frame (int): 진행 중인 기술의 현재 프레임.
     """
 
+    # save_state()가 기록하는 바이트 수
+    STATE_SIZE: int = _STATE_STRUCT.size
+
     def __init__(
         self,
         x: int,
@@ -39,6 +73,8 @@ class Player:
         height: int,
         color: Tuple[int, int, int],
         facing: int,
+        physics: PhysicsProfile = FLOAT_PHYSICS,
+        move_table: Optional[MoveTable] = None,
     ):
         """
         Player 객체를 초기화합니다.
@@ -50,19 +86,31 @@ class Player:
             height (int): 캐릭터의 높이.
             color (Tuple[int, int, int]): 캐릭터의 색상.
             facing (int): 캐릭터의 초기 방향 (1: 오른쪽, -1: 왼쪽).
+            physics (PhysicsProfile): 물리/타이머 단위. FIXED_PHYSICS이면 위치와 속도는
+                정수 서브픽셀, 타이머는 프레임 수로 계산합니다.
+            move_table (Optional[MoveTable]): `perform_move`로 사용할 기술 테이블.
         """
-        self.rect: pygame.Rect = pygame.Rect(x, y, width, height)
-        self._pos_x: float = float(x)
-        self._pos_y: float = float(y)
+        self.physics: PhysicsProfile = physics
+        self._state_struct: struct.Struct = (
+            _FIXED_STATE_STRUCT if physics.fixed_point else _STATE_STRUCT
+        )
+        self.rect: Rect = Rect(x, y, width, height)
+        if physics.fixed_point:
+            self._pos_x = int(x) << SUBPIXEL_SHIFT
+            self._pos_y = int(y) << SUBPIXEL_SHIFT
+        else:
+            self._pos_x = float(x)
+            self._pos_y = float(y)
         self.vel_x: float = 0
         self.vel_y: float = 0
         self.health: int = INITIAL_HEALTH
-        self.state: str = "idle"
+        self.state: PlayerState = PlayerState.IDLE
         self.facing: int = facing
         self.is_jumping: bool = False
         self.is_attacking: bool = False
         self.is_guarding: bool = False
         self.color: Tuple[int, int, int] = color
+        self.trace_id: int = subject_id(color)
 
         # Hitboxes
         self.hurtbox: Hitbox = Hitbox(x, y, width, height)
@@ -74,12 +122,114 @@ class Player:
             0, 0, width // 1.5, height // 4, damage=PUNCH_DAMAGE
         )
         self.attack_hitbox.active = False
+        self._punch_hitbox = (
+            self.attack_hitbox.rect.width,
+            self.attack_hitbox.rect.height,
+            self.attack_hitbox.damage,
+        )
+
+        # 테이블 기반 기술 (frame_data.compile_moves)
+        self.move_table: Optional[MoveTable] = move_table
+        self.move_id: int = -1
+        self.move_frame: int = 0
+        self.move_connected: bool = False
+
+        # 고정소수점 모드의 타이머는 프레임 수(int)입니다.
+        zero = 0 if physics.fixed_point else 0.0
+        self.attack_timer: float = zero
+        self.punch_cooldown_timer: float = zero
+        self.hit_stun_timer: float = zero
+        self.hit_text_timer: float = zero
+        # 폰트는 렌더링 시점에 생성합니다 (헤드리스 시뮬레이션은 pygame.font가 필요 없음).
+        self.font = None
+
+    def save_state(
+        self, buffer: Optional[bytearray] = None, offset: int = 0
+    ) -> Union[bytes, bytearray]:
+        """
+        캐릭터의 시뮬레이션 상태(위치, 속도, 체력, 상태, 히트박스, 타이머)를
+        고정 크기(`Player.STATE_SIZE`) 바이너리로 직렬화합니다.
+
+        Args:
+            buffer (Optional[bytearray]): 지정하면 새 객체를 만들지 않고 이 버퍼의 offset 위치에 기록합니다.
+            offset (int): buffer 내 기록 시작 위치.
+
+        Returns:
+            Union[bytes, bytearray]: buffer가 없으면 새 bytes, 있으면 전달받은 buffer.
+        """
+        flags = (
+            (_FLAG_JUMPING if self.is_jumping else 0)
+            | (_FLAG_ATTACKING if self.is_attacking else 0)
+            | (_FLAG_GUARDING if self.is_guarding else 0)
+            | (_FLAG_HITBOX_ACTIVE if self.attack_hitbox.active else 0)
+            | (_FLAG_MOVE_CONNECTED if self.move_connected else 0)
+        )
+        values = (
+            self._pos_x,
+            self._pos_y,
+            self.rect.x,
+            self.rect.y,
+            self.vel_x,
+            self.vel_y,
+            self.health,
+            self.state,
+            self.facing,
+            flags,
+            self.attack_hitbox.rect.x,
+            self.attack_hitbox.rect.y,
+            self.attack_timer,
+            self.punch_cooldown_timer,
+            self.hit_stun_timer,
+            self.hit_text_timer,
+            self.move_id,
+            self.move_frame,
+        )
+        if buffer is None:
+            return self._state_struct.pack(*values)
+        self._state_struct.pack_into(buffer, offset, *values)
+        return buffer
+
+    def load_state(self, buffer: Union[bytes, bytearray, memoryview], offset: int = 0) -> None:
+        """
+        `save_state`로 직렬화한 상태를 객체를 새로 만들지 않고 그대로 복원합니다.
 
-        self.attack_timer: float = 0.0
-        self.punch_cooldown_timer: float = 0.0
-        self.hit_stun_timer: float = 0.0
-        self.hit_text_timer: float = 0.0
-        self.font = pygame.font.Font(None, 36)  # Increased font size
+        Args:
+            buffer (Union[bytes, bytearray, memoryview]): 직렬화된 상태.
+            offset (int): buffer 내 읽기 시작 위치.
+        """
+        (
+            self._pos_x,
+            self._pos_y,
+            self.rect.x,
+            self.rect.y,
+            self.vel_x,
+            self.vel_y,
+            self.health,
+            state,
+            self.facing,
+            flags,
+            self.attack_hitbox.rect.x,
+            self.attack_hitbox.rect.y,
+            self.attack_timer,
+            self.punch_cooldown_timer,
+            self.hit_stun_timer,
+            self.hit_text_timer,
+            self.move_id,
+            self.move_frame,
+        ) = self._state_struct.unpack_from(buffer, offset)
+        self.state = PlayerState(state)
+        self.is_jumping = bool(flags & _FLAG_JUMPING)
+        self.is_attacking = bool(flags & _FLAG_ATTACKING)
+        self.is_guarding = bool(flags & _FLAG_GUARDING)
+        self.attack_hitbox.active = bool(flags & _FLAG_HITBOX_ACTIVE)
+        self.move_connected = bool(flags & _FLAG_MOVE_CONNECTED)
+        self.hurtbox.rect.topleft = self.rect.topleft
+        # 히트박스 크기와 데미지는 저장하지 않고 기술 테이블에서 다시 구합니다.
+        if self.move_id >= 0 and self.move_frame >= 0:
+            row = self.move_table.frames[self.move_id][self.move_frame]
+            self._set_hitbox_shape(row.hitbox_width, row.hitbox_height, self.move_table.damage[self.move_id])
+        elif self.move_id < 0:
+            self._set_hitbox_shape(*self._punch_hitbox)
 
     def move(self, direction: int) -> None:
         """
@@ -89,43 +239,108 @@ class Player:
             direction (int): 이동 방향 (-1: 왼쪽, 1: 오른쪽).
         """
         if not self.is_attacking and not self.is_guarding:
-            self.vel_x = direction * PLAYER_SPEED
+            self.vel_x = direction * self.physics.speed
             self.facing = direction
-            print(
-                f"[Player.move] Player {self.color} moving {direction}. vel_x={self.vel_x}"
-            )
+            if TRACER.mask & TRACE_PHYSICS:
+                TRACER.record(EV_MOVE, self.trace_id, direction, self.vel_x)
 
     def jump(self) -> None:
         """
         캐릭터를 점프시킵니다.
         """
         if not self.is_jumping and not self.is_attacking and not self.is_guarding:
-            self.vel_y = JUMP_VELOCITY
+            self.vel_y = self.physics.jump_velocity
             self.is_jumping = True
-            print(f"[Player.jump] Player {self.color} jumping. vel_y={self.vel_y}")
+            if TRACER.mask & TRACE_PHYSICS:
+                TRACER.record(EV_JUMP, self.trace_id, self.vel_y)
 
     def attack(self) -> None:
         """
         공격 동작을 시작합니다.
         """
         if not self.is_attacking and self.punch_cooldown_timer <= 0:
-            self.state = "attack"
+            if self.move_table is not None:
+                self._set_hitbox_shape(*self._punch_hitbox)
+            self.state = TRANSITIONS[self.state][EVENT_ATTACK]
             self.is_attacking = True
             self.attack_hitbox.active = True
-            self.attack_timer = ATTACK_DURATION
-            self.punch_cooldown_timer = PUNCH_COOLDOWN
-            print(
-                f"[Player.attack] Player {self.color} started attack. is_attacking={self.is_attacking}, hitbox_active={self.attack_hitbox.active}"
-            )
+            self.attack_timer = self.physics.attack_duration
+            self.punch_cooldown_timer = self.physics.punch_cooldown
+            if TRACER.mask & TRACE_COMBAT:
+                TRACER.record(EV_ATTACK_START, self.trace_id, self.attack_timer)
+
+    def perform_move(self, move_id: int) -> bool:
+        """
+        기술 테이블의 기술을 시작합니다. 공격 중이 아니거나, 진행 중인 기술이
+        캔슬 가능 프레임일 때만 시작할 수 있습니다.
+
+        Args:
+            move_id (int): `move_table` 내 기술 인덱스.
+
+        Returns:
+            bool: 기술이 시작되었으면 True.
+        """
+        if self.move_table is None or not 0 <= move_id < len(self.move_table):
+            raise ValueError(f"Player has no move {move_id}")
+        if self.is_attacking:
+            if self.move_id < 0 or self.move_frame < 0:
+                return False
+            if not self.move_table.frames[self.move_id][self.move_frame].cancelable:
+                return False
+        self.state = TRANSITIONS[self.state][EVENT_ATTACK]
+        self.is_attacking = True
+        self.attack_hitbox.active = False
+        self.move_id = move_id
+        self.move_frame = -1  # update()에서 0 프레임부터 진행
+        self.move_connected = False
+        if TRACER.mask & TRACE_COMBAT:
+            TRACER.record(EV_MOVE_START, self.trace_id, move_id)
+        return True
+
+    def _set_hitbox_shape(self, width: int, height: int, damage: int) -> None:
+        self.attack_hitbox.rect.width = width
+        self.attack_hitbox.rect.height = height
+        self.attack_hitbox.damage = damage
+
+    def _update_move(self) -> None:
+        """
+        진행 중인 기술을 한 프레임 진행하고 테이블의 히트박스를 적용합니다.
+        """
+        table = self.move_table
+        frames = table.frames[self.move_id]
+        # 활성 프레임에서 히트박스가 꺼져 있으면 충돌 처리에서 이미 맞힌 것입니다.
+        if (
+            self.move_frame >= 0
+            and frames[self.move_frame].phase == PHASE_ACTIVE
+            and not self.attack_hitbox.active
+        ):
+            self.move_connected = True
+
+        self.move_frame += 1
+        if self.move_frame >= len(frames):
+            if TRACER.mask & TRACE_COMBAT:
+                TRACER.record(EV_ATTACK_END, self.trace_id, self.move_id)
+            self.is_attacking = False
+            self.attack_hitbox.active = False
+            self.move_id = -1
+            self.move_frame = 0
+            self.state = TRANSITIONS[self.state][EVENT_ATTACK_END]
+            return
+
+        row = frames[self.move_frame]
+        self._set_hitbox_shape(row.hitbox_width, row.hitbox_height, table.damage[self.move_id])
+        self.attack_hitbox.active = row.phase == PHASE_ACTIVE and not self.move_connected
+        self.attack_hitbox.update_position(self.rect, row.hitbox_x, row.hitbox_y, self.facing)
 
     def guard(self) -> None:
         """
         가드 동작을 시작합니다.
         """
         if not self.is_attacking and not self.is_jumping:
-            self.state = "guard"
+            self.state = TRANSITIONS[self.state][EVENT_GUARD]
             self.is_guarding = True
-            print(f"[Player.guard] Player {self.color} guarding.")
+            if TRACER.mask & TRACE_COMBAT:
+                TRACER.record(EV_GUARD, self.trace_id)
 
     def take_damage(self, damage: int) -> None:
         """
@@ -134,23 +349,23 @@ class Player:
         Args:
             damage (int): 받을 데미지 양.
         """
-        initial_health = self.health
         if self.is_guarding:
             self.health -= damage // 2  # Half damage when guarding
-            self.state = "guard_hit"
-            print(
-                f"[Player.take_damage] Player {self.color} guarded, took {damage // 2} damage. Health: {initial_health} -> {self.health}"
-            )
+            self.state = TRANSITIONS[self.state][EVENT_GUARD_HIT]
+            if TRACER.mask & TRACE_COMBAT:
+                TRACER.record(EV_GUARD_DAMAGE, self.trace_id, damage // 2, self.health)
         else:
             self.health -= damage
-            self.state = "hit"
-            print(
-                f"[Player.take_damage] Player {self.color} took {damage} damage. Health: {initial_health} -> {self.health}"
-            )
-        if self.health < 0:
+            self.state = TRANSITIONS[self.state][EVENT_HIT]
+            if TRACER.mask & TRACE_COMBAT:
+                TRACER.record(EV_DAMAGE, self.trace_id, damage, self.health)
+        if self.health <= 0:
             self.health = 0
-        self.hit_stun_timer = HIT_STUN_DURATION
-        self.hit_text_timer = HIT_STUN_DURATION * 2  # Display HIT! for longer
+            self.state = TRANSITIONS[self.state][EVENT_KO]
+            if TRACER.mask & TRACE_COMBAT:
+                TRACER.record(EV_KO, self.trace_id)
+        self.hit_stun_timer = self.physics.hit_stun_duration
+        self.hit_text_timer = self.physics.hit_stun_duration * 2  # Display HIT! for longer
         # print(f"Player {self.color} took {damage} damage. Hit text timer set to {self.hit_text_timer}") # Original print
 
     def update(self, dt: float, opponent: "Player") -> None:
@@ -158,18 +373,16 @@ class Player:
         캐릭터의 물리 및 상태를 업데이트합니다.
 
         Args:
-            dt (float): 마지막 프레임 이후 경과 시간 (델타 타임).
+            dt (float): 마지막 프레임 이후 경과 시간 (델타 타임). 고정소수점 모드에서는 프레임 수(1).
             opponent (Player): 상대방 캐릭터 객체 (충돌 감지용).
         """
-        print(
-            f"[Player.update] Player {self.color} state={self.state}, is_attacking={self.is_attacking}, is_guarding={self.is_guarding}, hit_stun_timer={self.hit_stun_timer:.2f}"
-        )
         # Update hit stun timer
         if self.hit_stun_timer > 0:
             self.hit_stun_timer -= dt
             if self.hit_stun_timer <= 0:
-                self.state = "idle"  # Exit hit stun
-                print(f"[Player.update] Player {self.color} exited hit stun.")
+                self.state = TRANSITIONS[self.state][EVENT_STUN_END]  # Exit hit stun
+                if TRACER.mask & TRACE_COMBAT:
+                    TRACER.record(EV_STUN_END, self.trace_id)
 
         # Update hit text timer
         if self.hit_text_timer > 0:
@@ -182,19 +395,25 @@ class Player:
             self.is_attacking = False
             self.attack_hitbox.active = False
             self.is_guarding = False
+            self.move_id = -1
+            self.move_frame = 0
             return  # Skip other updates if in hit stun
 
         # Apply gravity
         # print(f"Before gravity: vel_y={self.vel_y}, _pos_y={self._pos_y}, rect.y={self.rect.y}") # Original print
-        self.vel_y += GRAVITY * dt
+        self.vel_y += self.physics.gravity * dt
         self._pos_x += self.vel_x * dt
         self._pos_y += self.vel_y * dt
-        self.rect.x = int(self._pos_x)
-        self.rect.y = int(self._pos_y)
+        if self.physics.fixed_point:
+            self.rect.x = self._pos_x >> SUBPIXEL_SHIFT
+            self.rect.y = self._pos_y >> SUBPIXEL_SHIFT
+        else:
+            self.rect.x = int(self._pos_x)
+            self.rect.y = int(self._pos_y)
         # print(f"After gravity: vel_y={self.vel_y}, _pos_y={self._pos_y}, rect.y={self.rect.y}") # Original print
 
         # Stop horizontal movement if no input
-        if self.state not in ["attack", "hit", "guard_hit"] and not self.is_guarding:
+        if not STATE_FLAGS[self.state] & FLAG_KEEPS_VELOCITY and not self.is_guarding:
             self.vel_x = 0
 
         # Keep player on screen
@@ -205,28 +424,29 @@ class Player:
 
         # Ground collision
         if self.rect.bottom > SCREEN_HEIGHT:
-            self._pos_y = SCREEN_HEIGHT - self.rect.height
-            self.rect.y = int(self._pos_y)
+            self.rect.y = SCREEN_HEIGHT - self.rect.height
+            self._pos_y = self.rect.y * self.physics.subpixels
             self.vel_y = 0
+            if self.is_jumping and TRACER.mask & TRACE_PHYSICS:
+                TRACER.record(EV_LAND, self.trace_id, self.rect.y)
             self.is_jumping = False
-            if self.state == "jump":
-                self.state = "idle"
+            self.state = TRANSITIONS[self.state][EVENT_LAND]
 
         # Update hurtbox position
         self.hurtbox.rect.topleft = self.rect.topleft
 
         # Update attack state and timer
-        if self.is_attacking:
+        if self.move_id >= 0:
+            self._update_move()
+        elif self.is_attacking:
             # print(f"Player {self.color} update: Before attack_timer check. is_attacking={self.is_attacking}, hitbox_active={self.attack_hitbox.active}, attack_timer={self.attack_timer}") # Original print
             self.attack_timer -= dt
             if self.attack_timer <= 0:
                 self.is_attacking = False
                 self.attack_hitbox.active = False
-                if self.state == "attack":
-                    self.state = "idle"
-                print(
-                    f"[Player.update] Player {self.color} attack ended. is_attacking={self.is_attacking}, hitbox_active={self.attack_hitbox.active}"
-                )
+                self.state = TRANSITIONS[self.state][EVENT_ATTACK_END]
+                if TRACER.mask & TRACE_COMBAT:
+                    TRACER.record(EV_ATTACK_END, self.trace_id, -1)
             else:
                 # Position attack hitbox relative to player and facing direction
                 offset_x = (
@@ -243,47 +463,40 @@ class Player:
         if self.punch_cooldown_timer > 0:
             self.punch_cooldown_timer -= dt
 
-        # Reset guard state
-        if self.is_guarding and self.state != "guard_hit":
-            self.state = "guard"
-        elif not self.is_guarding and self.state == "guard":
-            self.state = "idle"
-        elif self.state == "hit" or self.state == "guard_hit":
-            # Simple hit stun for now, transition back to idle after a short delay
-            # In a real game, this would involve animation states and recovery frames
-            pass  # Handled by external logic or animation system
-        elif (
-            not self.is_attacking
-            and not self.is_jumping
-            and not self.is_guarding
-            and self.state not in ["hit", "guard_hit"]
-        ):
-            self.state = "idle"
+        # Reset guard state (hit reactions stay until the stun timer ends; see TRANSITIONS)
+        if self.is_guarding:
+            self.state = TRANSITIONS[self.state][EVENT_GUARD_HOLD]
+        elif self.is_attacking or self.is_jumping:
+            self.state = TRANSITIONS[self.state][EVENT_GUARD_RELEASE]
+        else:
+            self.state = TRANSITIONS[self.state][EVENT_SETTLE]
 
-    def draw(self, screen: pygame.Surface) -> None:
+    def draw(self, screen: "pygame.Surface") -> None:
         """
         캐릭터를 화면에 그립니다.
 
         Args:
             screen (pygame.Surface): 그릴 화면.
         """
+        import pygame
+
         # Draw player body
         current_color = self.color
         if self.is_attacking:
             current_color = YELLOW  # Attack color
         elif self.is_guarding:
             current_color = GRAY  # Guard color
-        elif self.state == "hit" or self.state == "guard_hit":
+        elif STATE_FLAGS[self.state] & FLAG_HIT_REACTION:
             current_color = RED  # Hit color
 
-        pygame.draw.rect(screen, current_color, self.rect)
+        pygame.draw.rect(screen, current_color, tuple(self.rect))
 
         # Draw attack hitbox if active
         if self.attack_hitbox.active:
-            pygame.draw.rect(screen, YELLOW, self.attack_hitbox.rect)
+            pygame.draw.rect(screen, YELLOW, tuple(self.attack_hitbox.rect))
 
         # Draw hurtbox (for debugging)
-        pygame.draw.rect(screen, BLUE, self.hurtbox.rect, 1)
+        pygame.draw.rect(screen, BLUE, tuple(self.hurtbox.rect), 1)
 
         # Indicate facing direction
         triangle_points = []
@@ -315,6 +528,8 @@ class Player:
 
         # Draw 'HIT!' text if hit_text_timer is active
         if self.hit_text_timer > 0:
+            if self.font is None:
+                self.font = pygame.font.Font(None, 36)  # Increased font size
             hit_text_surface = self.font.render("HIT!", True, BLACK)
             screen.blit(
                 hit_text_surface,
@@ -0,0 +1,123 @@
+from typing import Iterator, Tuple
+
+
+class Rect:
+    """
+    pygame.Rect 없이 시뮬레이션을 돌리기 위한 순수 파이썬 정수 사각형.
+
+    pygame.Rect와 동일하게 좌표는 int로 잘라 저장하며, 엔진이 사용하는
+    속성(left/right/top/bottom/centerx/centery/topleft)과 colliderect만 제공합니다.
+    렌더링 시에는 (x, y, width, height) 시퀀스로 그대로 pygame.draw에 넘길 수 있습니다.
+
+    Attributes:
+        x (int): 좌측 상단 x 좌표.
+        y (int): 좌측 상단 y 좌표.
+        width (int): 너비.
+        height (int): 높이.
+    """
+
+    __slots__ = ("x", "y", "width", "height")
+
+    def __init__(self, x: float, y: float, width: float, height: float):
+        """
+        Rect 객체를 초기화합니다.
+
+        Args:
+            x (float): 좌측 상단 x 좌표.
+            y (float): 좌측 상단 y 좌표.
+            width (float): 너비.
+            height (float): 높이.
+        """
+        self.x: int = int(x)
+        self.y: int = int(y)
+        self.width: int = int(width)
+        self.height: int = int(height)
+
+    @property
+    def left(self) -> int:
+        return self.x
+
+    @left.setter
+    def left(self, value: int) -> None:
+        self.x = int(value)
+
+    @property
+    def right(self) -> int:
+        return self.x + self.width
+
+    @right.setter
+    def right(self, value: int) -> None:
+        self.x = int(value) - self.width
+
+    @property
+    def top(self) -> int:
+        return self.y
+
+    @top.setter
+    def top(self, value: int) -> None:
+        self.y = int(value)
+
+    @property
+    def bottom(self) -> int:
+        return self.y + self.height
+
+    @bottom.setter
+    def bottom(self, value: int) -> None:
+        self.y = int(value) - self.height
+
+    @property
+    def centerx(self) -> int:
+        return self.x + self.width // 2
+
+    @property
+    def centery(self) -> int:
+        return self.y + self.height // 2
+
+    @property
+    def topleft(self) -> Tuple[int, int]:
+        return (self.x, self.y)
+
+    @topleft.setter
+    def topleft(self, value: Tuple[int, int]) -> None:
+        self.x = int(value[0])
+        self.y = int(value[1])
+
+    def colliderect(self, other: "Rect") -> bool:
+        """
+        두 사각형이 겹치는지 검사합니다. pygame.Rect.colliderect와 같이
+        변이 맞닿기만 하는 경우나 너비/높이가 0인 경우는 충돌로 보지 않습니다.
+
+        Args:
+            other (Rect): 비교할 사각형.
+
+        Returns:
+            bool: 겹치면 True.
+        """
+        return (
+            self.width > 0
+            and self.height > 0
+            and other.width > 0
+            and other.height > 0
+            and self.x < other.x + other.width
+            and other.x < self.x + self.width
+            and self.y < other.y + other.height
+            and other.y < self.y + self.height
+        )
+
+    def __iter__(self) -> Iterator[int]:
+        return iter((self.x, self.y, self.width, self.height))
+
+    def __len__(self) -> int:
+        return 4
+
+    def __getitem__(self, index: int) -> int:
+        return (self.x, self.y, self.width, self.height)[index]
+
+    def __eq__(self, other: object) -> bool:
+        try:
+            return tuple(self) == tuple(other)  # type: ignore[arg-type]
+        except TypeError:
+            return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"<rect({self.x}, {self.y}, {self.width}, {self.height})>"
@@ -0,0 +1,226 @@
+import hashlib
+import struct
+from typing import Optional, Tuple, Union
+
+from src.constants import (BLUE, PLAYER_HEIGHT, PLAYER_WIDTH, RED,
+                           ROUND_TIME, SCREEN_HEIGHT, SCREEN_WIDTH)
+from src.game_engine.collision import CollisionManager
+from src.game_engine.frame_data import get_move_table
+from src.game_engine.interfaces import apply_action
+from src.game_engine.physics import FIXED_PHYSICS, FLOAT_PHYSICS
+from src.game_engine.player import Player
+from src.utils.tracing import (EV_FRAME, EV_ROUND_OVER, TRACE_COMBAT,
+                               TRACE_PHYSICS, TRACER)
+
+# 결정론 모드의 결과(물리, 타이머, 스냅샷 레이아웃)가 바뀌면 올립니다.
+# 리플레이는 같은 엔진 버전에서만 재생할 수 있습니다.
+ENGINE_VERSION = 2
+
+# save_state() 헤더: frame_count, round_timer, timer_accumulator, round_over
+_HEADER_STRUCT = struct.Struct("<iidB")
+_FIXED_HEADER_STRUCT = struct.Struct("<iiqB")
+
+
+class Simulation:
+    """
+    디스플레이, 폰트, pygame 없이 두 캐릭터의 대전을 진행하는 시뮬레이션 코어.
+
+    물리, 히트박스, 타이머 로직은 `Player.update`와
+    `CollisionManager.check_player_attack`을 그대로 사용하고, 사각형은
+    순수 파이썬 `Rect`로 계산합니다. 렌더링이 필요하면 `Game`이 이 코어 위에서
+    화면을 그리는 어댑터 역할을 합니다.
+
+    deterministic=True이면 1/FPS 고정 틱, 정수 서브픽셀 물리, 프레임 단위 타이머를
+    사용하므로 같은 입력 스트림은 항상 같은 `state_hash()`를 만듭니다.
+
+    characters를 지정하면 각 캐릭터의 MOVES_DATA를 컴파일한 기술 테이블을
+    불러와 `Player.perform_move`로 사용할 수 있습니다.
+
+    Attributes:
+        deterministic (bool): 고정소수점 결정론 모드 여부.
+        physics (PhysicsProfile): 캐릭터와 라운드 타이머가 사용하는 단위.
+        characters (Tuple[Optional[int], Optional[int]]): 두 캐릭터의 id (None: 기본 펀치만 사용).
+        player1 (Player): Player 1 객체.
+        player2 (Player): Player 2 객체.
+        collision_manager (CollisionManager): 공격 충돌 처리기.
+        frame_count (int): 진행된 프레임 수.
+        round_timer (int): 남은 라운드 시간 (초).
+        timer_accumulator (float): 라운드 타이머용 누적 시간 (결정론 모드에서는 프레임 수).
+        round_over (bool): 라운드 종료 여부 (KO 또는 타임 오버).
+    """
+
+    # save_state()가 기록하는 바이트 수
+    STATE_SIZE: int = _HEADER_STRUCT.size + 2 * Player.STATE_SIZE
+    # state_hash()의 다이제스트 바이트 수
+    HASH_SIZE: int = 16
+
+    def __init__(
+        self,
+        deterministic: bool = False,
+        characters: Tuple[Optional[int], Optional[int]] = (None, None),
+    ):
+        """
+        Simulation 객체를 초기화합니다.
+
+        Args:
+            deterministic (bool): True이면 고정소수점 결정론 모드로 진행합니다.
+            characters (Tuple[Optional[int], Optional[int]]): Player 1, 2의 캐릭터 id.
+        """
+        self.deterministic = deterministic
+        self.characters = tuple(characters)
+        self._move_tables = tuple(get_move_table(character) for character in self.characters)
+        self.physics = FIXED_PHYSICS if deterministic else FLOAT_PHYSICS
+        self._header_struct = _FIXED_HEADER_STRUCT if deterministic else _HEADER_STRUCT
+        self.player1: Player = self._create_player1()
+        self.player2: Player = self._create_player2()
+        self.collision_manager: CollisionManager = CollisionManager()
+        self.frame_count: int = 0
+        self.round_timer: int = ROUND_TIME
+        self.timer_accumulator: float = 0 if deterministic else 0.0
+        self.round_over: bool = False
+
+    def _create_player1(self) -> Player:
+        return Player(
+            100,
+            SCREEN_HEIGHT - PLAYER_HEIGHT,
+            PLAYER_WIDTH,
+            PLAYER_HEIGHT,
+            BLUE,
+            1,
+            self.physics,
+            self._move_tables[0],
+        )
+
+    def _create_player2(self) -> Player:
+        return Player(
+            SCREEN_WIDTH - 100 - PLAYER_WIDTH,
+            SCREEN_HEIGHT - PLAYER_HEIGHT,
+            PLAYER_WIDTH,
+            PLAYER_HEIGHT,
+            RED,
+            -1,
+            self.physics,
+            self._move_tables[1],
+        )
+
+    def reset(self) -> None:
+        """
+        두 캐릭터와 라운드 타이머를 초기 상태로 되돌립니다.
+        """
+        self.player1 = self._create_player1()
+        self.player2 = self._create_player2()
+        self.collision_manager = CollisionManager()
+        self.frame_count = 0
+        self.round_timer = ROUND_TIME
+        self.timer_accumulator = 0 if self.deterministic else 0.0
+        self.round_over = False
+
+    def save_state(
+        self, buffer: Optional[bytearray] = None, offset: int = 0
+    ) -> Union[bytes, bytearray]:
+        """
+        전체 시뮬레이션 상태(라운드 타이머와 두 캐릭터)를 고정 크기
+        (`Simulation.STATE_SIZE`) 바이너리로 직렬화합니다. 롤백, 탐색, 리플레이
+        탐색처럼 스냅샷을 자주 만드는 경우 미리 할당한 buffer를 재사용하세요.
+
+        Args:
+            buffer (Optional[bytearray]): 지정하면 이 버퍼의 offset 위치에 기록합니다.
+            offset (int): buffer 내 기록 시작 위치.
+
+        Returns:
+            Union[bytes, bytearray]: buffer가 없으면 새 bytes, 있으면 전달받은 buffer.
+        """
+        out = bytearray(self.STATE_SIZE) if buffer is None else buffer
+        self._header_struct.pack_into(
+            out,
+            offset,
+            self.frame_count,
+            self.round_timer,
+            self.timer_accumulator,
+            self.round_over,
+        )
+        offset += self._header_struct.size
+        self.player1.save_state(out, offset)
+        self.player2.save_state(out, offset + Player.STATE_SIZE)
+        return bytes(out) if buffer is None else out
+
+    def load_state(self, buffer: Union[bytes, bytearray, memoryview], offset: int = 0) -> None:
+        """
+        `save_state`로 직렬화한 상태를 기존 객체에 그대로 복원합니다.
+
+        Args:
+            buffer (Union[bytes, bytearray, memoryview]): 직렬화된 상태.
+            offset (int): buffer 내 읽기 시작 위치.
+        """
+        (
+            self.frame_count,
+            self.round_timer,
+            self.timer_accumulator,
+            round_over,
+        ) = self._header_struct.unpack_from(buffer, offset)
+        self.round_over = bool(round_over)
+        offset += self._header_struct.size
+        self.player1.load_state(buffer, offset)
+        self.player2.load_state(buffer, offset + Player.STATE_SIZE)
+
+    def state_hash(self) -> str:
+        """
+        현재 상태의 해시를 반환합니다. 결정론 모드에서 리플레이/롤백 검증에 사용합니다.
+
+        Returns:
+            str: `save_state()` 바이트의 BLAKE2b 16진수 다이제스트.
+        """
+        return hashlib.blake2b(self.save_state(), digest_size=self.HASH_SIZE).hexdigest()
+
+    def step(self, p1_action: int, p2_action: int, dt: Optional[float] = None) -> bool:
+        """
+        두 플레이어의 행동을 적용하고 한 프레임을 진행합니다.
+
+        Args:
+            p1_action (int): Player 1의 행동 id (0:Idle, 1:MoveRight, 2:MoveLeft, 3:Jump, 4:Attack, 5:Guard).
+            p2_action (int): Player 2의 행동 id.
+            dt (Optional[float]): 프레임 시간 (초). 기본값은 1/FPS. 결정론 모드에서는 무시되고
+                항상 고정 틱 하나만큼 진행합니다.
+
+        Returns:
+            bool: 이 프레임 이후 라운드가 끝났으면 True.
+        """
+        if TRACER.mask:
+            TRACER.frame = self.frame_count + 1  # 입력은 이번에 진행할 프레임에 기록
+        apply_action(self.player1, p1_action)
+        apply_action(self.player2, p2_action)
+        self.update(self.physics.tick if dt is None or self.deterministic else dt)
+        return self.round_over
+
+    def update(self, dt: float) -> None:
+        """
+        라운드 타이머, 캐릭터 물리/상태, 공격 충돌을 한 프레임 진행합니다.
+
+        Args:
+            dt (float): 마지막 프레임 이후 경과 시간 (델타 타임). 결정론 모드에서는 프레임 수(1).
+        """
+        self.frame_count += 1
+        if TRACER.mask:
+            TRACER.frame = self.frame_count
+            if TRACER.mask & TRACE_PHYSICS:
+                TRACER.record(EV_FRAME, 0, dt)
+
+        # Update timer
+        self.timer_accumulator += dt
+        if self.timer_accumulator >= self.physics.second:
+            self.round_timer -= 1
+            self.timer_accumulator -= self.physics.second
+            if self.round_timer < 0:
+                self.round_timer = 0
+                self.round_over = True  # Game over on time out
+        self.player1.update(dt, self.player2)
+        self.player2.update(dt, self.player1)
+
+        self.collision_manager.check_player_attack(self.player1, self.player2)
+        self.collision_manager.check_player_attack(self.player2, self.player1)
+
+        # Check for game over condition
+        if self.player1.health <= 0 or self.player2.health <= 0:
+            self.round_over = True
+        if self.round_over and TRACER.mask & TRACE_COMBAT:
+            TRACER.record(EV_ROUND_OVER, 0, self.player1.health, self.player2.health)
@@ -0,0 +1,88 @@
+from enum import IntEnum
+from typing import Dict, Tuple
+
+
+class PlayerState(IntEnum):
+    """
+    캐릭터 상태의 정수 인코딩. Player, 배치 엔진, 상태 스냅샷, 관측 인코더가 공유합니다.
+    """
+
+    IDLE = 0
+    WALK = 1
+    JUMP = 2
+    ATTACK = 3
+    GUARD = 4
+    HIT = 5
+    GUARD_HIT = 6
+    KO = 7
+
+
+NUM_STATES = len(PlayerState)
+STATE_NAMES: Tuple[str, ...] = tuple(state.name.lower() for state in PlayerState)
+STATE_CODES: Dict[str, int] = {name: code for code, name in enumerate(STATE_NAMES)}
+
+STATE_IDLE = PlayerState.IDLE
+STATE_WALK = PlayerState.WALK
+STATE_JUMP = PlayerState.JUMP
+STATE_ATTACK = PlayerState.ATTACK
+STATE_GUARD = PlayerState.GUARD
+STATE_HIT = PlayerState.HIT
+STATE_GUARD_HIT = PlayerState.GUARD_HIT
+STATE_KO = PlayerState.KO
+
+# 상태별 플래그 (STATE_FLAGS[state] & FLAG_*)
+FLAG_KEEPS_VELOCITY = 1  # 입력이 없어도 수평 속도를 유지
+FLAG_HIT_REACTION = 2  # 피격 반응 중 (추가 타격 불가, 자동으로 idle이 되지 않음)
+
+STATE_FLAGS: Tuple[int, ...] = (
+    0,  # IDLE
+    0,  # WALK
+    0,  # JUMP
+    FLAG_KEEPS_VELOCITY,  # ATTACK
+    0,  # GUARD
+    FLAG_KEEPS_VELOCITY | FLAG_HIT_REACTION,  # HIT
+    FLAG_KEEPS_VELOCITY | FLAG_HIT_REACTION,  # GUARD_HIT
+    FLAG_KEEPS_VELOCITY | FLAG_HIT_REACTION,  # KO
+)
+
+# 상태 전이 이벤트
+EVENT_ATTACK = 0  # 공격/기술 시작
+EVENT_ATTACK_END = 1  # 공격/기술 종료
+EVENT_GUARD = 2  # guard() 호출
+EVENT_HIT = 3  # 가드하지 않고 피격
+EVENT_GUARD_HIT = 4  # 가드 중 피격
+EVENT_KO = 5  # 체력 0
+EVENT_STUN_END = 6  # 경직 종료
+EVENT_LAND = 7  # 착지
+EVENT_GUARD_HOLD = 8  # 프레임 끝, 가드 유지 중
+EVENT_GUARD_RELEASE = 9  # 프레임 끝, 가드 해제 + 공격/점프 중
+EVENT_SETTLE = 10  # 프레임 끝, 아무 동작도 없음
+NUM_EVENTS = 11
+
+_I, _W, _J, _A, _G, _H, _GH, _KO = PlayerState
+
+# TRANSITIONS[state][event] -> 다음 상태
+TRANSITIONS: Tuple[Tuple[PlayerState, ...], ...] = (
+    # ATTACK ATTACK_END GUARD HIT  GUARD_HIT KO  STUN_END LAND GUARD_HOLD GUARD_RELEASE SETTLE
+    (_A, _I, _G, _H, _GH, _KO, _I, _I, _G, _I, _I),  # IDLE
+    (_A, _W, _G, _H, _GH, _KO, _I, _W, _G, _W, _I),  # WALK
+    (_A, _J, _G, _H, _GH, _KO, _I, _I, _G, _J, _I),  # JUMP
+    (_A, _I, _G, _H, _GH, _KO, _I, _A, _G, _A, _I),  # ATTACK
+    (_A, _G, _G, _H, _GH, _KO, _I, _G, _G, _I, _I),  # GUARD
+    (_A, _H, _G, _H, _GH, _KO, _I, _H, _G, _H, _H),  # HIT
+    (_A, _GH, _G, _H, _GH, _KO, _I, _GH, _GH, _GH, _GH),  # GUARD_HIT
+    (_KO, _KO, _KO, _KO, _KO, _KO, _KO, _KO, _KO, _KO, _KO),  # KO
+)
+
+
+def encode_state(state: int) -> float:
+    """
+    관측 벡터용으로 상태 코드를 [0, 1] 범위로 정규화합니다.
+
+    Args:
+        state (int): PlayerState 값.
+
+    Returns:
+        float: state / (NUM_STATES - 1).
+    """
+    return state / (NUM_STATES - 1)
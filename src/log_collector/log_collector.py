@@ -6,6 +6,8 @@ import zlib  # For compression
 import gzip
 import logging
 
+from src.log_collector.replay import Replay
+
 logger = logging.getLogger(__name__)
 
 
@@ -67,11 +69,20 @@ class LogCollector:
             return
         
         replay_path = os.path.join(self.log_dir, f"replay_{self.current_session_id}_{replay_filename}")
-        # For demonstration, replay_data is just a string. In real scenario, it would be binary.
-        with open(replay_path, 'w') as f:
+        # replay_data is a Replay (see replay.py), already serialized bytes, or a plain string.
+        if isinstance(replay_data, Replay):
+            event_data = {"replay_path": replay_path, "frame_count": replay_data.frame_count,
+                          "seed": replay_data.seed, "engine_version": replay_data.engine_version}
+            replay_data = replay_data.to_bytes()
+        else:
+            event_data = {"replay_path": replay_path}
+        if isinstance(replay_data, str):
+            replay_data = replay_data.encode('utf-8')
+        with open(replay_path, 'wb') as f:
             f.write(replay_data)
         logger.info(f"Replay data saved for session {self.current_session_id} to {replay_path}")
-        self.log_event("REPLAY_SAVED", {"replay_path": replay_path})
+        self.log_event("REPLAY_SAVED", event_data)
+        return replay_path
 
 # Simple test for LogCollector
 def test_log_collector():
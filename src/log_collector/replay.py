@@ -0,0 +1,244 @@
+"""
+Input-only replays for the deterministic game engine.
+
+A replay stores the match setup (seed, character ids, engine version) and a
+single byte per frame holding both players' action ids. Because
+`Simulation(deterministic=True)` produces bit-identical states for identical
+inputs, the full match can be regenerated from that stream. Snapshots taken
+every `checkpoint_interval` frames are embedded so that `ReplaySimulator.seek`
+only has to re-simulate from the closest checkpoint instead of frame 0.
+
+File layout (little endian):
+    header      magic, format version, engine version, seed, p1/p2 character ids,
+                frame count, checkpoint interval, checkpoint count, final state hash
+    inputs      frame_count bytes, (p1_action | p2_action << 4)
+    checkpoints checkpoint_count * Simulation.STATE_SIZE bytes, checkpoint k is
+                the state after k * checkpoint_interval frames
+"""
+
+import struct
+from typing import List, Optional, Tuple, Union
+
+from src.constants import NUM_ACTIONS
+from src.game_engine.simulation import ENGINE_VERSION, Simulation
+
+REPLAY_MAGIC = b"ABRP"
+REPLAY_FORMAT_VERSION = 1
+DEFAULT_CHECKPOINT_INTERVAL = 600  # 10 seconds at 60 FPS
+
+_HEADER_STRUCT = struct.Struct(f"<4sHHQHHIII{Simulation.HASH_SIZE}s")
+_ACTION_MASK = 0x0F
+
+
+def pack_inputs(p1_action: int, p2_action: int) -> int:
+    """Packs both players' action ids into one byte."""
+    if not (0 <= p1_action < NUM_ACTIONS and 0 <= p2_action < NUM_ACTIONS):
+        raise ValueError(f"Invalid action ids: {p1_action}, {p2_action}")
+    return p1_action | (p2_action << 4)
+
+
+def unpack_inputs(packed: int) -> Tuple[int, int]:
+    """Inverse of `pack_inputs`."""
+    return packed & _ACTION_MASK, packed >> 4
+
+
+class Replay:
+    """
+    Match setup plus the packed per-frame input stream and embedded checkpoints.
+
+    Attributes:
+        seed (int): Seed used by whatever produced the inputs (AI policies, human error layer).
+        p1_character (int): Character id of player 1 (0: default character without a move table).
+        p2_character (int): Character id of player 2.
+        engine_version (int): `ENGINE_VERSION` the replay was recorded with.
+        checkpoint_interval (int): Frames between embedded checkpoints.
+        inputs (bytearray): One packed byte per frame.
+        checkpoints (List[bytes]): Serialized `Simulation` states, index k = frame k * interval.
+        final_hash (bytes): `state_hash` digest after the last frame.
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        p1_character: int = 0,
+        p2_character: int = 0,
+        checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL,
+        engine_version: int = ENGINE_VERSION,
+    ):
+        if checkpoint_interval <= 0:
+            raise ValueError("checkpoint_interval must be positive")
+        self.seed = seed
+        self.p1_character = p1_character
+        self.p2_character = p2_character
+        self.engine_version = engine_version
+        self.checkpoint_interval = checkpoint_interval
+        self.inputs = bytearray()
+        self.checkpoints: List[bytes] = []
+        self.final_hash = bytes(Simulation.HASH_SIZE)
+
+    @property
+    def frame_count(self) -> int:
+        return len(self.inputs)
+
+    @property
+    def characters(self) -> Tuple[Optional[int], Optional[int]]:
+        """Character ids in the form `Simulation(characters=...)` expects."""
+        return (self.p1_character or None, self.p2_character or None)
+
+    def actions_at(self, frame: int) -> Tuple[int, int]:
+        """Returns the (p1, p2) actions applied on the given 0-based frame."""
+        return unpack_inputs(self.inputs[frame])
+
+    def to_bytes(self) -> bytes:
+        header = _HEADER_STRUCT.pack(
+            REPLAY_MAGIC,
+            REPLAY_FORMAT_VERSION,
+            self.engine_version,
+            self.seed,
+            self.p1_character,
+            self.p2_character,
+            self.frame_count,
+            self.checkpoint_interval,
+            len(self.checkpoints),
+            self.final_hash,
+        )
+        return b"".join([header, bytes(self.inputs), *self.checkpoints])
+
+    @classmethod
+    def from_bytes(cls, data: Union[bytes, bytearray, memoryview]) -> "Replay":
+        data = memoryview(data)
+        if len(data) < _HEADER_STRUCT.size:
+            raise ValueError("Replay data is truncated")
+        (
+            magic,
+            format_version,
+            engine_version,
+            seed,
+            p1_character,
+            p2_character,
+            frame_count,
+            checkpoint_interval,
+            checkpoint_count,
+            final_hash,
+        ) = _HEADER_STRUCT.unpack_from(data)
+        if magic != REPLAY_MAGIC:
+            raise ValueError("Not a replay file")
+        if format_version != REPLAY_FORMAT_VERSION:
+            raise ValueError(f"Unsupported replay format version {format_version}")
+        expected = _HEADER_STRUCT.size + frame_count + checkpoint_count * Simulation.STATE_SIZE
+        if len(data) != expected:
+            raise ValueError(f"Replay data has {len(data)} bytes, expected {expected}")
+
+        replay = cls(seed, p1_character, p2_character, checkpoint_interval, engine_version)
+        offset = _HEADER_STRUCT.size
+        replay.inputs = bytearray(data[offset:offset + frame_count])
+        offset += frame_count
+        for _ in range(checkpoint_count):
+            replay.checkpoints.append(bytes(data[offset:offset + Simulation.STATE_SIZE]))
+            offset += Simulation.STATE_SIZE
+        replay.final_hash = final_hash
+        return replay
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> "Replay":
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+class ReplayRecorder:
+    """
+    Drives a deterministic `Simulation` and records every frame's inputs.
+
+    Use `step` instead of `Simulation.step`; checkpoints are taken from the
+    live simulation so recording costs one byte per frame plus one snapshot
+    per `checkpoint_interval` frames.
+    """
+
+    def __init__(self, simulation: Optional[Simulation] = None, **replay_kwargs):
+        self.replay = Replay(**replay_kwargs)
+        self.simulation = simulation if simulation is not None else Simulation(
+            deterministic=True, characters=self.replay.characters
+        )
+        if not self.simulation.deterministic:
+            raise ValueError("Replays require a deterministic Simulation")
+        if self.simulation.frame_count != 0:
+            raise ValueError("Recording must start from a freshly reset Simulation")
+        if self.simulation.characters != self.replay.characters:
+            raise ValueError("Simulation characters do not match the replay header")
+        self.replay.checkpoints.append(self.simulation.save_state())
+
+    def step(self, p1_action: int, p2_action: int) -> bool:
+        self.replay.inputs.append(pack_inputs(p1_action, p2_action))
+        round_over = self.simulation.step(p1_action, p2_action)
+        if self.replay.frame_count % self.replay.checkpoint_interval == 0:
+            self.replay.checkpoints.append(self.simulation.save_state())
+        return round_over
+
+    def finish(self) -> Replay:
+        """Stamps the final state hash and returns the recorded replay."""
+        self.replay.final_hash = bytes.fromhex(self.simulation.state_hash())
+        return self.replay
+
+
+class ReplaySimulator:
+    """
+    Re-simulates a `Replay` through the engine as fast as the CPU allows.
+
+    `seek(frame)` restores the closest embedded checkpoint at or before
+    `frame` and simulates forward from there, so any frame can be regenerated
+    on demand without replaying the whole match.
+    """
+
+    def __init__(self, replay: Replay):
+        if replay.engine_version != ENGINE_VERSION:
+            raise ValueError(
+                f"Replay was recorded with engine version {replay.engine_version}, "
+                f"this engine is version {ENGINE_VERSION}"
+            )
+        self.replay = replay
+        self.simulation = Simulation(deterministic=True, characters=replay.characters)
+
+    @property
+    def frame(self) -> int:
+        """Number of replay frames applied to `simulation`."""
+        return self.simulation.frame_count
+
+    def step(self) -> bool:
+        """Applies the next recorded frame. Returns False at the end of the replay."""
+        frame = self.simulation.frame_count
+        if frame >= self.replay.frame_count:
+            return False
+        p1_action, p2_action = self.replay.actions_at(frame)
+        self.simulation.step(p1_action, p2_action)
+        return True
+
+    def seek(self, frame: int) -> Simulation:
+        """Moves the simulation to the state after `frame` frames and returns it."""
+        if not 0 <= frame <= self.replay.frame_count:
+            raise IndexError(f"Frame {frame} is outside the replay (0..{self.replay.frame_count})")
+
+        checkpoints = self.replay.checkpoints
+        index = min(frame // self.replay.checkpoint_interval, len(checkpoints) - 1)
+        start = index * self.replay.checkpoint_interval if checkpoints else 0
+        # Already between the nearest checkpoint and the target: just continue forward
+        if not start <= self.simulation.frame_count <= frame:
+            if checkpoints:
+                self.simulation.load_state(checkpoints[index])
+            else:
+                self.simulation.reset()
+
+        while self.simulation.frame_count < frame:
+            self.step()
+        return self.simulation
+
+    def run_to_end(self) -> Simulation:
+        return self.seek(self.replay.frame_count)
+
+    def verify(self) -> bool:
+        """Re-simulates to the end and compares against the recorded final hash."""
+        self.run_to_end()
+        return bytes.fromhex(self.simulation.state_hash()) == self.replay.final_hash
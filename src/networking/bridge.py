@@ -0,0 +1,71 @@
+"""
+Thread-to-asyncio queue used between the training thread and the WebRTC
+event loop.
+"""
+
+import asyncio
+import queue
+import time
+from collections import deque
+from typing import Any, Optional, Tuple
+
+# Default capacity of the env <-> WebRTC queues. Producers block once this
+# many messages are waiting, so a stalled data channel slows the trainer down
+# instead of growing the queue without limit.
+DEFAULT_QUEUE_SIZE = 64
+
+
+class AsyncBridgeQueue(queue.Queue):
+    """
+    A `queue.Queue` whose puts wake an asyncio consumer immediately.
+
+    Producer threads use the normal blocking `put()` (bounded by `maxsize`).
+    Once `attach(loop)` has been called, every put schedules a wake-up on that
+    loop with `call_soon_threadsafe`, and the loop side awaits `get_async()`
+    instead of polling. Each item is stamped with its enqueue time
+    (`time.perf_counter()`), returned by `get_async()` so the consumer can
+    measure queueing latency.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_QUEUE_SIZE):
+        super().__init__(maxsize)
+        self._stamps: deque = deque()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ready: Optional[asyncio.Event] = None
+
+    def attach(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Bind the consumer loop. Must be called from the loop's thread."""
+        self._loop = loop
+        self._ready = asyncio.Event()
+        if self.qsize():
+            self._ready.set()
+
+    def _put(self, item: Any) -> None:
+        super()._put(item)
+        self._stamps.append(time.perf_counter())
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._ready.set)
+
+    def _get(self) -> Any:
+        self._stamps.popleft()
+        return super()._get()
+
+    def get_nowait_stamped(self) -> Tuple[Any, float]:
+        """Like `get_nowait()`, also returning the item's enqueue time."""
+        with self.not_empty:
+            if not self._qsize():
+                raise queue.Empty
+            stamp = self._stamps[0]
+            item = self._get()
+            self.not_full.notify()
+            return item, stamp
+
+    async def get_async(self) -> Tuple[Any, float]:
+        """Wait on the attached loop for the next (item, enqueue_time)."""
+        while True:
+            self._ready.clear()
+            try:
+                return self.get_nowait_stamped()
+            except queue.Empty:
+                await self._ready.wait()
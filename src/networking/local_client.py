@@ -0,0 +1,102 @@
+import logging
+import queue
+from typing import Optional, Tuple
+
+import numpy as np
+
+from src.constants import FPS
+from src.game_engine.batched import BatchedSimulation
+from src.game_engine.interfaces import OBSERVATION_SIZE, write_observation
+from src.game_engine.simulation import Simulation
+from src.networking import protocol
+
+logger = logging.getLogger(__name__)
+
+
+class LocalGameClient:
+    """
+    Runs the game engine in the caller's thread.
+
+    Unlike `MockGameClient` and `WebRTCClient` there are no queues or threads:
+    `step()` advances the real `Simulation` by one frame and writes the
+    observation straight into a preallocated float32 buffer.
+    """
+
+    def __init__(
+        self,
+        deterministic: bool = False,
+        characters: Tuple[Optional[int], Optional[int]] = (None, None),
+    ):
+        self.simulation = Simulation(deterministic=deterministic, characters=characters)
+        self._observation = np.zeros(OBSERVATION_SIZE, dtype=np.float32)
+
+    @property
+    def observation(self) -> np.ndarray:
+        """The observation buffer. Overwritten in place by every reset/step."""
+        return self._observation
+
+    def reset(self) -> np.ndarray:
+        self.simulation.reset()
+        return write_observation(self.simulation.player1, self.simulation.player2, self._observation)
+
+    def step(self, p1_action: int, p2_action: int) -> Tuple[np.ndarray, bool]:
+        round_over = self.simulation.step(p1_action, p2_action)
+        write_observation(self.simulation.player1, self.simulation.player2, self._observation)
+        return self._observation, round_over
+
+    def stop(self) -> None:
+        pass
+
+
+class LocalMultiplexedClient:
+    """
+    Game-client side of the multiplexed protocol, hosting K matches in one
+    `BatchedSimulation`.
+
+    It answers BATCH_RESET / BATCH_ACTION messages the way the browser client
+    does when it hosts several game instances behind one data channel, so
+    `MultiplexedVecEnv` can be run and tested without a browser.
+    """
+
+    def __init__(self, num_envs: int, dt: float = 1.0 / FPS):
+        self.simulation = BatchedSimulation(num_envs)
+        self.dt = dt
+        self._observations = np.zeros((num_envs, OBSERVATION_SIZE), dtype=np.float32)
+        self._no_round_over = np.zeros(num_envs, dtype=bool)
+
+    def handle(self, data: bytes) -> bytes:
+        """Apply one batch request and return the encoded BATCH_RESULT."""
+        message = protocol.decode_batch(data)
+        if message.count != self.simulation.num_matches:
+            raise protocol.ProtocolError(
+                f"Request for {message.count} envs, hosting {self.simulation.num_matches}"
+            )
+        if message.msg_type == protocol.MSG_BATCH_RESET:
+            self.simulation.reset(message.flags.astype(bool))
+            round_over = self._no_round_over
+        elif message.msg_type == protocol.MSG_BATCH_ACTION:
+            if message.repeat > 1:
+                round_over = self.simulation.step_repeat(
+                    message.actions[:, 0], message.actions[:, 1], message.repeat, self.dt
+                )
+            else:
+                round_over = self.simulation.step(message.actions[:, 0], message.actions[:, 1], self.dt)
+        else:
+            raise protocol.ProtocolError(f"Unexpected request type {message.msg_type}")
+        self.simulation.write_observations(self._observations)
+        return protocol.encode_batch_result(self._observations, round_over, message.seq)
+
+    def serve(self, action_queue: queue.Queue, result_queue: queue.Queue) -> None:
+        """
+        Answer requests from `action_queue` until a {"type": "close"} message
+        arrives. Meant as a thread target standing in for WebRTCClient.
+        """
+        result_queue.put({"type": "connection_ready"})
+        while True:
+            request = action_queue.get()
+            if not isinstance(request, bytes):
+                if request.get("type") == "close":
+                    break
+                logger.warning(f"Ignoring non-batch request: {request}")
+                continue
+            result_queue.put(self.handle(request))
@@ -4,8 +4,20 @@ import numpy as np
 import logging
 import threading # Import threading
 
+from src.game_engine.states import PlayerState, encode_state
+
 logger = logging.getLogger(__name__)
 
+# Action id -> state the acting player ends up in (same ids as the engine's apply_action)
+ACTION_STATES = {
+    0: PlayerState.IDLE,
+    1: PlayerState.WALK,
+    2: PlayerState.WALK,
+    3: PlayerState.JUMP,
+    4: PlayerState.ATTACK,
+    5: PlayerState.GUARD,
+}
+
 class MockGameClient:
     def __init__(self, action_queue: queue.Queue, result_queue: queue.Queue):
         self.action_queue = action_queue
@@ -26,6 +38,8 @@ class MockGameClient:
             "p2_health": 1.0,
             "p2_pos_x": 0.8,
             "p2_pos_y": 0.0,
+            "p1_state": int(PlayerState.IDLE),
+            "p2_state": int(PlayerState.IDLE),
             "round_over": False,
             "observation": [0.2, 0.0, 1.0, 0.0, 0.8, 0.0, 1.0, 0.0] # Example observation
         }
@@ -51,16 +65,26 @@ class MockGameClient:
         if p2_action == 2: # P2 MoveBwd
             self.current_game_state["p2_pos_x"] = max(0.0, self.current_game_state["p2_pos_x"] - 0.01)
 
+        # Player states share the engine's PlayerState encoding
+        for player, action, opponent_action in (("p1", p1_action, p2_action), ("p2", p2_action, p1_action)):
+            if self.current_game_state[f"{player}_health"] <= 0:
+                state = PlayerState.KO
+            elif opponent_action == 4:
+                state = PlayerState.HIT
+            else:
+                state = ACTION_STATES.get(action, PlayerState.IDLE)
+            self.current_game_state[f"{player}_state"] = int(state)
+
         # Update observation based on new state
         self.current_game_state["observation"] = [
             self.current_game_state["p1_pos_x"],
             self.current_game_state["p1_pos_y"],
             self.current_game_state["p1_health"],
-            0.0, # p1_state (dummy)
+            encode_state(self.current_game_state["p1_state"]),
             self.current_game_state["p2_pos_x"],
             self.current_game_state["p2_pos_y"],
             self.current_game_state["p2_health"],
-            0.0  # p2_state (dummy)
+            encode_state(self.current_game_state["p2_state"])
         ]
 
         # Check for round over condition
@@ -81,12 +105,13 @@ class MockGameClient:
                 msg_type = message.get("type")
                 if msg_type == "reset":
                     self.current_game_state = self._get_initial_state()
-                    self.result_queue.put({"type": "reset_result", "state": self.current_game_state})
+                    self.result_queue.put({"type": "reset_result", "state": dict(self.current_game_state), "seq": message.get("seq")})
                 elif msg_type == "action":
                     p1_action = message.get("p1Action", 0)
                     p2_action = message.get("p2Action", 0)
                     self._update_game_state(p1_action, p2_action)
-                    self.result_queue.put({"type": "action_result", "state": self.current_game_state})
+                    # Send a snapshot: pipelined steps keep mutating current_game_state
+                    self.result_queue.put({"type": "action_result", "state": dict(self.current_game_state), "seq": message.get("seq")})
                 elif msg_type == "close":
                     self._running = False
             except Exception as e:
@@ -0,0 +1,277 @@
+"""
+Binary framing for the FightingEnv <-> game client data channel.
+
+Every message is a fixed 12-byte little-endian header followed by a
+type-specific payload (see docs/protocal_WebRTC/binary_protocol_spec.md):
+
+    offset size field
+    0      1    version      (PROTOCOL_VERSION)
+    1      1    msg_type     (MSG_*)
+    2      2    env_id
+    4      4    seq
+    8      2    obs_len      (float32 count in the payload, 0 if none)
+    10     2    flags        (FLAG_*)
+
+ACTION payload: p1_action u8, p2_action u8.
+RESET_RESULT / ACTION_RESULT payload: obs_len float32 observation values.
+
+Batch messages carry K envs hosted by one client. Their payload starts with
+a 4-byte prefix (count u16, repeat u16), followed by:
+
+    BATCH_RESET   count u8 reset flags (1 = reset this env)
+    BATCH_ACTION  count (p1_action u8, p2_action u8) pairs, each applied for
+                  `repeat` frames (0 is read as 1; other types send 0)
+    BATCH_RESULT  count u8 flags, zero padding to a 4-byte boundary, then
+                  count * obs_len float32 observations (obs_len per env)
+
+Other message types have no payload.
+
+Results no longer repeat p1_health / p1_pos_x next to the observation; the
+dict form produced by `message_to_dict` fills those fields from the
+observation slots so existing consumers keep working.
+"""
+
+import struct
+from typing import Any, Dict, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+PROTOCOL_VERSION = 1
+
+MSG_CONNECTION_READY = 1
+MSG_RESET = 2
+MSG_ACTION = 3
+MSG_RESET_RESULT = 4
+MSG_ACTION_RESULT = 5
+MSG_CLOSE = 6
+MSG_BATCH_RESET = 7
+MSG_BATCH_ACTION = 8
+MSG_BATCH_RESULT = 9
+
+FLAG_ROUND_OVER = 1
+
+HEADER = struct.Struct("<BBHIHH")
+ACTION_PAYLOAD = struct.Struct("<BB")
+BATCH_PREFIX = struct.Struct("<HH")
+
+# Observation slots used to rebuild the legacy result fields
+OBS_P1_POS_X = 0
+OBS_P1_HEALTH = 2
+OBS_P2_POS_X = 4
+OBS_P2_HEALTH = 6
+
+_TYPE_NAMES = {
+    MSG_CONNECTION_READY: "connection_ready",
+    MSG_RESET: "reset",
+    MSG_ACTION: "action",
+    MSG_RESET_RESULT: "reset_result",
+    MSG_ACTION_RESULT: "action_result",
+    MSG_CLOSE: "close",
+    MSG_BATCH_RESET: "batch_reset",
+    MSG_BATCH_ACTION: "batch_action",
+    MSG_BATCH_RESULT: "batch_result",
+}
+_TYPE_CODES = {name: code for code, name in _TYPE_NAMES.items()}
+
+
+class ProtocolError(ValueError):
+    pass
+
+
+class Message(NamedTuple):
+    msg_type: int
+    seq: int
+    env_id: int
+    flags: int
+    p1_action: int = 0
+    p2_action: int = 0
+    observation: Optional[np.ndarray] = None
+
+    @property
+    def round_over(self) -> bool:
+        return bool(self.flags & FLAG_ROUND_OVER)
+
+
+def encode_control(msg_type: int, seq: int = 0, env_id: int = 0) -> bytes:
+    """CONNECTION_READY, RESET or CLOSE."""
+    return HEADER.pack(PROTOCOL_VERSION, msg_type, env_id, seq, 0, 0)
+
+
+def encode_action(p1_action: int, p2_action: int, seq: int = 0, env_id: int = 0) -> bytes:
+    return HEADER.pack(PROTOCOL_VERSION, MSG_ACTION, env_id, seq, 0, 0) + ACTION_PAYLOAD.pack(
+        p1_action, p2_action
+    )
+
+
+def encode_result(
+    msg_type: int,
+    observation: Sequence[float],
+    round_over: bool = False,
+    seq: int = 0,
+    env_id: int = 0,
+) -> bytes:
+    """RESET_RESULT or ACTION_RESULT."""
+    obs = np.asarray(observation, dtype="<f4")
+    flags = FLAG_ROUND_OVER if round_over else 0
+    return HEADER.pack(PROTOCOL_VERSION, msg_type, env_id, seq, obs.size, flags) + obs.tobytes()
+
+
+def decode(data: bytes) -> Message:
+    """
+    Decode one message. The observation is a read-only float32 view into
+    `data` (no copy).
+    """
+    if len(data) < HEADER.size:
+        raise ProtocolError(f"Message too short: {len(data)} bytes")
+    version, msg_type, env_id, seq, obs_len, flags = HEADER.unpack_from(data)
+    if version != PROTOCOL_VERSION:
+        raise ProtocolError(f"Unsupported protocol version {version}")
+    if msg_type not in _TYPE_NAMES:
+        raise ProtocolError(f"Unknown message type {msg_type}")
+
+    if msg_type == MSG_ACTION:
+        if len(data) < HEADER.size + ACTION_PAYLOAD.size:
+            raise ProtocolError("Truncated action payload")
+        p1_action, p2_action = ACTION_PAYLOAD.unpack_from(data, HEADER.size)
+        return Message(msg_type, seq, env_id, flags, p1_action, p2_action)
+
+    if msg_type in (MSG_RESET_RESULT, MSG_ACTION_RESULT):
+        if len(data) != HEADER.size + 4 * obs_len:
+            raise ProtocolError(f"Expected {obs_len} observation values, got {len(data) - HEADER.size} bytes")
+        obs = np.frombuffer(data, dtype="<f4", count=obs_len, offset=HEADER.size)
+        return Message(msg_type, seq, env_id, flags, observation=obs)
+
+    return Message(msg_type, seq, env_id, flags)
+
+
+class BatchMessage(NamedTuple):
+    """
+    A decoded batch message. Arrays are read-only views into the received
+    bytes: `actions` (K, 2) uint8 for BATCH_ACTION, `flags` (K,) uint8 for
+    BATCH_RESET / BATCH_RESULT, `observations` (K, obs_len) float32 for
+    BATCH_RESULT. `repeat` is the number of frames each action is held for.
+    """
+
+    msg_type: int
+    seq: int
+    count: int
+    actions: Optional[np.ndarray] = None
+    flags: Optional[np.ndarray] = None
+    observations: Optional[np.ndarray] = None
+    repeat: int = 1
+
+
+def is_batch(data: bytes) -> bool:
+    return len(data) >= 2 and data[1] in (MSG_BATCH_RESET, MSG_BATCH_ACTION, MSG_BATCH_RESULT)
+
+
+def _padded(count: int) -> int:
+    return (count + 3) & ~3
+
+
+def encode_batch_reset(reset_mask: np.ndarray, seq: int = 0) -> bytes:
+    mask = np.asarray(reset_mask, dtype=np.uint8)
+    return (
+        HEADER.pack(PROTOCOL_VERSION, MSG_BATCH_RESET, 0, seq, 0, 0)
+        + BATCH_PREFIX.pack(mask.size, 0)
+        + mask.tobytes()
+    )
+
+
+def encode_batch_action(actions: np.ndarray, seq: int = 0, repeat: int = 1) -> bytes:
+    """actions: (K, 2) action ids for [P1, P2] of each env, held for `repeat` frames."""
+    pairs = np.asarray(actions, dtype=np.uint8).reshape(-1, 2)
+    return (
+        HEADER.pack(PROTOCOL_VERSION, MSG_BATCH_ACTION, 0, seq, 0, 0)
+        + BATCH_PREFIX.pack(len(pairs), repeat)
+        + pairs.tobytes()
+    )
+
+
+def encode_batch_result(observations: np.ndarray, round_over: np.ndarray, seq: int = 0) -> bytes:
+    """observations: (K, obs_len); round_over: (K,) bools."""
+    obs = np.asarray(observations, dtype="<f4")
+    count, obs_len = obs.shape
+    flags = np.zeros(_padded(count), dtype=np.uint8)
+    flags[:count] = np.where(np.asarray(round_over, dtype=bool), FLAG_ROUND_OVER, 0)
+    return (
+        HEADER.pack(PROTOCOL_VERSION, MSG_BATCH_RESULT, 0, seq, obs_len, 0)
+        + BATCH_PREFIX.pack(count, 0)
+        + flags.tobytes()
+        + obs.tobytes()
+    )
+
+
+def decode_batch(data: bytes) -> BatchMessage:
+    """Decode a BATCH_* message without copying its arrays."""
+    if len(data) < HEADER.size + BATCH_PREFIX.size:
+        raise ProtocolError(f"Batch message too short: {len(data)} bytes")
+    version, msg_type, _, seq, obs_len, _ = HEADER.unpack_from(data)
+    if version != PROTOCOL_VERSION:
+        raise ProtocolError(f"Unsupported protocol version {version}")
+    count, repeat = BATCH_PREFIX.unpack_from(data, HEADER.size)
+    offset = HEADER.size + BATCH_PREFIX.size
+
+    if msg_type == MSG_BATCH_ACTION:
+        expected = offset + 2 * count
+    elif msg_type == MSG_BATCH_RESET:
+        expected = offset + count
+    elif msg_type == MSG_BATCH_RESULT:
+        expected = offset + _padded(count) + 4 * count * obs_len
+    else:
+        raise ProtocolError(f"Not a batch message type: {msg_type}")
+    if len(data) != expected:
+        raise ProtocolError(f"Expected {expected} bytes for {count} envs, got {len(data)}")
+
+    if msg_type == MSG_BATCH_ACTION:
+        actions = np.frombuffer(data, dtype=np.uint8, count=2 * count, offset=offset).reshape(count, 2)
+        return BatchMessage(msg_type, seq, count, actions=actions, repeat=max(repeat, 1))
+    flags = np.frombuffer(data, dtype=np.uint8, count=count, offset=offset)
+    if msg_type == MSG_BATCH_RESET:
+        return BatchMessage(msg_type, seq, count, flags=flags)
+    observations = np.frombuffer(
+        data, dtype="<f4", count=count * obs_len, offset=offset + _padded(count)
+    ).reshape(count, obs_len)
+    return BatchMessage(msg_type, seq, count, flags=flags, observations=observations)
+
+
+def encode_message(message: Dict[str, Any], seq: int = 0, env_id: int = 0) -> bytes:
+    """
+    Encode the dict messages FightingEnv puts on its action queue
+    ({"type": "action", "p1Action": .., "p2Action": ..}, {"type": "reset"}, ...).
+    "seq" / "env_id" keys in the dict take precedence over the arguments.
+    """
+    seq = message.get("seq", seq)
+    env_id = message.get("env_id", env_id)
+    msg_type = _TYPE_CODES.get(message.get("type"))
+    if msg_type is None:
+        raise ProtocolError(f"Cannot encode message type {message.get('type')!r}")
+    if msg_type == MSG_ACTION:
+        return encode_action(int(message["p1Action"]), int(message["p2Action"]), seq, env_id)
+    if msg_type in (MSG_RESET_RESULT, MSG_ACTION_RESULT):
+        state = message["state"]
+        return encode_result(msg_type, state["observation"], state["round_over"], seq, env_id)
+    return encode_control(msg_type, seq, env_id)
+
+
+def message_to_dict(message: Message) -> Dict[str, Any]:
+    """Convert a decoded message to the dict form used by FightingEnv's result queue."""
+    result: Dict[str, Any] = {
+        "type": _TYPE_NAMES[message.msg_type],
+        "seq": message.seq,
+        "env_id": message.env_id,
+    }
+    if message.msg_type == MSG_ACTION:
+        result["p1Action"] = message.p1_action
+        result["p2Action"] = message.p2_action
+    elif message.observation is not None:
+        obs = message.observation
+        result["state"] = {
+            "observation": obs,
+            "p1_health": float(obs[OBS_P1_HEALTH]),
+            "p2_health": float(obs[OBS_P2_HEALTH]),
+            "p1_pos_x": float(obs[OBS_P1_POS_X]),
+            "p2_pos_x": float(obs[OBS_P2_POS_X]),
+            "round_over": message.round_over,
+        }
+    return result
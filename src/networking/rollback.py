@@ -0,0 +1,228 @@
+"""
+Rollback netcode session layer for peer-to-peer matches.
+
+Each peer runs its own deterministic `Simulation` and only exchanges inputs.
+Local inputs are scheduled `input_delay` frames ahead and sent every frame
+together with all inputs the peer has not acknowledged yet, so a lost packet
+is repaired by the next one. Remote inputs that have not arrived are predicted
+by repeating the last confirmed one; when the real input turns out to differ,
+the session restores the snapshot taken before that frame and re-simulates up
+to the present. A peer stalls instead of advancing when it would need to roll
+back further than `max_rollback` frames.
+
+The session is transport agnostic: `outgoing_packet()` returns bytes to send
+over the WebRTC data channel (or the `/ws/{peer_id}` relay) and
+`receive_packet()` consumes the peer's bytes.
+"""
+
+import hashlib
+import logging
+import struct
+from typing import Optional, Tuple
+
+from src.constants import ACTION_IDLE, NUM_ACTIONS
+from src.game_engine.simulation import Simulation
+
+logger = logging.getLogger(__name__)
+
+# ack (remote inputs received so far), start frame, input count
+_PACKET_HEADER = struct.Struct("<IIB")
+MAX_INPUTS_PER_PACKET = 255
+CHECKSUM_SIZE = 8
+
+
+class RollbackStats:
+    """Counters used to judge rollback frequency and re-simulation cost."""
+
+    def __init__(self):
+        self.frames = 0
+        self.stalls = 0
+        self.rollbacks = 0
+        self.resimulated_frames = 0
+        self.max_rollback_depth = 0
+        self.packets_received = 0
+        self.inputs_received = 0
+
+    @property
+    def rollback_rate(self) -> float:
+        """Fraction of advanced frames that triggered a rollback."""
+        return self.rollbacks / self.frames if self.frames else 0.0
+
+    @property
+    def simulated_frames_per_frame(self) -> float:
+        """Engine steps per advanced frame (1.0 means no re-simulation at all)."""
+        return (self.frames + self.resimulated_frames) / self.frames if self.frames else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "frames": self.frames,
+            "stalls": self.stalls,
+            "rollbacks": self.rollbacks,
+            "resimulated_frames": self.resimulated_frames,
+            "max_rollback_depth": self.max_rollback_depth,
+            "rollback_rate": self.rollback_rate,
+            "simulated_frames_per_frame": self.simulated_frames_per_frame,
+            "packets_received": self.packets_received,
+            "inputs_received": self.inputs_received,
+        }
+
+
+class RollbackSession:
+    """
+    One peer's side of a rollback match.
+
+    Typical frame loop::
+
+        session.add_local_input(action)
+        for packet in received_packets:
+            session.receive_packet(packet)
+        session.advance_frame()
+        send(session.outgoing_packet())
+
+    Args:
+        local_player (int): 1 or 2, which side of the `Simulation` this peer controls.
+        input_delay (int): Frames between reading a local input and applying it.
+        max_rollback (int): Maximum number of frames that may be re-simulated.
+        simulation (Optional[Simulation]): Fresh deterministic simulation to drive.
+    """
+
+    def __init__(
+        self,
+        local_player: int,
+        input_delay: int = 2,
+        max_rollback: int = 8,
+        simulation: Optional[Simulation] = None,
+    ):
+        if local_player not in (1, 2):
+            raise ValueError("local_player must be 1 or 2")
+        if input_delay < 0 or max_rollback < 1:
+            raise ValueError("input_delay must be >= 0 and max_rollback >= 1")
+        self.simulation = simulation if simulation is not None else Simulation(deterministic=True)
+        if not self.simulation.deterministic:
+            raise ValueError("Rollback requires a deterministic Simulation")
+
+        self.local_player = local_player
+        self.input_delay = input_delay
+        self.max_rollback = max_rollback
+        self.stats = RollbackStats()
+
+        # Index = frame number. Frames inside the initial input delay are idle.
+        self.local_inputs = bytearray([ACTION_IDLE] * input_delay)
+        self.remote_inputs = bytearray()
+        self.remote_ack = 0  # How many of our inputs the peer has confirmed
+
+        window = max_rollback + 1
+        self._snapshots = [bytearray(Simulation.STATE_SIZE) for _ in range(window)]
+        self._used_remote = bytearray(window)
+        self._rollback_frame: Optional[int] = None
+        self.confirmed_checksum: Tuple[int, bytes] = (0, self._checksum(self.simulation.save_state()))
+
+    @property
+    def frame(self) -> int:
+        """Number of frames simulated so far (the next frame to run)."""
+        return self.simulation.frame_count
+
+    @property
+    def confirmed_frame(self) -> int:
+        """Number of leading frames whose inputs are known for both players."""
+        return min(len(self.local_inputs), len(self.remote_inputs))
+
+    def add_local_input(self, action: int) -> bool:
+        """
+        Schedules a local input for frame `frame + input_delay`.
+
+        Returns:
+            bool: False if that frame already has an input (e.g. while stalled).
+        """
+        if not 0 <= action < NUM_ACTIONS:
+            raise ValueError(f"Invalid action id: {action}")
+        if len(self.local_inputs) > self.frame + self.input_delay:
+            return False
+        self.local_inputs.append(action)
+        return True
+
+    def outgoing_packet(self) -> bytes:
+        """Packs every local input the peer has not acknowledged yet."""
+        start = self.remote_ack
+        count = min(len(self.local_inputs) - start, MAX_INPUTS_PER_PACKET)
+        header = _PACKET_HEADER.pack(len(self.remote_inputs), start, count)
+        return header + bytes(self.local_inputs[start:start + count])
+
+    def receive_packet(self, packet: bytes) -> None:
+        """Consumes a peer packet, confirming remote inputs and detecting mispredictions."""
+        ack, start, count = _PACKET_HEADER.unpack_from(packet)
+        self.stats.packets_received += 1
+        self.remote_ack = max(self.remote_ack, ack)
+
+        known = len(self.remote_inputs)
+        if start > known:
+            # Inputs are sent from the last acknowledged frame, so a gap means a stale ack; wait for resend.
+            return
+        inputs = packet[_PACKET_HEADER.size + known - start:_PACKET_HEADER.size + count]
+        for action in inputs:
+            frame = len(self.remote_inputs)
+            self.remote_inputs.append(action)
+            self.stats.inputs_received += 1
+            if frame < self.frame and self._used_remote[frame % len(self._used_remote)] != action:
+                if self._rollback_frame is None or frame < self._rollback_frame:
+                    self._rollback_frame = frame
+
+    def advance_frame(self) -> bool:
+        """
+        Applies any pending rollback and simulates one more frame.
+
+        Returns:
+            bool: False if the session stalled because the local input is missing
+                or the peer is more than `max_rollback` frames behind.
+        """
+        self._apply_rollback()
+        frame = self.frame
+        if frame >= len(self.local_inputs) or frame - len(self.remote_inputs) >= self.max_rollback:
+            self.stats.stalls += 1
+            return False
+        self._simulate_frame(frame)
+        self.stats.frames += 1
+        self._update_confirmed_checksum()
+        return True
+
+    def _update_confirmed_checksum(self) -> None:
+        # The snapshot taken before frame n is final once every input before n is confirmed
+        frame = min(self.confirmed_frame, self.frame - 1)
+        if frame > self.confirmed_checksum[0]:
+            snapshot = self._snapshots[frame % len(self._snapshots)]
+            self.confirmed_checksum = (frame, self._checksum(snapshot))
+
+    def _apply_rollback(self) -> None:
+        if self._rollback_frame is None:
+            return
+        rollback_frame, self._rollback_frame = self._rollback_frame, None
+        target = self.frame
+        depth = target - rollback_frame
+        self.simulation.load_state(self._snapshots[rollback_frame % len(self._snapshots)])
+        for frame in range(rollback_frame, target):
+            self._simulate_frame(frame)
+        self.stats.rollbacks += 1
+        self.stats.resimulated_frames += depth
+        self.stats.max_rollback_depth = max(self.stats.max_rollback_depth, depth)
+        logger.debug(f"Rolled back {depth} frames to frame {rollback_frame}")
+
+    def _simulate_frame(self, frame: int) -> None:
+        snapshot = self._snapshots[frame % len(self._snapshots)]
+        self.simulation.save_state(snapshot)
+
+        if frame < len(self.remote_inputs):
+            remote_action = self.remote_inputs[frame]
+        else:
+            # Predict that the peer keeps doing what it did last
+            remote_action = self.remote_inputs[-1] if self.remote_inputs else ACTION_IDLE
+        self._used_remote[frame % len(self._used_remote)] = remote_action
+
+        local_action = self.local_inputs[frame]
+        if self.local_player == 1:
+            self.simulation.step(local_action, remote_action)
+        else:
+            self.simulation.step(remote_action, local_action)
+
+    @staticmethod
+    def _checksum(state: bytes) -> bytes:
+        return hashlib.blake2b(state, digest_size=CHECKSUM_SIZE).digest()
@@ -5,15 +5,21 @@ SDP and ICE candidates with a browser client.
 """
 
 import asyncio
+import concurrent.futures
 import functools
 import json
 import logging
 import queue
+import time
 
 import aiohttp
 import numpy as np
 from aiortc import RTCDataChannel, RTCPeerConnection, RTCSessionDescription
 
+from src.networking import protocol
+from src.networking.bridge import AsyncBridgeQueue
+from src.utils.histogram import StageTimings
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -26,10 +32,34 @@ class WebRTCClient:
         action_queue: queue.Queue,
         result_queue: queue.Queue,
         test_mode: bool = False,
+        binary: bool = False,
+        timings: StageTimings | None = None,
     ):
+        """
+        Args:
+            binary: Send actions using the binary framing in `src.networking.protocol`
+                instead of JSON. Incoming binary messages are always accepted.
+            timings: Where to record the transport stages of a step: "send"
+                (enqueue to data channel send), "remote" (send to reply, i.e.
+                network round trip plus the browser frame) and "decode".
+                Decoded results also get a "received_at" perf_counter stamp.
+
+        `action_queue` should be an `AsyncBridgeQueue` so that puts wake the
+        sender right away; a plain `queue.Queue` falls back to polling.
+        `send_latency` is the "send" histogram.
+        """
         self.test_mode = test_mode
+        self.binary = binary
+        self._seq = 0
         self.action_queue = action_queue
         self.result_queue = result_queue
+        self.timings = timings if timings is not None else StageTimings()
+        self.send_latency = self.timings["send"]
+        self._remote_latency = self.timings["remote"]
+        self._decode_latency = self.timings["decode"]
+        self._sent_at = {}  # seq -> perf_counter() of the send
+        self.dropped_results = 0
+        self._sender_task = None
         self.loop = None
         self.pc = RTCPeerConnection()
         self.data_channel: RTCDataChannel | None = None
@@ -86,6 +116,8 @@ class WebRTCClient:
 
         self.loop = asyncio.new_event_loop()
         asyncio.set_event_loop(self.loop)
+        if isinstance(self.action_queue, AsyncBridgeQueue):
+            self.action_queue.attach(self.loop)
 
         try:
             self.loop.create_task(self.connect())
@@ -156,44 +188,121 @@ class WebRTCClient:
         @self.data_channel.on("message")
         def on_message(message):
             try:
-                data = json.loads(message)
-                logger.info(f"Received message from frontend: {data}")
-                self.result_queue.put(data)
+                received_at = time.perf_counter()
+                if isinstance(message, bytes):
+                    seq = protocol.HEADER.unpack_from(message)[3]
+                    data = protocol.message_to_dict(protocol.decode(message))
+                else:
+                    data = json.loads(message)
+                    seq = data.get("seq")
+                    logger.info(f"Received message from frontend: {data}")
+                if isinstance(data, dict):
+                    data["received_at"] = time.perf_counter()
+                    self._decode_latency.record(data["received_at"] - received_at)
+                sent_at = self._sent_at.pop(seq, None)
+                if sent_at is not None:
+                    self._remote_latency.record(received_at - sent_at)
+                # Never block the event loop on a full result queue
+                self.result_queue.put_nowait(data)
+            except queue.Full:
+                self.dropped_results += 1
+                logger.warning(f"Result queue full, dropped message ({self.dropped_results} so far).")
             except Exception as e:
                 logger.warning(f"Failed to process message: {e}")
 
+        @self.data_channel.on("close")
+        def on_close():
+            logger.info("Data channel closed.")
+            self._on_channel_close()
+
         @self.data_channel.on("open")
         def on_open():
             logger.info("Data channel 'on(open)' event fired.")
             # The action sender is now started from here OR from the readyState check below
-            if self.loop and not self.loop.is_closed():
-                self.loop.create_task(self._action_sender())
+            self._start_sender()
 
         # Check the state immediately in case the 'open' event was missed (race condition)
         if self.data_channel.readyState == "open":
             logger.info(
                 "Data channel already open. Starting action sender immediately."
             )
-            if self.loop and not self.loop.is_closed():
-                self.loop.create_task(self._action_sender())
+            self._start_sender()
+
+    def _start_sender(self):
+        if self._sender_task is None and self.loop and not self.loop.is_closed():
+            self._sender_task = self.loop.create_task(self._action_sender())
+
+    def _on_channel_close(self):
+        # The sender may be parked in get_async() and would not notice until the next put
+        if self.loop and not self.loop.is_closed():
+            self.loop.create_task(self._stop_sender())
+
+    async def _stop_sender(self):
+        task, self._sender_task = self._sender_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _shutdown(self):
+        await self._stop_sender()
+        self.loop.stop()
 
     async def _action_sender(self):
+        bridged = isinstance(self.action_queue, AsyncBridgeQueue)
         while self.data_channel and self.data_channel.readyState == "open":
             try:
-                action = self.action_queue.get_nowait()  # Non-blocking get
+                if bridged:
+                    action, enqueued_at = await self.action_queue.get_async()
+                else:
+                    try:
+                        action = self.action_queue.get_nowait()
+                    except queue.Empty:
+                        await asyncio.sleep(0.01)
+                        continue
+                    enqueued_at = None
 
                 if action.get("type") == "close":
                     break
-                logger.info(f"Sending action to frontend: {action}")
-                self.data_channel.send(json.dumps(action))
-            except queue.Empty:
-                # If the queue is empty, don't just spin. Wait a little.
-                await asyncio.sleep(0.01)
-                continue
+                if self.binary:
+                    self._seq += 1
+                    seq = action.get("seq", self._seq)
+                    self.data_channel.send(protocol.encode_message(action, seq=seq))
+                else:
+                    seq = action.get("seq")
+                    logger.info(f"Sending action to frontend: {action}")
+                    self.data_channel.send(json.dumps(action))
+                sent_at = time.perf_counter()
+                if enqueued_at is not None:
+                    self.send_latency.record(sent_at - enqueued_at)
+                if seq is not None:
+                    if len(self._sent_at) > 4096:  # Replies that never came
+                        self._sent_at.clear()
+                    self._sent_at[seq] = sent_at
             except Exception as e:
                 logger.error(f"Error in action sender: {e}")
                 break
 
-    def close(self):
-        if self.loop and self.loop.is_running():
-            self.loop.stop()
+    def close(self, timeout: float = 5.0):
+        """
+        Cancel the action sender and stop the event loop. Safe to call from any
+        thread; from another thread it waits up to `timeout` seconds for the
+        sender to finish.
+        """
+        if not (self.loop and self.loop.is_running()):
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            self.loop.create_task(self._shutdown())
+            return
+        future = asyncio.run_coroutine_threadsafe(self._stop_sender(), self.loop)
+        try:
+            future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            logger.warning(f"WebRTC action sender did not stop within {timeout}s.")
+        self.loop.call_soon_threadsafe(self.loop.stop)
@@ -7,8 +7,9 @@ from src.metric_extractor.metric_extractor import MetricExtractor
 import os
 
 class MockMultiPersonaAnalyzer:
-    def __init__(self, db_manager: DBManager):
+    def __init__(self, db_manager: DBManager, log_dir: str = None):
         self.db_manager = db_manager
+        self.log_dir = log_dir or os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'logs', 'simulation_logs'))
         self.metric_extractor = MetricExtractor(db_manager)
         print("MockMultiPersonaAnalyzer initialized.")
 
@@ -34,11 +35,10 @@ class MockMultiPersonaAnalyzer:
                     # In a real scenario, the mock_simulation_arena would be adapted
                     # to take persona models as input and run a match.
                     # For now, we just run the generic mock arena and extract metrics.
-                    run_mock_simulation(num_frames=random.randint(20, 50)) # Run for a random duration
+                    run_mock_simulation(num_frames=random.randint(20, 50), log_dir=self.log_dir) # Run for a random duration
                     
                     # After simulation, extract metrics from the latest log file
-                    log_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'logs', 'simulation_logs'))
-                    log_files = [os.path.join(log_dir, f) for f in os.listdir(log_dir) if f.endswith('.jsonl.gz')]
+                    log_files = [os.path.join(self.log_dir, f) for f in os.listdir(self.log_dir) if f.endswith('.jsonl.gz')]
                     if log_files:
                         latest_log_file = max(log_files, key=os.path.getctime)
                         self.metric_extractor.extract_metrics_from_log(latest_log_file)
@@ -1,12 +1,28 @@
 import collections
+import math
 
 import numpy as np
-from scipy.stats import entropy
+
+from src.constants import ACTION_ATTACK, ACTION_GUARD, NUM_ACTIONS
+
+
+# 엔트로피 합을 정수 고정소수점으로 누적할 때의 배율 (2^-40 단위)
+_ENTROPY_SCALE = 1 << 40
+
+
+def _fixed_xlog2x_table(window_size: int) -> list:
+    """c = 0 .. window_size에 대한 round(c * log2(c) * _ENTROPY_SCALE) 정수 표."""
+    return [round(c * math.log2(c) * _ENTROPY_SCALE) if c > 1 else 0 for c in range(window_size + 1)]
 
 
 class RhythmAnalyzer:
     """
     플레이어의 행동 로그를 기반으로 '전투 리듬' 관련 지표를 실시간으로 계산한다.
+
+    행동별 개수, 공격/방어 개수, 엔트로피 계산용 합(sum c*log2(c))을 행동이
+    윈도우에 들어오고 나갈 때마다 갱신하므로, 지표 계산은 윈도우 크기와 무관하게
+    O(1)이다. 엔트로피 합은 개수별 정수 표의 값을 더하고 빼는 정수이므로, 같은
+    개수를 더했다 빼면 정확히 상쇄되어 오래 실행해도 오차가 쌓이지 않는다.
     """
 
     def __init__(self, window_size: int, fps: int):
@@ -28,64 +44,76 @@ class RhythmAnalyzer:
         self.offensive_actions = {"light_punch", "heavy_kick"}
         self.defensive_actions = {"guard"}
 
+        # 윈도우 내 누적 통계
+        self.action_counts: collections.Counter = collections.Counter()
+        self._offense_count = 0
+        self._defense_count = 0
+        self._xlog2x = _fixed_xlog2x_table(window_size)
+        self._count_entropy_sum = 0  # sum(_xlog2x[c]) over action_counts
+        self._features = np.zeros(4)
+
+    def _update_counts(self, action: str, delta: int):
+        count = self.action_counts[action]
+        self._count_entropy_sum += self._xlog2x[count + delta] - self._xlog2x[count]
+        if count + delta:
+            self.action_counts[action] = count + delta
+        else:
+            del self.action_counts[action]
+        if action in self.offensive_actions:
+            self._offense_count += delta
+        elif action in self.defensive_actions:
+            self._defense_count += delta
+
     def add_action(self, action: str, frame: int):
         """
-        새로운 행동 로그를 추가한다.
+        새로운 행동 로그를 추가한다. 윈도우가 가득 차 있으면 가장 오래된 행동을
+        통계에서 제외한다.
         :param action: 'PUNCH', 'GUARD' 등 행동을 나타내는 문자열.
         :param frame: 해당 행동이 발생한 게임 프레임 번호.
         """
+        if len(self.action_log) == self.action_log.maxlen:
+            self._update_counts(self.action_log[0]["action"], -1)
         self.action_log.append({"action": action, "frame": frame})
+        self._update_counts(action, 1)
 
-    def get_metrics(self) -> dict[str, float]:
-        """
-        현재까지 수집된 action_log를 바탕으로 모든 리듬 지표를 계산하여 딕셔너리 형태로 반환한다.
-        """
-        if not self.action_log:
-            return {
-                "apm": 0.0,
-                "action_density": 0.0,
-                "offense_defense_ratio": 0.0,
-                "rhythm_entropy": 0.0,
-            }
-
+    def _compute(self) -> np.ndarray:
+        """누적 통계로부터 [apm, action_density, offense_defense_ratio, rhythm_entropy]를 채운다."""
+        features = self._features
         total_actions = len(self.action_log)
-        first_frame = self.action_log[0]["frame"]
-        last_frame = self.action_log[-1]["frame"]
-        duration_frames = last_frame - first_frame
+        if not total_actions:
+            features[:] = 0.0
+            return features
+
+        duration_frames = self.action_log[-1]["frame"] - self.action_log[0]["frame"]
         duration_seconds = (
             duration_frames / self.fps
             if duration_frames > 0
             else total_actions / self.fps
         )
 
-        # 1. APM (Actions Per Minute)
-        apm = (total_actions / duration_seconds) * 60 if duration_seconds > 0 else 0.0
-
-        # 2. 행동 밀도 (Action Density)
-        action_density = (
-            total_actions / duration_seconds if duration_seconds > 0 else 0.0
-        )
+        # 1. 행동 밀도 (Action Density), 2. APM (Actions Per Minute)
+        action_density = total_actions / duration_seconds if duration_seconds > 0 else 0.0
+        features[0] = action_density * 60
+        features[1] = action_density
 
         # 3. 공격/방어 비율 (Offense/Defense Ratio)
-        offense_count = sum(
-            1 for log in self.action_log if log["action"] in self.offensive_actions
-        )
-        defense_count = sum(
-            1 for log in self.action_log if log["action"] in self.defensive_actions
-        )
-
-        if defense_count > 0:
-            offense_defense_ratio = offense_count / defense_count
-        elif offense_count > 0:
-            offense_defense_ratio = offense_count
+        if self._defense_count > 0:
+            features[2] = self._offense_count / self._defense_count
         else:
-            offense_defense_ratio = 0.0
+            features[2] = self._offense_count
 
-        # 4. 리듬 엔트로피 (Rhythm Entropy)
-        action_sequence = [log["action"] for log in self.action_log]
-        _, counts = np.unique(action_sequence, return_counts=True)
-        rhythm_entropy = entropy(counts, base=2)
+        # 4. 리듬 엔트로피 (Rhythm Entropy): H = (n * log2(n) - sum(c * log2(c))) / n
+        # 같은 정수 표를 쓰므로 행동이 한 종류뿐이면 정확히 0이고, 그 밖에는 항상 양수다.
+        features[3] = (
+            (self._xlog2x[total_actions] - self._count_entropy_sum) / (total_actions * _ENTROPY_SCALE)
+        )
+        return features
 
+    def get_metrics(self) -> dict[str, float]:
+        """
+        현재까지 수집된 action_log를 바탕으로 모든 리듬 지표를 계산하여 딕셔너리 형태로 반환한다.
+        """
+        apm, action_density, offense_defense_ratio, rhythm_entropy = self._compute().tolist()
         return {
             "apm": apm,
             "action_density": action_density,
@@ -96,13 +124,135 @@ class RhythmAnalyzer:
     def get_feature_vector(self) -> np.ndarray:
         """
         AI 강화학습 모델의 입력으로 사용될 고정된 순서의 특징 벡터(1D Numpy 배열)를 반환한다.
+        매 호출마다 같은 배열을 갱신해 반환하므로, 값을 보관하려면 복사해야 한다.
         """
-        metrics = self.get_metrics()
-        return np.array(
-            [
-                metrics["apm"],
-                metrics["action_density"],
-                metrics["offense_defense_ratio"],
-                metrics["rhythm_entropy"],
-            ]
-        )
+        return self._compute()
+
+
+class BatchedRhythmAnalyzer:
+    """
+    여러 플레이어의 리듬 지표를 한 번에 계산하는 배열 기반 RhythmAnalyzer.
+
+    플레이어별 행동 id와 프레임을 (players, window) 모양의 링 버퍼에 저장하고,
+    행동별 개수 (players, num_actions)를 증분 갱신한다. `get_feature_vectors`는
+    모든 플레이어의 [apm, action_density, offense_defense_ratio, rhythm_entropy]를
+    벡터 연산 한 번으로 계산하며, 각 행은 같은 행동 열을 받은
+    `RhythmAnalyzer.get_feature_vector`와 같다.
+
+    배치 매치의 (N, 2) 행동 배열은 그대로 넘기면 되고 (players = N * 2),
+    결과는 `reshape(N, 8)`로 매치별 관측값 옆에 붙이거나, `out`으로 관측값 배열의
+    (N, 2, 4) 뷰에 바로 쓸 수 있다.
+
+    Attributes:
+        actions, frames (np.ndarray): (players, window) 링 버퍼.
+        lengths (np.ndarray): 플레이어별 윈도우에 든 행동 수 (players,).
+        action_counts (np.ndarray): 윈도우 내 행동 id별 개수 (players, num_actions).
+    """
+
+    def __init__(
+        self,
+        num_players: int,
+        window_size: int,
+        fps: int,
+        num_actions: int = NUM_ACTIONS,
+        offensive_actions=(ACTION_ATTACK,),
+        defensive_actions=(ACTION_GUARD,),
+    ):
+        """
+        :param num_players: 분석할 플레이어 수.
+        :param window_size: 플레이어별 최대 행동 로그 크기 (행동의 개수).
+        :param fps: 게임의 초당 프레임 수.
+        :param num_actions: 행동 id의 개수 (0 .. num_actions - 1).
+        :param offensive_actions: 공격 행동 id 목록.
+        :param defensive_actions: 방어 행동 id 목록.
+        """
+        if not isinstance(num_players, int) or num_players <= 0:
+            raise ValueError("num_players must be a positive integer.")
+        if not isinstance(window_size, int) or window_size <= 0:
+            raise ValueError("window_size must be a positive integer.")
+        if not isinstance(fps, int) or fps <= 0:
+            raise ValueError("fps must be a positive integer.")
+
+        self.num_players = num_players
+        self.window_size = window_size
+        self.fps = fps
+
+        self.actions = np.zeros((num_players, window_size), dtype=np.int64)
+        self.frames = np.zeros((num_players, window_size), dtype=np.int64)
+        self.lengths = np.zeros(num_players, dtype=np.int64)
+        self.action_counts = np.zeros((num_players, num_actions), dtype=np.int64)
+        self._head = np.zeros(num_players, dtype=np.int64)  # 다음에 쓸 위치
+        self._rows = np.arange(num_players)
+
+        self._offensive = np.zeros(num_actions, dtype=np.int64)
+        self._offensive[list(offensive_actions)] = 1
+        self._defensive = np.zeros(num_actions, dtype=np.int64)
+        self._defensive[list(defensive_actions)] = 1
+        # c * log2(c) 표 (c = 0 .. window_size)
+        counts = np.arange(window_size + 1, dtype=np.float64)
+        self._xlog2x = counts * np.log2(np.maximum(counts, 1.0))
+
+    def reset(self, mask=None):
+        """mask로 선택한 플레이어(None이면 전부)의 로그를 비운다."""
+        index = slice(None) if mask is None else np.asarray(mask, dtype=bool).reshape(-1)
+        self.lengths[index] = 0
+        self._head[index] = 0
+        self.action_counts[index] = 0
+
+    def add_actions(self, actions, frames, mask=None):
+        """
+        플레이어마다 행동 하나씩을 추가한다. 윈도우가 가득 찬 플레이어는 가장
+        오래된 행동을 덮어쓴다.
+        :param actions: 플레이어별 행동 id (players,) 또는 (N, 2).
+        :param frames: 행동이 발생한 프레임 번호 (스칼라 또는 actions와 같은 모양).
+        :param mask: 기록할 플레이어 (None이면 전부).
+        """
+        actions = np.asarray(actions, dtype=np.int64).reshape(-1)
+        frames = np.broadcast_to(np.asarray(frames, dtype=np.int64), actions.shape).reshape(-1)
+        if mask is None:
+            rows = self._rows
+        else:
+            rows = np.flatnonzero(np.asarray(mask, dtype=bool).reshape(-1))
+            actions, frames = actions[rows], frames[rows]
+
+        head = self._head[rows]
+        full = self.lengths[rows] == self.window_size
+        evicted_rows = rows[full]
+        self.action_counts[evicted_rows, self.actions[evicted_rows, head[full]]] -= 1
+
+        self.actions[rows, head] = actions
+        self.frames[rows, head] = frames
+        self.action_counts[rows, actions] += 1
+        self.lengths[rows] += ~full
+        self._head[rows] = (head + 1) % self.window_size
+
+    def get_feature_vectors(self, out=None) -> np.ndarray:
+        """
+        모든 플레이어의 특징 벡터 (players, 4)를 반환한다.
+        :param out: 결과를 쓸 (..., 4) 배열 (예: 배치 관측값 배열의 일부인
+            (N, 2, 4) 뷰). 앞쪽 차원의 원소 수는 players와 같아야 한다.
+        """
+        if out is None:
+            out = np.empty((self.num_players, 4), dtype=np.float64)
+        lead = out.shape[:-1]
+        n = self.lengths
+        last = self.frames[self._rows, (self._head - 1) % self.window_size]
+        first = self.frames[self._rows, (self._head - n) % self.window_size]
+        duration_frames = last - first
+        duration_seconds = np.where(duration_frames > 0, duration_frames, n) / self.fps
+
+        # 1. 행동 밀도 (Action Density), 2. APM (Actions Per Minute)
+        density = np.divide(n, duration_seconds, out=np.zeros(self.num_players), where=duration_seconds > 0)
+        out[..., 0] = (density * 60).reshape(lead)
+        out[..., 1] = density.reshape(lead)
+
+        # 3. 공격/방어 비율 (Offense/Defense Ratio)
+        offense = self.action_counts @ self._offensive
+        defense = self.action_counts @ self._defensive
+        out[..., 2] = np.where(defense > 0, offense / np.maximum(defense, 1), offense).reshape(lead)
+
+        # 4. 리듬 엔트로피 (Rhythm Entropy): H = log2(n) - sum(c * log2(c)) / n
+        total = np.maximum(n, 1)
+        entropy = np.log2(total) - self._xlog2x[self.action_counts].sum(axis=1) / total
+        out[..., 3] = np.maximum(entropy, 0.0).reshape(lead)
+        return out
@@ -1,8 +1,9 @@
 from stable_baselines3.common.callbacks import BaseCallback
-from stable_baselines3.common.results_plotter import load_results, ts2xy
 import numpy as np
 import os
 
+from src.utils.histogram import StageTimings
+
 
 class CustomTensorboardCallback(BaseCallback):
     """
@@ -54,3 +55,90 @@ class CustomTensorboardCallback(BaseCallback):
                 self.logger.record("custom/player_won", 1 if player_won else 0)
 
         return True
+
+
+class StepTimingCallback(BaseCallback):
+    """
+    Logs the per-stage step latencies collected by FightingEnv (`pop_timings`)
+    to TensorBoard at the end of every rollout:
+    timing/<stage>_{mean,p50,p99,max}_ms and timing/step_timeouts.
+
+    Envs without step timings (e.g. FightingVecEnv) are skipped. If
+    `dump_file` is given, the merged timings of the whole run are written
+    there as a table when training ends.
+    """
+
+    def __init__(self, verbose: int = 0, dump_file=None):
+        super().__init__(verbose)
+        self.dump_file = dump_file
+        self.enabled = True
+        self.total_timings = StageTimings()
+
+    def _on_step(self) -> bool:
+        return True
+
+    def _collect(self) -> StageTimings:
+        timings = StageTimings()
+        for env_timings in self.training_env.env_method("pop_timings"):
+            timings.merge(env_timings)
+        return timings
+
+    def _on_rollout_end(self) -> None:
+        if not self.enabled:
+            return
+        try:
+            timings = self._collect()
+        except AttributeError:
+            self.enabled = False
+            if self.verbose:
+                print("StepTimingCallback: env has no step timings, disabled.")
+            return
+        for stage, histogram in timings.histograms.items():
+            if not histogram.count:
+                continue
+            self.logger.record(f"timing/{stage}_mean_ms", histogram.mean * 1e3)
+            self.logger.record(f"timing/{stage}_p50_ms", histogram.percentile(50) * 1e3)
+            self.logger.record(f"timing/{stage}_p99_ms", histogram.percentile(99) * 1e3)
+            self.logger.record(f"timing/{stage}_max_ms", histogram.max * 1e3)
+        self.logger.record("timing/step_timeouts", timings.timeouts)
+        self.total_timings.merge(timings)
+
+    def _on_training_end(self) -> None:
+        if self.dump_file is not None and self.enabled:
+            self.total_timings.dump(self.dump_file)
+
+
+class LeagueCallback(BaseCallback):
+    """
+    Snapshots the learner into a league `OpponentPool` every
+    `snapshot_freq` timesteps (as "step_<n>") and logs league/pool_size,
+    league/mean_win_rate and the opponent cache hit rate after every rollout.
+    With `save_dir`, each snapshot is also saved there as a model file.
+    """
+
+    def __init__(self, pool, snapshot_freq: int, save_dir: str = None, verbose: int = 0):
+        super().__init__(verbose)
+        self.pool = pool
+        self.snapshot_freq = snapshot_freq
+        self.save_dir = save_dir
+        self._last_snapshot = 0
+
+    def _on_step(self) -> bool:
+        if self.num_timesteps - self._last_snapshot >= self.snapshot_freq:
+            self._last_snapshot = self.num_timesteps
+            name = f"step_{self.num_timesteps}"
+            self.pool.add_policy(name, self.model.policy)
+            if self.save_dir is not None:
+                self.model.save(os.path.join(self.save_dir, f"league_{name}"))
+            if self.verbose:
+                print(f"LeagueCallback: added {name} ({len(self.pool)} opponents)")
+        return True
+
+    def _on_rollout_end(self) -> None:
+        self.logger.record("league/pool_size", len(self.pool))
+        win_rates = [self.pool.stats(name).win_rate for name in self.pool.names]
+        if win_rates:
+            self.logger.record("league/mean_win_rate", float(np.mean(win_rates)))
+        lookups = self.pool.cache_hits + self.pool.cache_misses
+        if lookups:
+            self.logger.record("league/cache_hit_rate", self.pool.cache_hits / lookups)
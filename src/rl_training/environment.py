@@ -4,16 +4,25 @@ import numpy as np
 import queue
 import threading
 import logging
-from typing import Tuple # Import Tuple
+import time
+from collections import deque
+from typing import Optional, Tuple # Import Tuple
 
+from src.networking.bridge import DEFAULT_QUEUE_SIZE, AsyncBridgeQueue
 from src.networking.webrtc import WebRTCClient
 from src.rhythm_analyzer import RhythmAnalyzer
 from src.rl_training.rewards import RewardCalculator # Import RewardCalculator
+from src.utils.histogram import StageTimings
 
 # Basic logging setup
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Stages of one step, timed into FightingEnv.timings. enqueue, receive and
+# reward are measured here; send, remote and decode by WebRTCClient. In-process
+# envs record the engine frame as "remote".
+STEP_STAGES = ("enqueue", "send", "remote", "receive", "decode", "reward")
+
 
 class FightingEnv(gym.Env):
     """
@@ -23,11 +32,54 @@ class FightingEnv(gym.Env):
 
     metadata = {"render_modes": ["human"], "render_fps": 60}
 
-    def __init__(self, backend_peer_id: str, render_mode=None, test_mode: bool = False, headless_mode: bool = False):
+    def __init__(
+        self,
+        backend_peer_id: str,
+        render_mode=None,
+        test_mode: bool = False,
+        headless_mode: bool = False,
+        in_process: bool = False,
+        deterministic: bool = False,
+        characters: Tuple[Optional[int], Optional[int]] = (None, None),
+        binary_protocol: bool = False,
+        pipeline_depth: int = 1,
+        step_timeout: float = 10.0,
+    ):
+        """
+        Args:
+            in_process: Step the game engine synchronously in this thread
+                (`LocalGameClient`) instead of exchanging messages with a game
+                client thread. Takes precedence over test/headless mode.
+            deterministic: Fixed-point engine (in-process backend only).
+            characters: Character ids for the move tables (in-process backend only).
+            binary_protocol: Send actions to the browser client with the binary
+                framing in `src.networking.protocol` instead of JSON.
+            pipeline_depth: How many actions `step_async()` may have in flight
+                before `step_wait()` must be called. With depth > 1 the action
+                for frame t+1 is sent before frame t's result arrives, so it is
+                chosen from an observation that is one frame old.
+            step_timeout: Seconds to wait for one step's result. A timed-out
+                step is reported in its info dict; the episode continues.
+
+        Per-stage step latencies (STEP_STAGES) are collected in `self.timings`;
+        timed-out steps are counted in `self.timings.timeouts` instead.
+        """
         super().__init__()
         self.test_mode = test_mode
         self.headless_mode = headless_mode
+        self.in_process = in_process
         self.prev_state = {}
+        if pipeline_depth < 1:
+            raise ValueError("pipeline_depth must be at least 1.")
+        self.pipeline_depth = pipeline_depth
+        self.step_timeout = step_timeout
+        # Every request carries a sequence number; results echo it back
+        self._seq = 0
+        self._pending = deque()  # (seq, action) of steps sent but not yet returned
+        self._early_results = {}  # seq -> result that overtook an older step
+        self.timings = StageTimings(STEP_STAGES)
+        self.reordered_results = 0
+        self.stale_results = 0
 
         # Action Space: Tuple of two discrete actions (one for each player)
         # Each action: 0:Idle, 1:MoveFwd, 2:MoveBwd, 3:Jump, 4:Attack1, 5:Attack2
@@ -38,11 +90,21 @@ class FightingEnv(gym.Env):
         self.observation_space = gym.spaces.Box(
             low=0.0, high=1.0, shape=(8,), dtype=np.float32
         )
+        self._last_obs = np.zeros(self.observation_space.shape, dtype=np.float32)
 
-        self.action_queue = queue.Queue()
-        self.result_queue = queue.Queue()
+        # Bounded: the trainer blocks instead of queueing without limit
+        self.action_queue = AsyncBridgeQueue(DEFAULT_QUEUE_SIZE)
+        self.result_queue = queue.Queue(DEFAULT_QUEUE_SIZE)
 
-        if self.headless_mode:
+        if self.in_process:
+            # Run the engine directly: no queues, no threads
+            from src.networking.local_client import LocalGameClient
+            self.game_client = LocalGameClient(deterministic=deterministic, characters=characters)
+            self.game_client_thread = None
+            self.game = self.game_client.simulation
+            self._prev_obs = np.zeros(self.observation_space.shape, dtype=np.float32)
+            logger.info("FightingEnv running in-process with LocalGameClient.")
+        elif self.headless_mode:
             # Use a mock client for headless mode
             from src.networking.mock_client import MockGameClient
             self.game_client = MockGameClient(self.action_queue, self.result_queue)
@@ -55,7 +117,11 @@ class FightingEnv(gym.Env):
         else:
             # Use WebRTC client for normal mode
             self.game_client = WebRTCClient(
-                self.action_queue, self.result_queue, test_mode=self.test_mode
+                self.action_queue,
+                self.result_queue,
+                test_mode=self.test_mode,
+                binary=binary_protocol,
+                timings=self.timings,
             )
             self.game_client_thread = threading.Thread(
                 target=self.game_client.run,
@@ -86,92 +152,196 @@ class FightingEnv(gym.Env):
             raise ConnectionAbortedError("Frontend connection timed out.")
 
     def step(self, action: Tuple[int, int]):
-        p1_action, p2_action = action
-        self.action_queue.put({"type": "action", "p1Action": int(p1_action), "p2Action": int(p2_action)})
-        try:
-            result = self.result_queue.get(timeout=10)
-
-            if result.get("type") != "action_result":
-                raise ConnectionError("Unexpected message type received for step.")
-
-            # The result now contains raw state data
-            current_state = result["state"]
-            obs = np.array(current_state["observation"], dtype=np.float32)
-            terminated = current_state["round_over"]
-            truncated = False
-            info = {}
-
-            # Prepare data for RewardCalculator
-            player_state = {
-                "health": current_state["p1_health"],
-                "x": current_state["p1_pos_x"],
-            }
-            opponent_state = {
-                "health": current_state["p2_health"],
-                "x": current_state["p2_pos_x"],
-            }
-            game_info = {
-                "round_over": current_state["round_over"],
-                "player_won": current_state["p1_health"] > current_state["p2_health"], # Assuming p1 is the agent
-            }
-            last_player_health = self.prev_state.get("p1_health", current_state["p1_health"])
-            last_opponent_health = self.prev_state.get("p2_health", current_state["p2_health"])
-            last_distance = abs(self.prev_state.get("p1_pos_x", 0) - self.prev_state.get("p2_pos_x", 0))
-
-            # Calculate reward using RewardCalculator
-            reward = self.reward_calculator.calculate_reward(
-                player_state, opponent_state, game_info, p1_action,
-                last_player_health, last_opponent_health, last_distance
-            )
+        self.step_async(action)
+        return self.step_wait()
 
-            # Update previous state
-            self.prev_state = current_state
+    def step_async(self, action: Tuple[int, int]) -> None:
+        """
+        Send `action` without waiting for its result. Up to `pipeline_depth`
+        steps can be in flight; results are returned in order by `step_wait()`.
+        """
+        if len(self._pending) >= self.pipeline_depth:
+            raise RuntimeError(
+                f"{self.pipeline_depth} step(s) already in flight; call step_wait() first."
+            )
+        p1_action, p2_action = int(action[0]), int(action[1])
+        if self.in_process:
+            self._pending.append((None, (p1_action, p2_action)))
+            return
+        seq = self._next_seq()
+        start = time.perf_counter()
+        self.action_queue.put({"type": "action", "p1Action": p1_action, "p2Action": p2_action, "seq": seq})
+        self.timings["enqueue"].record(time.perf_counter() - start)
+        self._pending.append((seq, (p1_action, p2_action)))
 
-            return obs, reward, terminated, truncated, info
+    def step_wait(self):
+        """Return the result of the oldest step sent with `step_async()`."""
+        if not self._pending:
+            raise RuntimeError("step_wait() called without a pending step_async().")
+        seq, (p1_action, p2_action) = self._pending.popleft()
+        if self.in_process:
+            return self._step_in_process(p1_action, p2_action)
 
-        except queue.Empty:
-            logger.error("Timeout: Did not receive action_result from frontend in time.", exc_info=True)
-            # Return default observation but distinguish timeout from actual game over
+        result = self._receive(seq, "action_result")
+        if result is None:
+            self.timings.timeouts += 1
+            logger.error(f"Timeout: Did not receive action_result for step {seq} in time.")
+            # Keep the episode going from the last known observation
             return (
-                np.zeros(self.observation_space.shape, dtype=np.float32),
+                self._last_obs.copy(),
                 0.0,
-                True,  # terminated=True to stop the episode
                 False,
-                {"timeout": True, "error": "step_timeout"},  # Explicit timeout indicator
+                False,
+                {"timeout": True, "error": "step_timeout", "seq": seq},
             )
 
-    def reset(self, seed=None, options=None):
-        super().reset(seed=seed)
+        received_at = result.get("received_at")
+        if received_at is not None:
+            self.timings["receive"].record(time.perf_counter() - received_at)
 
-        self.action_queue.put({"type": "reset"})
-        try:
-            # First, check for connection_ready message if it hasn't been consumed yet
-            # This is a handshake that MockGameClient sends upon startup
-            result = self.result_queue.get(timeout=10)
-            if result.get("type") == "connection_ready":
-                # If connection_ready, then get the actual reset_result
-                result = self.result_queue.get(timeout=10)
+        # The result now contains raw state data
+        current_state = result["state"]
+        obs = np.array(current_state["observation"], dtype=np.float32)
+        terminated = current_state["round_over"]
+        truncated = False
+        info = {}
 
-            if result.get("type") != "reset_result":
-                raise ConnectionError("Unexpected message type received for reset.")
+        # Prepare data for RewardCalculator
+        player_state = {
+            "health": current_state["p1_health"],
+            "x": current_state["p1_pos_x"],
+        }
+        opponent_state = {
+            "health": current_state["p2_health"],
+            "x": current_state["p2_pos_x"],
+        }
+        game_info = {
+            "round_over": current_state["round_over"],
+            "player_won": current_state["p1_health"] > current_state["p2_health"], # Assuming p1 is the agent
+        }
+        last_player_health = self.prev_state.get("p1_health", current_state["p1_health"])
+        last_opponent_health = self.prev_state.get("p2_health", current_state["p2_health"])
+        last_distance = abs(self.prev_state.get("p1_pos_x", 0) - self.prev_state.get("p2_pos_x", 0))
 
-            # Store the initial state
-            initial_state = result["state"]
-            self.prev_state = initial_state
-            
-            obs = np.array(initial_state["observation"], dtype=np.float32)
-            info = {}
+        # Calculate reward using RewardCalculator
+        start = time.perf_counter()
+        reward = self.reward_calculator.calculate_reward(
+            player_state, opponent_state, game_info, p1_action,
+            last_player_health, last_opponent_health, last_distance
+        )
+        self.timings["reward"].record(time.perf_counter() - start)
 
-            return obs, info
+        # Update previous state
+        self.prev_state = current_state
+        self._last_obs = obs
 
-        except queue.Empty:
-            logger.error("Timeout: Did not receive reset_result from frontend in time.", exc_info=True)
+        return obs, reward, terminated, truncated, info
+
+    @property
+    def step_timeouts(self) -> int:
+        return self.timings.timeouts
+
+    def pop_timings(self) -> StageTimings:
+        """Return the step timings collected so far and start new ones."""
+        return self.timings.pop()
+
+    def dump_timings(self, file=None) -> None:
+        self.timings.dump(file)
+
+    def _next_seq(self) -> int:
+        self._seq = (self._seq + 1) & 0xFFFFFFFF  # Fits the binary header's uint32
+        return self._seq
+
+    def _receive(self, seq: int, expected_type: str):
+        """
+        Wait for the result of request `seq`. Results of later pipelined steps
+        that arrive first are kept for their own `step_wait()`; results of
+        older requests (timed out, or sent before a reset) are dropped.
+        Returns None on timeout. Results without a "seq" (clients that do not
+        echo it) are taken to be in order.
+        """
+        if seq in self._early_results:
+            return self._early_results.pop(seq)
+        deadline = time.monotonic() + self.step_timeout
+        while True:
+            try:
+                result = self.result_queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                return None
+            msg_type = result.get("type")
+            if msg_type == "connection_ready":
+                continue
+            result_seq = result.get("seq")
+            if result_seq is None or result_seq == seq:
+                if msg_type == expected_type:
+                    return result
+                if result_seq is None and msg_type == "action_result":
+                    # Reply to a step that was in flight when reset() was called
+                    self.stale_results += 1
+                    continue
+                raise ConnectionError(f"Unexpected message type {msg_type!r} for {expected_type}.")
+            if result_seq > seq:
+                self.reordered_results += 1
+                self._early_results[result_seq] = result
+            else:
+                self.stale_results += 1
+                logger.warning(f"Dropping stale result for request {result_seq}.")
+
+    def _step_in_process(self, p1_action: int, p2_action: int):
+        start = time.perf_counter()
+        obs, terminated = self.game_client.step(p1_action, p2_action)
+        computed = time.perf_counter()
+        self.timings["remote"].record(computed - start)
+        prev = self._prev_obs
+        # Observation layout: [p1_x, p1_y, p1_hp, p1_state, p2_x, p2_y, p2_hp, p2_state]
+        reward = self.reward_calculator.calculate_reward(
+            {"health": float(obs[2]), "x": float(obs[0])},
+            {"health": float(obs[6]), "x": float(obs[4])},
+            {"round_over": terminated, "player_won": obs[2] > obs[6]},
+            p1_action,
+            float(prev[2]),
+            float(prev[6]),
+            abs(float(prev[0]) - float(prev[4])),
+        )
+        self.timings["reward"].record(time.perf_counter() - computed)
+        prev[:] = obs
+        return obs.copy(), reward, terminated, False, {}
+
+    def reset(self, seed=None, options=None):
+        super().reset(seed=seed)
+
+        if self.in_process:
+            self._pending.clear()
+            obs = self.game_client.reset()
+            self._prev_obs[:] = obs
+            return obs.copy(), {}
+
+        # Results of steps still in flight are dropped when they arrive
+        self._pending.clear()
+        self._early_results.clear()
+        seq = self._next_seq()
+        self.action_queue.put({"type": "reset", "seq": seq})
+        # connection_ready (sent by MockGameClient on startup) is skipped by _receive
+        result = self._receive(seq, "reset_result")
+        if result is None:
+            logger.error("Timeout: Did not receive reset_result from frontend in time.")
             self.prev_state = {}
-            return np.zeros(self.observation_space.shape, dtype=np.float32), {
+            self._last_obs = np.zeros(self.observation_space.shape, dtype=np.float32)
+            return self._last_obs.copy(), {
                 "timeout": True,
                 "error": "reset_timeout"
             }
 
+        # Store the initial state
+        initial_state = result["state"]
+        self.prev_state = initial_state
+        
+        obs = np.array(initial_state["observation"], dtype=np.float32)
+        self._last_obs = obs
+        info = {}
+
+        return obs, info
+
     def render(self):
         """
         Rendering is handled by the browser (frontend). This method is a no-op.
@@ -184,7 +354,11 @@ class FightingEnv(gym.Env):
         Closes the game client connection and cleans up resources.
         """
         if self.game_client is not None:
-            if hasattr(self.game_client, 'stop'):
+            # WebRTCClient.close() cancels its sender and stops its event loop;
+            # the mock and local clients only have stop()
+            if hasattr(self.game_client, 'close'):
+                self.game_client.close()
+            elif hasattr(self.game_client, 'stop'):
                 self.game_client.stop()
             if self.game_client_thread and self.game_client_thread.is_alive():
                 self.game_client_thread.join(timeout=2)
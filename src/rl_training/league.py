@@ -0,0 +1,240 @@
+"""
+Self-play league: train Player 1 against frozen past versions of itself.
+
+`OpponentPool` keeps snapshots of the learner's policy parameters in memory
+together with the learner's results against each of them, and samples
+opponents with prioritised fictitious self-play weights: opponents the
+learner beats less often are picked more often. Live policy modules are
+kept in a small LRU cache; on a miss the least recently used module is
+re-filled from the in-memory parameters, so switching opponents never
+touches the disk and never builds a new network once the cache is full.
+
+`LeagueVecEnv` wraps a two-player VecEnv (MultiDiscrete([6, 6]) actions,
+8-float observation): the learner chooses Player 1's action, and Player
+2's actions come from the opponent assigned to each env, evaluated on the
+mirrored observation with one batched forward pass per distinct opponent.
+Opponents are re-sampled when an env's episode ends.
+"""
+
+import copy
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import numpy as np
+from gymnasium import spaces
+from stable_baselines3.common.vec_env.base_vec_env import (VecEnv,
+                                                           VecEnvObs,
+                                                           VecEnvStepReturn,
+                                                           VecEnvWrapper)
+
+from src.constants import (ACTION_ATTACK, ACTION_GUARD, ACTION_IDLE,
+                           ACTION_JUMP, ACTION_MOVE_LEFT, ACTION_MOVE_RIGHT,
+                           NUM_ACTIONS)
+
+logger = logging.getLogger(__name__)
+
+# Observation columns seen from Player 2's side: players swapped, x mirrored
+_MIRROR_COLUMNS = np.array([4, 5, 6, 7, 0, 1, 2, 3])
+_X_COLUMNS = np.array([0, 4])
+# An action chosen in the mirrored view, as Player 2 must play it
+_MIRROR_ACTIONS = np.array(
+    [ACTION_IDLE, ACTION_MOVE_LEFT, ACTION_MOVE_RIGHT, ACTION_JUMP, ACTION_ATTACK, ACTION_GUARD]
+)
+
+
+def mirror_observations(obs: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """(N, 8) observations as Player 2 sees them, in Player 1's slots."""
+    out = np.take(obs, _MIRROR_COLUMNS, axis=1, out=out)
+    out[:, _X_COLUMNS] = 1.0 - out[:, _X_COLUMNS]
+    return out
+
+
+class OpponentRecord(NamedTuple):
+    name: str
+    games: float
+    wins: float  # Learner's score against this opponent (draws count 0.5)
+
+    @property
+    def win_rate(self) -> float:
+        # One prior draw, so new opponents start at 0.5
+        return (self.wins + 0.5) / (self.games + 1.0)
+
+
+class OpponentPool:
+    """
+    Args:
+        max_size: Snapshots kept; the oldest is retired when a new one
+            would exceed it.
+        cache_size: Live policy modules kept in the LRU cache.
+        priority_exponent: Sampling weight is (1 - win_rate) ** exponent;
+            0 samples uniformly.
+
+    Attributes:
+        cache_hits, cache_misses: LRU cache statistics.
+        modules_built: Policy modules created (at most `cache_size`).
+    """
+
+    def __init__(self, max_size: int = 20, cache_size: int = 4, priority_exponent: float = 2.0):
+        if max_size < 1 or cache_size < 1:
+            raise ValueError("max_size and cache_size must be at least 1.")
+        self.max_size = max_size
+        self.cache_size = cache_size
+        self.priority_exponent = priority_exponent
+        self._params: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._games: Dict[str, float] = {}
+        self._wins: Dict[str, float] = {}
+        self._cache: "OrderedDict[str, Any]" = OrderedDict()
+        self._template = None
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.modules_built = 0
+
+    def __len__(self) -> int:
+        return len(self._params)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._params
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._params)
+
+    def add_policy(self, name: str, policy) -> None:
+        """Snapshot the parameters of an SB3 policy (e.g. `model.policy`)."""
+        if name in self._params:
+            raise ValueError(f"Opponent {name!r} is already in the pool.")
+        if self._template is None:
+            self._template = copy.deepcopy(policy)
+            self._template.set_training_mode(False)
+        self._params[name] = {key: value.detach().cpu().clone() for key, value in policy.state_dict().items()}
+        self._games[name] = 0.0
+        self._wins[name] = 0.0
+        while len(self._params) > self.max_size:
+            retired, _ = self._params.popitem(last=False)
+            self._cache.pop(retired, None)
+            logger.info(f"Retired opponent {retired}")
+
+    def add_checkpoint(self, name: str, path: str, algorithm=None) -> None:
+        """Load a saved model once, now, and keep only its policy parameters."""
+        if algorithm is None:
+            from stable_baselines3 import PPO as algorithm
+        self.add_policy(name, algorithm.load(path, device="cpu").policy)
+
+    def record(self, name: str, score: float) -> None:
+        """Add one game: `score` is the learner's result (1 win, 0.5 draw, 0 loss)."""
+        if name in self._games:
+            self._games[name] += 1.0
+            self._wins[name] += score
+
+    def stats(self, name: str) -> OpponentRecord:
+        return OpponentRecord(name, self._games[name], self._wins[name])
+
+    def probabilities(self) -> np.ndarray:
+        """Sampling probabilities over `names`."""
+        win_rates = np.array([self.stats(name).win_rate for name in self._params])
+        weights = (1.0 - win_rates) ** self.priority_exponent
+        return weights / weights.sum()
+
+    def sample(self, rng: np.random.Generator, size: int) -> List[str]:
+        if not self._params:
+            raise RuntimeError("The opponent pool is empty; add a snapshot before training.")
+        names = self.names
+        return [names[i] for i in rng.choice(len(names), size=size, p=self.probabilities())]
+
+    def policy(self, name: str):
+        """The live policy module for `name`, from the LRU cache."""
+        module = self._cache.get(name)
+        if module is not None:
+            self._cache.move_to_end(name)
+            self.cache_hits += 1
+            return module
+        self.cache_misses += 1
+        if len(self._cache) >= self.cache_size:
+            # Reuse the least recently used module instead of building a new one
+            _, module = self._cache.popitem(last=False)
+        else:
+            module = copy.deepcopy(self._template)
+            self.modules_built += 1
+        module.load_state_dict(self._params[name])
+        self._cache[name] = module
+        return module
+
+
+class LeagueVecEnv(VecEnvWrapper):
+    """
+    Turns a two-player VecEnv into a Player 1 env against pool opponents.
+
+    Args:
+        venv: VecEnv with MultiDiscrete([6, 6]) actions and the default
+            8-float observation (FightingVecEnv, MultiplexedVecEnv or a
+            vectorised FlattenActionSpaceWrapper(FightingEnv)).
+        pool: Opponents; must hold at least one snapshot at reset.
+        deterministic: Use the opponents' greedy actions.
+        seed: Seed of the opponent sampler.
+        record_results: Report finished games to the pool (turn off for
+            evaluation envs so they do not skew the sampling priorities).
+
+    `infos[i]["opponent"]` names the opponent of a finished episode, and the
+    learner's result is recorded in the pool from the terminal observation
+    (health comparison, draws count half).
+    """
+
+    def __init__(
+        self,
+        venv: VecEnv,
+        pool: OpponentPool,
+        deterministic: bool = False,
+        seed: Optional[int] = None,
+        record_results: bool = True,
+    ):
+        if venv.observation_space.shape != (8,):
+            raise ValueError("League mode mirrors the 8-float game observation; use the default schema.")
+        super().__init__(venv, action_space=spaces.Discrete(NUM_ACTIONS))
+        self.pool = pool
+        self.deterministic = deterministic
+        self.record_results = record_results
+        self._rng = np.random.default_rng(seed)
+        self.opponents: List[Optional[str]] = [None] * self.num_envs
+        self._obs = np.zeros((self.num_envs, 8), dtype=np.float32)
+        self._mirrored = np.zeros((self.num_envs, 8), dtype=np.float32)
+        self._actions = np.zeros((self.num_envs, 2), dtype=np.int64)
+
+    def _assign(self, indices) -> None:
+        for i, name in zip(indices, self.pool.sample(self._rng, len(indices))):
+            self.opponents[i] = name
+
+    def reset(self) -> VecEnvObs:
+        obs = self.venv.reset()
+        self._assign(range(self.num_envs))
+        self._obs[:] = obs
+        return obs
+
+    def step_async(self, actions: np.ndarray) -> None:
+        self._actions[:, 0] = np.asarray(actions).reshape(self.num_envs)
+        retired = [i for i, name in enumerate(self.opponents) if name not in self.pool]
+        if retired:
+            self._assign(retired)
+
+        mirror_observations(self._obs, out=self._mirrored)
+        names = np.array(self.opponents)
+        for name in dict.fromkeys(self.opponents):  # Distinct, in a stable order
+            envs = np.flatnonzero(names == name)
+            actions, _ = self.pool.policy(name).predict(self._mirrored[envs], deterministic=self.deterministic)
+            self._actions[envs, 1] = _MIRROR_ACTIONS[actions]
+        self.venv.step_async(self._actions)
+
+    def step_wait(self) -> VecEnvStepReturn:
+        obs, rewards, dones, infos = self.venv.step_wait()
+        done_idx = np.flatnonzero(dones)
+        for i in done_idx:
+            terminal = infos[i]["terminal_observation"]
+            p1_health, p2_health = terminal[2], terminal[6]
+            score = 1.0 if p1_health > p2_health else 0.5 if p1_health == p2_health else 0.0
+            if self.record_results:
+                self.pool.record(self.opponents[i], score)
+            infos[i]["opponent"] = self.opponents[i]
+        if len(done_idx):
+            self._assign(done_idx)
+        self._obs[:] = obs
+        return obs, rewards, dones, infos
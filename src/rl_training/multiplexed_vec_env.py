@@ -0,0 +1,110 @@
+import logging
+import queue
+from typing import Any, Mapping, Optional, Sequence
+
+import numpy as np
+
+from src.networking import protocol
+from src.rl_training.observation import ObservationSchema
+from src.rl_training.rewards import RewardCalculator
+from src.rl_training.vec_env import FightingVecEnv
+
+logger = logging.getLogger(__name__)
+
+
+class MultiplexedVecEnv(FightingVecEnv):
+    """
+    Steps K matches hosted by one game client over a single connection.
+
+    Every `step` sends one BATCH_ACTION message with the actions of all K
+    envs and waits for one BATCH_RESULT carrying K observations and round
+    flags, so a step costs one round-trip instead of K. With
+    `action_repeat`, the client runs all the repeated frames, one engine
+    frame at a time, for that one message. Finished matches are
+    reset with one BATCH_RESET for the whole batch. Rewards, auto-reset and
+    episode infos are computed here exactly as in `FightingVecEnv`.
+
+    The env talks to the client through a queue pair: encoded requests go on
+    `action_queue`, encoded results come back on `result_queue`. The only
+    client that answers the batch messages so far is
+    `LocalMultiplexedClient.serve`; the browser client does not implement
+    them yet, so there is no WebRTC transport or training backend for this
+    env.
+    """
+
+    def __init__(
+        self,
+        num_envs: int,
+        action_queue: queue.Queue,
+        result_queue: queue.Queue,
+        reward_calculator: Optional[RewardCalculator] = None,
+        timeout: float = 10.0,
+        log_reward_components: bool = False,
+        personas: Optional[Mapping[str, Any]] = None,
+        persona_assignment: Optional[Sequence[str]] = None,
+        observation_schema: Optional[ObservationSchema] = None,
+        action_repeat: int = 1,
+    ):
+        self.action_queue = action_queue
+        self.result_queue = result_queue
+        self.timeout = timeout
+        self._seq = 0
+        self._setup(
+            num_envs,
+            reward_calculator,
+            log_reward_components,
+            personas,
+            persona_assignment,
+            observation_schema,
+            action_repeat,
+        )
+
+    def wait_for_connection(self, timeout: float = 60.0) -> None:
+        logger.info("Waiting for multiplexed game client connection...")
+        try:
+            result = self.result_queue.get(timeout=timeout)
+        except queue.Empty:
+            raise ConnectionAbortedError("Game client connection timed out.")
+        if isinstance(result, bytes) or result.get("type") != "connection_ready":
+            raise ConnectionError("Received unexpected message while waiting for connection.")
+
+    def _exchange(self, request: bytes) -> protocol.BatchMessage:
+        seq = self._seq
+        self.action_queue.put(request)
+        while True:
+            try:
+                data = self.result_queue.get(timeout=self.timeout)
+            except queue.Empty:
+                raise TimeoutError(f"No batch result for seq {seq} within {self.timeout}s.")
+            if not isinstance(data, bytes):
+                logger.warning(f"Ignoring non-batch message: {data}")
+                continue
+            result = protocol.decode_batch(data)
+            if result.msg_type != protocol.MSG_BATCH_RESULT:
+                raise protocol.ProtocolError(f"Expected a batch result, got type {result.msg_type}")
+            if result.seq == seq:
+                break
+            if result.seq > seq:
+                raise protocol.ProtocolError(f"Result for seq {result.seq} arrived before seq {seq}")
+            logger.warning(f"Dropping stale batch result for seq {result.seq}")
+        if result.count != self.num_envs:
+            raise protocol.ProtocolError(f"Expected {self.num_envs} results, got {result.count}")
+        self._obs[:] = result.observations
+        return result
+
+    def _next_seq(self) -> int:
+        self._seq = (self._seq + 1) & 0xFFFFFFFF
+        return self._seq
+
+    def _reset_matches(self, mask: Optional[np.ndarray] = None) -> None:
+        if mask is None:
+            mask = np.ones(self.num_envs, dtype=bool)
+        self._exchange(protocol.encode_batch_reset(mask, self._next_seq()))
+
+    def _step_matches(self) -> np.ndarray:
+        request = protocol.encode_batch_action(self._actions, self._next_seq(), self.action_repeat)
+        result = self._exchange(request)
+        return (result.flags & protocol.FLAG_ROUND_OVER).astype(bool)
+
+    def close(self) -> None:
+        self.action_queue.put({"type": "close"})
@@ -0,0 +1,231 @@
+"""
+Declared observation layout shared by training and serving.
+
+An `ObservationSchema` lists the per-frame fields of the policy observation:
+game fields read from `get_game_state`, optionally the four rhythm features
+of each player (see src.rhythm_analyzer), and how many frames of history
+are stacked. All scaling constants are computed once by the schema.
+
+`ObservationBuilder` writes frames into a preallocated ring buffer. Every
+frame is stored twice, at slot p and p + history, so the last `history`
+frames are always one contiguous run of slots; the stacked observation is a
+strided view of that run, oldest frame first. Pushing a frame therefore
+copies two frames' worth of floats and allocates nothing.
+
+The default schema (`ObservationSchema()`) is the 8-float observation every
+backend already produces, so existing models keep working.
+"""
+
+import math
+from typing import Dict, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from gymnasium import spaces
+
+from src.constants import (FPS, INITIAL_HEALTH, NUM_ACTIONS, PLAYER_HEIGHT,
+                           PLAYER_WIDTH, SCREEN_HEIGHT, SCREEN_WIDTH)
+from src.game_engine.states import NUM_STATES
+
+
+class ObservationField(NamedTuple):
+    """One game field: value = state[player][key] * scale + bias."""
+
+    name: str
+    player: Optional[str]  # "player1" / "player2", None for top-level keys
+    key: str
+    scale: float
+    bias: float = 0.0
+    low: float = 0.0
+    high: float = 1.0
+
+
+_GROUND_Y = SCREEN_HEIGHT - PLAYER_HEIGHT
+_X_RANGE = SCREEN_WIDTH - PLAYER_WIDTH
+
+
+def _player_fields(prefix: str, player: str) -> Tuple[ObservationField, ...]:
+    return (
+        ObservationField(f"{prefix}_x", player, "x", 1.0 / _X_RANGE),
+        ObservationField(f"{prefix}_y", player, "y", -1.0 / _GROUND_Y, 1.0),
+        ObservationField(f"{prefix}_hp", player, "health", 1.0 / INITIAL_HEALTH),
+        ObservationField(f"{prefix}_state", player, "state", 1.0 / (NUM_STATES - 1)),
+        ObservationField(f"{prefix}_facing", player, "facing", 0.5, 0.5),
+    )
+
+
+# Every field the schema can name, from get_game_state()
+GAME_FIELDS: Dict[str, ObservationField] = {
+    field.name: field
+    for field in (
+        *_player_fields("p1", "player1"),
+        *_player_fields("p2", "player2"),
+        ObservationField("distance", None, "distance", 1.0 / SCREEN_WIDTH),
+    )
+}
+
+# Same layout and normalisation as write_observation / BatchedSimulation.write_observations
+DEFAULT_FIELDS = ("p1_x", "p1_y", "p1_hp", "p1_state", "p2_x", "p2_y", "p2_hp", "p2_state")
+
+# RhythmAnalyzer feature vector order, per player; scales map typical values to ~[0, 1]
+RHYTHM_FEATURES = ("apm", "action_density", "offense_defense_ratio", "rhythm_entropy")
+RHYTHM_SCALE = (1.0 / (60 * FPS), 1.0 / FPS, 1.0, 1.0 / math.log2(NUM_ACTIONS))
+
+
+class ObservationSchema:
+    """
+    Args:
+        fields: Names of the game fields (keys of GAME_FIELDS), in order.
+        rhythm: Append [apm, action_density, offense_defense_ratio,
+            rhythm_entropy] of Player 1 and Player 2 to every frame.
+        history: Number of stacked frames, oldest first.
+
+    Attributes:
+        names: Field names of one frame.
+        game_size, frame_size, size: Floats in the game part, in one frame
+            and in the whole stacked observation.
+        scale, bias: (frame_size,) constants turning raw values into
+            observation values (the bias of rhythm features is 0).
+    """
+
+    def __init__(self, fields: Sequence[str] = DEFAULT_FIELDS, rhythm: bool = False, history: int = 1):
+        unknown = [name for name in fields if name not in GAME_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown observation fields: {unknown}")
+        if history < 1:
+            raise ValueError("history must be at least 1.")
+        self.fields = tuple(GAME_FIELDS[name] for name in fields)
+        self.rhythm = rhythm
+        self.history = history
+
+        rhythm_names = [f"{p}_{name}" for p in ("p1", "p2") for name in RHYTHM_FEATURES] if rhythm else []
+        self.names = tuple(field.name for field in self.fields) + tuple(rhythm_names)
+        self.game_size = len(self.fields)
+        self.frame_size = len(self.names)
+        self.size = self.frame_size * history
+
+        rhythm_scale = list(RHYTHM_SCALE) * 2 if rhythm else []
+        self.scale = np.array([f.scale for f in self.fields] + rhythm_scale, dtype=np.float32)
+        self.bias = np.array([f.bias for f in self.fields] + [0.0] * len(rhythm_scale), dtype=np.float32)
+        self._low = np.array([f.low for f in self.fields] + [0.0] * len(rhythm_scale), dtype=np.float32)
+        self._high = np.array([f.high for f in self.fields] + [np.inf] * len(rhythm_scale), dtype=np.float32)
+
+    def space(self) -> spaces.Box:
+        """Observation space of the stacked observation."""
+        return spaces.Box(
+            low=np.tile(self._low, self.history),
+            high=np.tile(self._high, self.history),
+            dtype=np.float32,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, ObservationSchema)
+            and self.names == other.names
+            and self.history == other.history
+        )
+
+    def __repr__(self) -> str:
+        fields = [field.name for field in self.fields]
+        return f"ObservationSchema(fields={fields}, rhythm={self.rhythm}, history={self.history})"
+
+
+class ObservationBuilder:
+    """
+    Builds stacked observations for one env (`num_envs=None`, shape
+    (size,)) or a batch (shape (num_envs, size)).
+
+    `push` / `reset` take the game part already normalised (the observation
+    the engines and game clients produce for these fields); `push_state`
+    takes a raw `get_game_state` dict. Raw rhythm features are passed as
+    `rhythm` or written beforehand into `rhythm_input`, a (..., 2, 4) view of
+    the builder's input buffer (e.g. `BatchedRhythmAnalyzer.get_feature_vectors(
+    out=builder.rhythm_input)`).
+
+    The returned observation is a view into the ring buffer and changes on
+    the next push; copy it to keep it.
+    """
+
+    def __init__(self, schema: Optional[ObservationSchema] = None, num_envs: Optional[int] = None):
+        self.schema = schema or ObservationSchema()
+        self.num_envs = num_envs
+        batch = () if num_envs is None else (num_envs,)
+        history, frame_size, game_size = self.schema.history, self.schema.frame_size, self.schema.game_size
+
+        self._frames = np.zeros(batch + (2 * history, frame_size), dtype=np.float32)
+        self._raw_game = np.zeros(game_size, dtype=np.float32)
+        self._raw_rhythm = np.zeros(batch + (frame_size - game_size,), dtype=np.float32)
+        self.rhythm_input = self._raw_rhythm.reshape(batch + (2, len(RHYTHM_FEATURES))) if self.schema.rhythm else None
+        self._game_scale = self.schema.scale[:game_size]
+        self._game_bias = self.schema.bias[:game_size]
+        self._rhythm_scale = self.schema.scale[game_size:]
+
+        # Per ring position: the (new, mirror) slots of the frame and the stacked view
+        self._slots = [(self._frames[..., p, :], self._frames[..., p + history, :]) for p in range(history)]
+        self._views = [
+            self._frames[..., p + 1 : p + 1 + history, :].reshape(batch + (self.schema.size,))
+            for p in range(history)
+        ]
+        self._pos = 0
+
+    @property
+    def observation(self) -> np.ndarray:
+        """The current stacked observation (a view)."""
+        return self._views[(self._pos - 1) % self.schema.history]
+
+    def _write_rhythm(self, slot: np.ndarray, rhythm: Optional[np.ndarray]) -> None:
+        if not self.schema.rhythm:
+            return
+        if rhythm is not None:
+            self.rhythm_input[...] = rhythm
+        np.multiply(self._raw_rhythm, self._rhythm_scale, out=slot[..., self.schema.game_size :])
+
+    def _commit(self) -> np.ndarray:
+        slot, mirror = self._slots[self._pos]
+        mirror[...] = slot
+        view = self._views[self._pos]
+        self._pos = (self._pos + 1) % self.schema.history
+        return view
+
+    def push(self, game: np.ndarray, rhythm: Optional[np.ndarray] = None) -> np.ndarray:
+        """Append a frame from the normalised game part and raw rhythm features."""
+        slot = self._slots[self._pos][0]
+        slot[..., : self.schema.game_size] = game
+        self._write_rhythm(slot, rhythm)
+        return self._commit()
+
+    def push_state(self, state: Dict, rhythm: Optional[np.ndarray] = None) -> np.ndarray:
+        """Append a frame from a `get_game_state` dict (single env only)."""
+        if self.num_envs is not None:
+            raise ValueError("push_state builds one env's frame; use push() for batches.")
+        raw = self._raw_game
+        for i, field in enumerate(self.schema.fields):
+            raw[i] = (state[field.player] if field.player else state)[field.key]
+        slot = self._slots[self._pos][0]
+        game = slot[: self.schema.game_size]
+        np.multiply(raw, self._game_scale, out=game)
+        game += self._game_bias
+        self._write_rhythm(slot, rhythm)
+        return self._commit()
+
+    def reset(
+        self, game: np.ndarray, rhythm: Optional[np.ndarray] = None, mask: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Fill the whole history of the envs selected by `mask` (all if None)
+        with one frame, e.g. the first observation of a new episode.
+        """
+        slot = self._slots[self._pos][0]
+        if mask is None:
+            slot[..., : self.schema.game_size] = game
+            self._write_rhythm(slot, rhythm)
+            self._frames[...] = slot[..., None, :]
+        else:
+            mask = np.asarray(mask, dtype=bool)
+            # Build the frame in the next slot, which the next push overwrites anyway
+            frame = self._frames[:, self._pos, :]
+            saved = frame[~mask].copy()
+            frame[..., : self.schema.game_size] = game
+            self._write_rhythm(frame, rhythm)
+            self._frames[mask] = frame[mask][:, None, :]
+            frame[~mask] = saved
+        return self.observation
@@ -0,0 +1,197 @@
+"""
+Persona rewards as one matrix product.
+
+`PersonaRewardKernel` extracts every reward feature once per env step from
+consecutive observations (N envs x 2 player perspectives x F features) and
+multiplies the result by a feature x persona weight matrix built from the
+personas' `reward_weights`. One batched simulation therefore yields rewards
+for every persona at once.
+
+Feature definitions (per step, from the acting player's perspective; health
+and distance are normalised like the observation). A step may cover several
+frames (action repeat); "this frame" then means "since the previous step":
+
+    damage                 opponent health lost this frame
+    damage_taken           own health lost this frame
+    survival               own remaining health, on the round-over frame only
+    win                    +1 on a won round-over frame, -1 on a lost one
+    distance_to_opponent   horizontal distance between the players
+    opponent_close_range   1 while the players are within punch reach
+    attack_frequency       1 on frames where an attack starts
+    hit                    1 when an attack connects (guarded or not)
+    close_range_attack_hit 1 when an attack connects within punch reach
+    combo_success          1 for a hit within COMBO_WINDOW frames of the previous one
+    counter_punch_success  1 for a hit landed while the opponent was attacking
+    attack_miss            1 when an own attack ends without connecting
+    evade_success          1 when an opponent attack ends without connecting
+    guard_induced          1 when the opponent blocks an attack
+    movement               own horizontal movement this frame
+
+The engine has a single punch, so persona terms for specific attacks map onto
+the generic features through ALIASES. Terms nothing in the game state can
+measure (e.g. FunScore) are listed in `unsupported` and contribute nothing.
+"""
+
+import logging
+from typing import Dict, List, Mapping, Optional
+
+import numpy as np
+
+from src.constants import (ATTACK_DURATION, FPS, PLAYER_WIDTH, PUNCH_COOLDOWN,
+                           SCREEN_WIDTH)
+from src.game_engine.batched import HITBOX_WIDTH
+from src.game_engine.states import NUM_STATES, STATE_ATTACK, STATE_GUARD_HIT
+
+logger = logging.getLogger(__name__)
+
+FEATURES = (
+    "damage",
+    "damage_taken",
+    "survival",
+    "win",
+    "distance_to_opponent",
+    "opponent_close_range",
+    "attack_frequency",
+    "hit",
+    "close_range_attack_hit",
+    "combo_success",
+    "counter_punch_success",
+    "attack_miss",
+    "evade_success",
+    "guard_induced",
+    "movement",
+)
+FEATURE_INDEX: Dict[str, int] = {name: i for i, name in enumerate(FEATURES)}
+
+# Persona reward_weights keys -> feature
+ALIASES: Dict[str, str] = {
+    "jab_hit": "hit",
+    "light_attack_hit": "hit",
+    "powerful_attack_hit": "hit",
+    "rapid_combo_hit": "combo_success",
+    "powerful_attack_miss": "attack_miss",
+    "repeated_defense_induce": "guard_induced",
+    "explore": "movement",
+}
+
+# Frames between two hits that still count as a combo: back-to-back punches
+# (cooldown plus the attack itself) plus a few frames of slack
+COMBO_WINDOW = int(round((PUNCH_COOLDOWN + ATTACK_DURATION) * FPS)) + 6
+# Longest step (in frames) in which every attack still shows up in at least
+# one observation; beyond it attack starts, misses and evades go unseen
+MAX_FRAMES_PER_STEP = int(round(ATTACK_DURATION * FPS)) - 1
+# Rect distance (normalised) within which the punch can connect
+CLOSE_RANGE = (PLAYER_WIDTH + HITBOX_WIDTH) / (SCREEN_WIDTH - PLAYER_WIDTH)
+
+# Observation columns of [self, opponent] for each perspective
+_X = np.array([[0, 4], [4, 0]])
+_HEALTH = np.array([[2, 6], [6, 2]])
+_STATE = np.array([[3, 7], [7, 3]])
+
+
+class PersonaRewardKernel:
+    """
+    Args:
+        personas: name -> object with `reward_weights` (e.g. `PERSONAS`), or
+            name -> weights dict.
+        num_envs: Number of envs the per-env trackers (combos, attack
+            outcomes) are kept for.
+
+    Attributes:
+        names: Persona names, in weight-matrix column order.
+        weights: (F, P) weight matrix.
+        unsupported: Persona -> weight keys with no matching feature.
+    """
+
+    def __init__(self, personas: Mapping[str, object], num_envs: int):
+        self.names: List[str] = list(personas)
+        self.num_envs = num_envs
+        self.weights = np.zeros((len(FEATURES), len(self.names)), dtype=np.float64)
+        self.unsupported: Dict[str, List[str]] = {}
+        for column, name in enumerate(self.names):
+            persona = personas[name]
+            reward_weights = getattr(persona, "reward_weights", persona)
+            for key, weight in reward_weights.items():
+                feature = FEATURE_INDEX.get(ALIASES.get(key, key))
+                if feature is None:
+                    self.unsupported.setdefault(name, []).append(key)
+                else:
+                    self.weights[feature, column] += weight
+        if self.unsupported:
+            logger.info(f"Reward terms without a game-state feature (ignored): {self.unsupported}")
+
+        shape = (num_envs, 2)
+        self._frames_since_hit = np.full(shape, COMBO_WINDOW + 1, dtype=np.int64)
+        self._connected = np.zeros(shape, dtype=bool)
+        self.features = np.zeros((num_envs, 2, len(FEATURES)), dtype=np.float64)
+
+    def reset(self, mask: Optional[np.ndarray] = None) -> None:
+        """Clear the trackers of the envs selected by `mask` (all if None)."""
+        index = slice(None) if mask is None else np.asarray(mask, dtype=bool)
+        self._frames_since_hit[index] = COMBO_WINDOW + 1
+        self._connected[index] = False
+
+    def compute_features(
+        self, obs: np.ndarray, prev_obs: np.ndarray, round_over: np.ndarray, frames: int = 1
+    ) -> np.ndarray:
+        """
+        Fill and return `self.features` (N, 2, F); axis 1 is the perspective
+        of [Player 1, Player 2]. Call once per step, in order, with the number
+        of `frames` the step advanced (at most MAX_FRAMES_PER_STEP).
+        """
+        obs = obs.astype(np.float64)
+        prev = prev_obs.astype(np.float64)
+        out = self.features
+        round_over = np.asarray(round_over, dtype=bool)[:, None]
+
+        x, opp_x = obs[:, _X[:, 0]], obs[:, _X[:, 1]]
+        prev_x = prev[:, _X[:, 0]]
+        health, opp_health = obs[:, _HEALTH[:, 0]], obs[:, _HEALTH[:, 1]]
+        prev_health, prev_opp_health = prev[:, _HEALTH[:, 0]], prev[:, _HEALTH[:, 1]]
+        scale = NUM_STATES - 1
+        state = np.rint(obs[:, _STATE[:, 0]] * scale).astype(np.int64)
+        prev_state = np.rint(prev[:, _STATE[:, 0]] * scale).astype(np.int64)
+        opp_state = state[:, ::-1]
+        prev_opp_state = prev_state[:, ::-1]
+
+        damage = np.maximum(prev_opp_health - opp_health, 0.0)
+        damage_taken = np.maximum(prev_health - health, 0.0)
+        distance = np.abs(x - opp_x)
+        close = distance <= CLOSE_RANGE
+        hit = damage > 0
+
+        attacking, was_attacking = state == STATE_ATTACK, prev_state == STATE_ATTACK
+        attack_start = attacking & ~was_attacking
+        attack_end = was_attacking & ~attacking
+
+        # Attack outcome tracking: an attack misses if it ends without a hit
+        self._connected[attack_start] = False
+        self._connected |= hit
+        attack_miss = attack_end & ~self._connected
+
+        self._frames_since_hit += frames
+        combo = hit & (self._frames_since_hit <= COMBO_WINDOW)
+        self._frames_since_hit[hit] = 0
+
+        out[..., FEATURE_INDEX["damage"]] = damage
+        out[..., FEATURE_INDEX["damage_taken"]] = damage_taken
+        out[..., FEATURE_INDEX["survival"]] = np.where(round_over, health, 0.0)
+        out[..., FEATURE_INDEX["win"]] = np.where(round_over, np.where(health > opp_health, 1.0, -1.0), 0.0)
+        out[..., FEATURE_INDEX["distance_to_opponent"]] = distance
+        out[..., FEATURE_INDEX["opponent_close_range"]] = close
+        out[..., FEATURE_INDEX["attack_frequency"]] = attack_start
+        out[..., FEATURE_INDEX["hit"]] = hit
+        out[..., FEATURE_INDEX["close_range_attack_hit"]] = hit & close
+        out[..., FEATURE_INDEX["combo_success"]] = combo
+        out[..., FEATURE_INDEX["counter_punch_success"]] = hit & (prev_opp_state == STATE_ATTACK)
+        out[..., FEATURE_INDEX["attack_miss"]] = attack_miss
+        out[..., FEATURE_INDEX["evade_success"]] = attack_miss[:, ::-1]
+        out[..., FEATURE_INDEX["guard_induced"]] = hit & (opp_state == STATE_GUARD_HIT)
+        out[..., FEATURE_INDEX["movement"]] = np.abs(x - prev_x)
+        return out
+
+    def compute(
+        self, obs: np.ndarray, prev_obs: np.ndarray, round_over: np.ndarray, frames: int = 1
+    ) -> np.ndarray:
+        """Rewards (N, 2, P) of every persona for both player perspectives."""
+        return self.compute_features(obs, prev_obs, round_over, frames) @ self.weights
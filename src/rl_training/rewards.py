@@ -1,4 +1,9 @@
-from typing import Any, Dict
+from typing import Any, Dict, Tuple, Union
+
+import numpy as np
+
+# calculate_rewards(return_components=True)가 돌려주는 보상 요소 이름
+REWARD_COMPONENTS = ("damage", "win_loss", "distance", "idle")
 
 
 class RewardCalculator:
@@ -73,6 +78,83 @@ class RewardCalculator:
 
         return reward
 
+    def calculate_rewards(
+        self,
+        player_health: np.ndarray,
+        opponent_health: np.ndarray,
+        player_x: np.ndarray,
+        opponent_x: np.ndarray,
+        round_over: np.ndarray,
+        player_won: np.ndarray,
+        actions: np.ndarray,
+        last_player_health: np.ndarray,
+        last_opponent_health: np.ndarray,
+        last_distance: np.ndarray,
+        return_components: bool = False,
+    ) -> Union[np.ndarray, Tuple[np.ndarray, Dict[str, np.ndarray]]]:
+        """
+        N개 환경의 보상을 한 번에 계산합니다. 모든 인자는 길이 N의 배열이며,
+        env i의 결과는 같은 값으로 호출한 `calculate_reward`와 비트 단위로
+        같습니다 (float64에서 같은 순서로 더합니다).
+
+        Args:
+            return_components (bool): True이면 보상 요소별 배열
+                (REWARD_COMPONENTS: damage, win_loss, distance, idle)도 함께 반환합니다.
+
+        Returns:
+            np.ndarray: (N,) float64 보상. return_components=True이면 (보상, 요소 dict).
+        """
+        player_health = np.asarray(player_health, dtype=np.float64)
+        opponent_health = np.asarray(opponent_health, dtype=np.float64)
+        round_over = np.asarray(round_over, dtype=bool)
+
+        # 1. Damage dealt/taken reward
+        damage_dealt = np.asarray(last_opponent_health, dtype=np.float64) - opponent_health
+        damage_taken = np.asarray(last_player_health, dtype=np.float64) - player_health
+        dealt_reward = np.where(damage_dealt > 0, damage_dealt * self.damage_reward_scale, 0.0)
+        taken_penalty = np.where(damage_taken > 0, damage_taken * self.damage_penalty_scale, 0.0)
+
+        # 2. Win/Loss reward
+        win_loss = np.where(
+            round_over,
+            np.where(np.asarray(player_won, dtype=bool), self.win_reward, self.loss_penalty),
+            0.0,
+        )
+
+        # 3. Distance reward/penalty
+        current_distance = np.abs(
+            np.asarray(player_x, dtype=np.float64) - np.asarray(opponent_x, dtype=np.float64)
+        )
+        distance_change = np.asarray(last_distance, dtype=np.float64) - current_distance
+        distance = np.where(
+            distance_change > 0,
+            distance_change * self.distance_closer_reward_scale,
+            np.where(
+                distance_change < 0,
+                -(np.abs(distance_change) * self.distance_further_penalty_scale),
+                0.0,
+            ),
+        )
+
+        # 4. Idle penalty (if applicable)
+        idle = np.where(np.asarray(actions) == 0, self.idle_penalty, 0.0)
+
+        # calculate_reward와 같은 덧셈 순서
+        rewards = dealt_reward - taken_penalty
+        rewards += win_loss
+        rewards += distance
+        rewards += idle
+
+        if not return_components:
+            return rewards
+        components = {
+            "damage": dealt_reward - taken_penalty,
+            "win_loss": win_loss,
+            "distance": distance,
+            "idle": idle,
+        }
+        return rewards, components
+
     # Internal reward components (can be used for more granular control if needed)
     def _distance_reward(
         self, player_pos_x: float, opponent_pos_x: float, last_distance: float
@@ -0,0 +1,318 @@
+import logging
+import multiprocessing as mp
+import time
+from multiprocessing import resource_tracker
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type
+
+import gymnasium as gym
+import numpy as np
+from gymnasium import spaces
+from stable_baselines3.common.vec_env.base_vec_env import (CloudpickleWrapper,
+                                                           VecEnv,
+                                                           VecEnvIndices,
+                                                           VecEnvObs,
+                                                           VecEnvStepReturn)
+
+logger = logging.getLogger(__name__)
+
+# (name, shape, dtype) of each shared array
+Layout = List[Tuple[str, Tuple[int, ...], str]]
+
+
+def _make_layout(num_envs: int, observation_space: spaces.Box, action_space: spaces.Space) -> Layout:
+    return [
+        ("obs", (num_envs,) + observation_space.shape, np.dtype(observation_space.dtype).str),
+        ("terminal_obs", (num_envs,) + observation_space.shape, np.dtype(observation_space.dtype).str),
+        ("actions", (num_envs,) + action_space.shape, np.dtype(action_space.dtype).str),
+        ("rewards", (num_envs,), np.dtype(np.float32).str),
+        ("dones", (num_envs,), np.dtype(np.bool_).str),
+    ]
+
+
+def _layout_size(layout: Layout) -> int:
+    size = 0
+    for _, shape, dtype in layout:
+        size = (size + 7) & ~7  # 8-byte alignment
+        size += int(np.prod(shape)) * np.dtype(dtype).itemsize
+    return size
+
+
+def _views(buffer: memoryview, layout: Layout) -> Dict[str, np.ndarray]:
+    views = {}
+    offset = 0
+    for name, shape, dtype in layout:
+        offset = (offset + 7) & ~7
+        count = int(np.prod(shape))
+        views[name] = np.frombuffer(buffer, dtype=dtype, count=count, offset=offset).reshape(shape)
+        offset += count * np.dtype(dtype).itemsize
+    return views
+
+
+def _worker(remote: Connection, parent_remote: Connection, env_fn_wrapper: CloudpickleWrapper, index: int) -> None:
+    """
+    Owns one env. Observations, rewards and dones go into row `index` of the
+    shared buffers; the pipe only carries command names and (usually empty)
+    info dicts.
+    """
+    from stable_baselines3.common.env_util import is_wrapped
+
+    parent_remote.close()
+    env = env_fn_wrapper.var()
+    shm: Optional[SharedMemory] = None
+    views: Dict[str, np.ndarray] = {}
+    try:
+        while True:
+            try:
+                cmd, data = remote.recv()
+            except (EOFError, KeyboardInterrupt):
+                break
+            if cmd == "step":
+                observation, reward, terminated, truncated, info = env.step(views["actions"][index].copy())
+                done = terminated or truncated
+                info["TimeLimit.truncated"] = truncated and not terminated
+                if done:
+                    views["terminal_obs"][index] = observation
+                    observation, _ = env.reset()
+                views["obs"][index] = observation
+                views["rewards"][index] = reward
+                views["dones"][index] = done
+                remote.send(info)
+            elif cmd == "reset":
+                seed, options = data
+                observation, reset_info = env.reset(seed=seed, **({"options": options} if options else {}))
+                views["obs"][index] = observation
+                remote.send(reset_info)
+            elif cmd == "attach":
+                name, layout = data
+                shm = SharedMemory(name=name)
+                views = _views(shm.buf, layout)
+                remote.send(None)
+            elif cmd == "get_spaces":
+                remote.send((env.observation_space, env.action_space))
+            elif cmd == "env_method":
+                remote.send(env.get_wrapper_attr(data[0])(*data[1], **data[2]))
+            elif cmd == "get_attr":
+                remote.send(env.get_wrapper_attr(data))
+            elif cmd == "set_attr":
+                setattr(env, data[0], data[1])
+                remote.send(None)
+            elif cmd == "is_wrapped":
+                remote.send(is_wrapped(env, data))
+            elif cmd == "close":
+                break
+            else:
+                raise NotImplementedError(f"`{cmd}` is not implemented in the worker")
+    finally:
+        env.close()
+        views.clear()
+        if shm is not None:
+            shm.close()
+        remote.close()
+
+
+class WorkerCrashedError(RuntimeError):
+    pass
+
+
+class SharedMemoryVecEnv(VecEnv):
+    """
+    Runs each env (e.g. a transport-backed FightingEnv) in its own process.
+
+    Actions, observations, rewards, dones and terminal observations live in
+    one shared-memory block; the parent and workers only exchange short
+    command messages, so nothing observation-sized is pickled per step.
+
+    A worker that dies (noticed when sending it a command or waiting for the
+    reply) or does not answer within `step_timeout` seconds is restarted
+    with its original env factory. The step it failed on is
+    reported as a truncated episode end with `infos[i]["worker_restarted"]`.
+    """
+
+    def __init__(
+        self,
+        env_fns: Sequence[Callable[[], gym.Env]],
+        start_method: Optional[str] = None,
+        step_timeout: float = 30.0,
+        max_restarts: int = 10,
+    ):
+        if start_method is None:
+            start_method = "forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn"
+        self._ctx = mp.get_context(start_method)
+        self._env_fns = [CloudpickleWrapper(fn) for fn in env_fns]
+        self.step_timeout = step_timeout
+        self.max_restarts = max_restarts
+        self.restarts = 0
+        self.waiting = False
+        self._sent: List[bool] = []
+        self.closed = False
+
+        # Workers must share the parent's resource tracker. With "fork" a worker
+        # would otherwise start its own and unlink the block when it exits.
+        resource_tracker.ensure_running()
+
+        num_envs = len(env_fns)
+        self.remotes: List[Connection] = [None] * num_envs
+        self.processes: List[mp.Process] = [None] * num_envs
+        for i in range(num_envs):
+            self._start_worker(i)
+
+        self.remotes[0].send(("get_spaces", None))
+        observation_space, action_space = self.remotes[0].recv()
+        if not isinstance(observation_space, spaces.Box):
+            raise TypeError("SharedMemoryVecEnv supports Box observation spaces only.")
+
+        self._layout = _make_layout(num_envs, observation_space, action_space)
+        self._shm = SharedMemory(create=True, size=_layout_size(self._layout))
+        buffers = _views(self._shm.buf, self._layout)
+        self._obs = buffers["obs"]
+        self._terminal_obs = buffers["terminal_obs"]
+        self._actions = buffers["actions"]
+        self._rewards = buffers["rewards"]
+        self._dones = buffers["dones"]
+        self._last_obs = np.zeros_like(self._obs)
+        for i in range(num_envs):
+            self._attach(i)
+
+        super().__init__(num_envs, observation_space, action_space)
+
+    def _start_worker(self, index: int) -> None:
+        remote, work_remote = self._ctx.Pipe()
+        process = self._ctx.Process(
+            target=_worker, args=(work_remote, remote, self._env_fns[index], index), daemon=True
+        )
+        process.start()
+        work_remote.close()
+        self.remotes[index] = remote
+        self.processes[index] = process
+
+    def _attach(self, index: int) -> None:
+        self.remotes[index].send(("attach", (self._shm.name, self._layout)))
+        self._recv(index)
+
+    def _send(self, index: int, message: Tuple[str, Any]) -> bool:
+        """Send `message` to worker `index`; False if its pipe is broken (the worker died)."""
+        try:
+            self.remotes[index].send(message)
+        except OSError:  # BrokenPipeError, ConnectionResetError
+            return False
+        return True
+
+    def _recv(self, index: int, timeout: Optional[float] = None) -> Any:
+        remote = self.remotes[index]
+        try:
+            if not remote.poll(self.step_timeout if timeout is None else timeout):
+                raise WorkerCrashedError(f"Worker {index} did not respond in time.")
+            return remote.recv()
+        except (EOFError, ConnectionError, OSError) as exc:
+            raise WorkerCrashedError(f"Worker {index} died.") from exc
+
+    def _restart_worker(self, index: int) -> None:
+        self.restarts += 1
+        if self.restarts > self.max_restarts:
+            raise WorkerCrashedError(f"Exceeded {self.max_restarts} worker restarts.")
+        logger.warning("Restarting env worker %d (restart %d).", index, self.restarts)
+        process = self.processes[index]
+        if process.is_alive():
+            process.kill()
+        process.join(timeout=5)
+        self.remotes[index].close()
+
+        self._start_worker(index)
+        self._attach(index)
+        self.remotes[index].send(("reset", (self._seeds[index], self._options[index])))
+        self.reset_infos[index] = self._recv(index)
+
+    def reset(self) -> VecEnvObs:
+        sent = [self._send(i, ("reset", (self._seeds[i], self._options[i]))) for i in range(self.num_envs)]
+        for i in range(self.num_envs):
+            try:
+                if not sent[i]:
+                    raise WorkerCrashedError(f"Worker {i} died.")
+                self.reset_infos[i] = self._recv(i)
+            except WorkerCrashedError:
+                self._restart_worker(i)
+        self._reset_seeds()
+        self._reset_options()
+        self._last_obs[:] = self._obs
+        return self._obs.copy()
+
+    def step_async(self, actions: np.ndarray) -> None:
+        self._actions[:] = np.asarray(actions).reshape(self._actions.shape)
+        # A worker that died since the last step is restarted in step_wait
+        self._sent = [self._send(i, ("step", None)) for i in range(self.num_envs)]
+        self.waiting = True
+
+    def step_wait(self) -> VecEnvStepReturn:
+        infos: List[Dict[str, Any]] = [{} for _ in range(self.num_envs)]
+        deadline = time.monotonic() + self.step_timeout
+        for i in range(self.num_envs):
+            try:
+                if not self._sent[i]:
+                    raise WorkerCrashedError(f"Worker {i} died.")
+                infos[i] = self._recv(i, max(0.0, deadline - time.monotonic()))
+            except WorkerCrashedError:
+                self._restart_worker(i)
+                self._rewards[i] = 0.0
+                self._dones[i] = True
+                self._terminal_obs[i] = self._last_obs[i]
+                infos[i] = {"worker_restarted": True, "TimeLimit.truncated": True}
+        self.waiting = False
+
+        dones = self._dones.copy()
+        for i in np.flatnonzero(dones):
+            infos[i]["terminal_observation"] = self._terminal_obs[i].copy()
+        self._last_obs[:] = self._obs
+        return self._obs.copy(), self._rewards.copy(), dones, infos
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        if self.waiting:
+            for i in range(self.num_envs):
+                try:
+                    if self._sent[i]:
+                        self._recv(i)
+                except WorkerCrashedError:
+                    pass
+        for remote in self.remotes:
+            try:
+                remote.send(("close", None))
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.kill()
+        for remote in self.remotes:
+            remote.close()
+        self._obs = self._terminal_obs = self._actions = self._rewards = self._dones = None
+        self._shm.close()
+        self._shm.unlink()
+        self.closed = True
+
+    def _call(self, indices: VecEnvIndices, cmd: str, data: Any) -> List[Any]:
+        target = self._get_indices(indices)
+        for i in target:
+            self.remotes[i].send((cmd, data))
+        return [self._recv(i) for i in target]
+
+    def get_attr(self, attr_name: str, indices: VecEnvIndices = None) -> List[Any]:
+        return self._call(indices, "get_attr", attr_name)
+
+    def set_attr(self, attr_name: str, value: Any, indices: VecEnvIndices = None) -> None:
+        self._call(indices, "set_attr", (attr_name, value))
+
+    def env_method(
+        self, method_name: str, *method_args, indices: VecEnvIndices = None, **method_kwargs
+    ) -> List[Any]:
+        return self._call(indices, "env_method", (method_name, method_args, method_kwargs))
+
+    def env_is_wrapped(
+        self, wrapper_class: Type[gym.Wrapper], indices: VecEnvIndices = None
+    ) -> List[bool]:
+        return self._call(indices, "is_wrapped", wrapper_class)
+
+    def get_images(self) -> Sequence[Optional[np.ndarray]]:
+        return [None] * self.num_envs
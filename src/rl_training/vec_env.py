@@ -0,0 +1,323 @@
+import time
+from typing import Any, List, Mapping, Optional, Sequence, Type
+
+import gymnasium as gym
+import numpy as np
+from gymnasium import spaces
+from stable_baselines3.common.vec_env.base_vec_env import (VecEnv,
+                                                           VecEnvIndices,
+                                                           VecEnvObs,
+                                                           VecEnvStepReturn)
+
+from src.constants import FPS, NUM_ACTIONS
+from src.game_engine.batched import POOL_MODES, BatchedSimulation
+from src.rhythm_analyzer import BatchedRhythmAnalyzer
+from src.rl_training.observation import ObservationBuilder, ObservationSchema
+from src.rl_training.persona_rewards import MAX_FRAMES_PER_STEP, PersonaRewardKernel
+from src.rl_training.rewards import REWARD_COMPONENTS, RewardCalculator
+
+# RhythmAnalyzer window (actions) used for rhythm observation features, as in GameRunner
+RHYTHM_WINDOW = 50
+
+
+class FightingVecEnv(VecEnv):
+    """
+    A Stable-Baselines3 VecEnv that runs N matches in one `BatchedSimulation`.
+
+    Spaces match `FlattenActionSpaceWrapper(FightingEnv)`: an 8-float
+    observation and a MultiDiscrete([6, 6]) action (one policy drives both
+    players, rewards are from Player 1's side). Finished matches are reset
+    automatically; their last observation is returned in
+    `infos[i]["terminal_observation"]` and Monitor-style episode stats in
+    `infos[i]["episode"]`, so PolicyManager, EvalCallback and the rollout
+    logger work without extra wrappers. With `log_reward_components`, the
+    episode's summed reward components (damage, win_loss, distance, idle) are
+    added as `infos[i]["reward_components"]`.
+
+    With `personas` (e.g. `PERSONAS` from src.qa_evaluator.ai_personas) the
+    rewards of every persona are computed each step by one
+    `PersonaRewardKernel` call: `persona_rewards` holds the (N, P) values of
+    the last step and episode totals are reported in
+    `infos[i]["persona_returns"]`. `persona_assignment` (one persona name per
+    env) makes env i train on its persona's reward instead of the
+    RewardCalculator one, so one batch can train every persona at once.
+
+    `observation_schema` changes what the policy sees (rhythm features,
+    stacked history) through an `ObservationBuilder`; rewards, personas and
+    `player_won` still use the 8-float game observation.
+
+    With `action_repeat=k` each step holds the actions for k frames, which
+    the engine runs as k per-frame sub-steps inside one call
+    (`BatchedSimulation.step_repeat`; a single BATCH_ACTION for
+    MultiplexedVecEnv), so the physics match the 60 Hz game and a decision
+    costs one request at any k. The step returns the reward of the whole
+    k-frame transition, so damage and win/loss add up over the skipped
+    frames. The policy sees the last frame, or with `observation_pooling`
+    ("max" or "mean") the frames pooled over the sub-steps; rewards,
+    personas and `player_won` always use the last frame. Episode lengths
+    count decisions, not frames.
+    """
+
+    metadata = {"render_modes": []}
+
+    def __init__(
+        self,
+        num_envs: int,
+        reward_calculator: Optional[RewardCalculator] = None,
+        dt: float = 1.0 / FPS,
+        log_reward_components: bool = False,
+        personas: Optional[Mapping[str, Any]] = None,
+        persona_assignment: Optional[Sequence[str]] = None,
+        observation_schema: Optional[ObservationSchema] = None,
+        action_repeat: int = 1,
+        observation_pooling: Optional[str] = None,
+    ):
+        self.simulation = BatchedSimulation(num_envs)
+        self.dt = dt
+        self._setup(
+            num_envs,
+            reward_calculator,
+            log_reward_components,
+            personas,
+            persona_assignment,
+            observation_schema,
+            action_repeat,
+            observation_pooling,
+        )
+
+    def _setup(
+        self,
+        num_envs: int,
+        reward_calculator: Optional[RewardCalculator],
+        log_reward_components: bool = False,
+        personas: Optional[Mapping[str, Any]] = None,
+        persona_assignment: Optional[Sequence[str]] = None,
+        observation_schema: Optional[ObservationSchema] = None,
+        action_repeat: int = 1,
+        observation_pooling: Optional[str] = None,
+    ) -> None:
+        if action_repeat < 1:
+            raise ValueError("action_repeat must be at least 1.")
+        if observation_pooling is not None and observation_pooling not in POOL_MODES:
+            raise ValueError(f"observation_pooling must be one of {POOL_MODES} or None.")
+        self.action_repeat = action_repeat
+        self.observation_pooling = observation_pooling
+        self.render_mode = None
+        self.reward_calculator = reward_calculator or RewardCalculator()
+        self.log_reward_components = log_reward_components
+        self._episode_components = {name: np.zeros(num_envs, dtype=np.float64) for name in REWARD_COMPONENTS}
+
+        if personas is not None and action_repeat > MAX_FRAMES_PER_STEP:
+            raise ValueError(
+                f"Persona rewards need action_repeat <= {MAX_FRAMES_PER_STEP}; "
+                "longer steps can hide a whole attack."
+            )
+        self.persona_kernel = PersonaRewardKernel(personas, num_envs) if personas is not None else None
+        num_personas = len(self.persona_kernel.names) if self.persona_kernel else 0
+        self.persona_rewards = np.zeros((num_envs, num_personas), dtype=np.float64)
+        self._persona_returns = np.zeros((num_envs, num_personas), dtype=np.float64)
+        self.persona_assignment = None
+        if persona_assignment is not None:
+            if self.persona_kernel is None:
+                raise ValueError("persona_assignment requires personas.")
+            if len(persona_assignment) != num_envs:
+                raise ValueError(f"Expected {num_envs} persona names, got {len(persona_assignment)}.")
+            self.persona_assignment = np.array(
+                [self.persona_kernel.names.index(name) for name in persona_assignment]
+            )
+        self.observation_builder = None
+        self.rhythm_analyzer = None
+        if observation_schema is not None:
+            self.observation_builder = ObservationBuilder(observation_schema, num_envs)
+            if observation_schema.rhythm:
+                self.rhythm_analyzer = BatchedRhythmAnalyzer(num_envs * 2, RHYTHM_WINDOW, FPS)
+            observation_space = observation_schema.space()
+        else:
+            observation_space = spaces.Box(low=0.0, high=1.0, shape=(8,), dtype=np.float32)
+        super().__init__(num_envs, observation_space, spaces.MultiDiscrete([NUM_ACTIONS, NUM_ACTIONS]))
+
+        self._obs = np.zeros((num_envs, 8), dtype=np.float32)
+        self._prev_obs = np.zeros((num_envs, 8), dtype=np.float32)
+        self._pooled_obs = np.zeros((num_envs, 8), dtype=np.float32) if observation_pooling else None
+        self._actions = np.zeros((num_envs, 2), dtype=np.int64)
+        self._rewards = np.zeros(num_envs, dtype=np.float32)
+        self._episode_returns = np.zeros(num_envs, dtype=np.float64)
+        self._episode_lengths = np.zeros(num_envs, dtype=np.int64)
+        self._start_time = time.time()
+
+    def _reset_matches(self, mask: Optional[np.ndarray] = None) -> None:
+        """Reset the matches selected by `mask` (all if None) and refresh `self._obs`."""
+        self.simulation.reset(mask)
+        self.simulation.write_observations(self._obs)
+
+    def _step_matches(self) -> np.ndarray:
+        """
+        Advance every match with `self._actions`, refresh `self._obs` (and the
+        pooled observations), return round_over flags.
+        """
+        if self.action_repeat > 1 or self._pooled_obs is not None:
+            dones = self.simulation.step_repeat(
+                self._actions[:, 0],
+                self._actions[:, 1],
+                self.action_repeat,
+                self.dt,
+                pooled=self._pooled_obs,
+                pool=self.observation_pooling or "max",
+            ).copy()
+        else:
+            dones = self.simulation.step(self._actions[:, 0], self._actions[:, 1], self.dt).copy()
+        self.simulation.write_observations(self._obs)
+        return dones
+
+    def reset(self) -> VecEnvObs:
+        self._reset_matches()
+        self._episode_returns[:] = 0.0
+        self._episode_lengths[:] = 0
+        for values in self._episode_components.values():
+            values[:] = 0.0
+        self._persona_returns[:] = 0.0
+        if self.persona_kernel is not None:
+            self.persona_kernel.reset()
+        self._reset_seeds()
+        self._reset_options()
+        self._prev_obs[:] = self._obs
+        return self._reset_policy_obs().copy()
+
+    def _write_rhythm_features(self) -> None:
+        if self.rhythm_analyzer is not None:
+            self.rhythm_analyzer.get_feature_vectors(out=self.observation_builder.rhythm_input)
+
+    def _reset_policy_obs(self, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """Start the observation history of the envs in `mask` (all if None) from `self._obs`."""
+        if self._pooled_obs is not None:
+            # A fresh match has a single frame to pool
+            index = slice(None) if mask is None else mask
+            self._pooled_obs[index] = self._obs[index]
+        obs = self._game_obs_for_policy()
+        if self.observation_builder is None:
+            return obs
+        if self.rhythm_analyzer is not None:
+            self.rhythm_analyzer.reset(None if mask is None else np.repeat(mask, 2))
+        self._write_rhythm_features()
+        return self.observation_builder.reset(obs, mask=mask)
+
+    def _push_policy_obs(self) -> np.ndarray:
+        """Record this step's actions and append the game observation to the history."""
+        obs = self._game_obs_for_policy()
+        if self.observation_builder is None:
+            return obs
+        if self.rhythm_analyzer is not None:
+            # Frames since the episode start, like the game's frame counter
+            frames = self._episode_lengths * self.action_repeat
+            self.rhythm_analyzer.add_actions(self._actions, np.repeat(frames, 2))
+        self._write_rhythm_features()
+        return self.observation_builder.push(obs)
+
+    def _game_obs_for_policy(self) -> np.ndarray:
+        """The (N, 8) game observation the policy input is built from."""
+        return self._obs if self._pooled_obs is None else self._pooled_obs
+
+    def step_async(self, actions: np.ndarray) -> None:
+        self._actions[:] = np.asarray(actions).reshape(self.num_envs, 2)
+
+    def step_wait(self) -> VecEnvStepReturn:
+        dones = self._step_matches()
+        obs = self._obs
+        self._compute_rewards(obs, dones)
+        self._episode_returns += self._rewards
+        self._episode_lengths += 1
+        policy_obs = self._push_policy_obs()
+
+        infos: List[dict] = [{} for _ in range(self.num_envs)]
+        if dones.any():
+            done_idx = np.flatnonzero(dones)
+            elapsed = round(time.time() - self._start_time, 6)
+            for i in done_idx:
+                infos[i] = {
+                    "terminal_observation": policy_obs[i].copy(),
+                    "episode": {
+                        "r": float(self._episode_returns[i]),
+                        "l": int(self._episode_lengths[i]),
+                        "t": elapsed,
+                    },
+                    "player_won": bool(obs[i, 2] > obs[i, 6]),
+                    "TimeLimit.truncated": False,
+                }
+                if self.log_reward_components:
+                    infos[i]["reward_components"] = {
+                        name: float(values[i]) for name, values in self._episode_components.items()
+                    }
+                if self.persona_kernel is not None:
+                    infos[i]["persona_returns"] = dict(
+                        zip(self.persona_kernel.names, self._persona_returns[i].tolist())
+                    )
+            self._episode_returns[done_idx] = 0.0
+            self._episode_lengths[done_idx] = 0
+            for values in self._episode_components.values():
+                values[done_idx] = 0.0
+            self._persona_returns[done_idx] = 0.0
+            if self.persona_kernel is not None:
+                self.persona_kernel.reset(dones)
+            self._reset_matches(dones)
+            policy_obs = self._reset_policy_obs(dones)
+
+        self._prev_obs[:] = obs
+        return policy_obs.copy(), self._rewards.copy(), dones, infos
+
+    def _compute_rewards(self, obs: np.ndarray, dones: np.ndarray) -> None:
+        if self.persona_kernel is not None:
+            # Player 1's perspective, every persona at once
+            self.persona_rewards[:] = self.persona_kernel.compute(obs, self._prev_obs, dones, self.action_repeat)[:, 0]
+            self._persona_returns += self.persona_rewards
+            if self.persona_assignment is not None and not self.log_reward_components:
+                self._rewards[:] = self.persona_rewards[np.arange(self.num_envs), self.persona_assignment]
+                return
+
+        # Observation layout: [p1_x, p1_y, p1_hp, p1_state, p2_x, p2_y, p2_hp, p2_state]
+        cur = obs.astype(np.float64)
+        prev = self._prev_obs.astype(np.float64)
+        result = self.reward_calculator.calculate_rewards(
+            cur[:, 2],
+            cur[:, 6],
+            cur[:, 0],
+            cur[:, 4],
+            dones,
+            cur[:, 2] > cur[:, 6],
+            self._actions[:, 0],
+            prev[:, 2],
+            prev[:, 6],
+            np.abs(prev[:, 0] - prev[:, 4]),
+            return_components=self.log_reward_components,
+        )
+        if self.log_reward_components:
+            rewards, components = result
+            for name, values in components.items():
+                self._episode_components[name] += values
+        else:
+            rewards = result
+        if self.persona_assignment is not None:
+            rewards = self.persona_rewards[np.arange(self.num_envs), self.persona_assignment]
+        self._rewards[:] = rewards
+
+    def close(self) -> None:
+        pass
+
+    def get_attr(self, attr_name: str, indices: VecEnvIndices = None) -> List[Any]:
+        return [getattr(self, attr_name)] * len(self._get_indices(indices))
+
+    def set_attr(self, attr_name: str, value: Any, indices: VecEnvIndices = None) -> None:
+        setattr(self, attr_name, value)
+
+    def env_method(
+        self, method_name: str, *method_args, indices: VecEnvIndices = None, **method_kwargs
+    ) -> List[Any]:
+        method = getattr(self, method_name)
+        return [method(*method_args, **method_kwargs) for _ in self._get_indices(indices)]
+
+    def env_is_wrapped(
+        self, wrapper_class: Type[gym.Wrapper], indices: VecEnvIndices = None
+    ) -> List[bool]:
+        return [False] * len(self._get_indices(indices))
+
+    def get_images(self) -> Sequence[Optional[np.ndarray]]:
+        return [None] * self.num_envs
@@ -5,13 +5,13 @@ from src.simulation.network_simulator import NetworkSimulator
 from src.log_collector.log_collector import LogCollector
 from src.utils.event_types import * # Import all event types
 
-def run_mock_simulation(num_frames=20, persona_config=None): # Added persona_config
+def run_mock_simulation(num_frames=20, persona_config=None, log_dir=None): # Added persona_config
     print("--- Running Mock Simulation Arena ---")
     
     # Initialize HumanErrorLayer and NetworkSimulator
     human_error_layer = HumanErrorLayer()
     network_simulator = NetworkSimulator()
-    log_collector = LogCollector() # Initialize LogCollector
+    log_collector = LogCollector() if log_dir is None else LogCollector(log_dir=log_dir) # Initialize LogCollector
 
     session_id = log_collector.start_session() # Start a new logging session
 
@@ -0,0 +1,174 @@
+# src/utils/histogram.py
+"""
+Fixed-size latency histogram with HDR-style log-linear buckets.
+
+Values are recorded in seconds and stored as integer microseconds. Values
+below 32 µs get exact buckets; above that each power-of-two range is split
+into 16 linear sub-buckets, so any recorded value is reported within ~6%
+(one sub-bucket) of its true value. Memory is a few hundred counters no
+matter how many samples are recorded, and `record()` is a handful of
+integer operations, cheap enough for the per-step hot path.
+
+`StageTimings` groups one histogram per named stage of an operation (e.g.
+the enqueue / send / remote / receive / decode / reward stages of an env
+step) together with a timeout count.
+"""
+
+import copy
+import math
+import sys
+from typing import Dict, Iterable, List, Optional, TextIO
+
+_SUB_BUCKETS = 16
+_LINEAR_LIMIT = 2 * _SUB_BUCKETS  # values below this get one bucket each
+_SUB_BITS = _SUB_BUCKETS.bit_length()  # bits kept per magnitude (5 -> 16..31)
+
+
+def _bucket_index(micros: int) -> int:
+    if micros < _LINEAR_LIMIT:
+        return micros
+    shift = micros.bit_length() - _SUB_BITS
+    return _LINEAR_LIMIT + (shift - 1) * _SUB_BUCKETS + (micros >> shift) - _SUB_BUCKETS
+
+
+def _bucket_upper(index: int) -> int:
+    """Highest value (µs) that falls into bucket `index`."""
+    if index < _LINEAR_LIMIT:
+        return index
+    shift = (index - _LINEAR_LIMIT) // _SUB_BUCKETS + 1
+    base = _SUB_BUCKETS + (index - _LINEAR_LIMIT) % _SUB_BUCKETS
+    return ((base + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """
+    Records durations in seconds; values above `max_seconds` are clamped
+    into the last bucket (and still counted in `max`).
+    """
+
+    def __init__(self, max_seconds: float = 60.0):
+        self._max_micros = int(max_seconds * 1e6)
+        self._counts: List[int] = [0] * (_bucket_index(self._max_micros) + 1)
+        self._last = len(self._counts) - 1
+        self.reset()
+
+    def reset(self) -> None:
+        for i in range(len(self._counts)):
+            self._counts[i] = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        micros = int(seconds * 1e6)
+        if micros < 0:
+            micros = 0
+        index = _bucket_index(micros) if micros <= self._max_micros else self._last
+        self._counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        if len(other._counts) != len(self._counts):
+            raise ValueError("Cannot merge histograms with different ranges.")
+        for i, c in enumerate(other._counts):
+            self._counts[i] += c
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percent: float) -> float:
+        """Upper bound (seconds) of the bucket holding the given percentile."""
+        if not self.count:
+            return 0.0
+        target = max(1, math.ceil(self.count * percent / 100.0))
+        seen = 0
+        for index, c in enumerate(self._counts):
+            seen += c
+            if seen >= target:
+                if index == self._last:
+                    return self.max  # Clamped values: the bucket bound says nothing
+                return min(_bucket_upper(index) / 1e6, self.max)
+        return self.max
+
+    def summary(self, percentiles=(50, 90, 99, 99.9)) -> Dict[str, float]:
+        """Count, mean, min, max and percentiles in seconds, e.g. {"p99": ...}."""
+        result = {
+            "count": self.count,
+            "mean": self.mean,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+        }
+        for p in percentiles:
+            result[f"p{p:g}"] = self.percentile(p)
+        return result
+
+
+class StageTimings:
+    """
+    One `LatencyHistogram` per stage plus a count of timeouts, which are not
+    recorded in any histogram. Histograms are created on first access, and a
+    given stage should only be recorded from one thread.
+    """
+
+    def __init__(self, stages: Iterable[str] = ()):
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.timeouts = 0
+        for stage in stages:
+            self[stage]
+
+    def __getitem__(self, stage: str) -> LatencyHistogram:
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            histogram = self.histograms[stage] = LatencyHistogram()
+        return histogram
+
+    def record(self, stage: str, seconds: float) -> None:
+        self[stage].record(seconds)
+
+    def reset(self) -> None:
+        for histogram in self.histograms.values():
+            histogram.reset()
+        self.timeouts = 0
+
+    def pop(self) -> "StageTimings":
+        """Return a copy of the current timings and start over."""
+        snapshot = copy.deepcopy(self)
+        self.reset()
+        return snapshot
+
+    def merge(self, other: "StageTimings") -> None:
+        for stage, histogram in other.histograms.items():
+            self[stage].merge(histogram)
+        self.timeouts += other.timeouts
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {stage: histogram.summary() for stage, histogram in self.histograms.items()}
+
+    def format(self) -> List[str]:
+        lines = [f"{'stage':<10} {'count':>8} {'mean':>9} {'p50':>9} {'p99':>9} {'max':>9}  (ms)"]
+        for stage, histogram in self.histograms.items():
+            if not histogram.count:
+                continue
+            lines.append(
+                f"{stage:<10} {histogram.count:>8} {histogram.mean * 1e3:>9.3f} "
+                f"{histogram.percentile(50) * 1e3:>9.3f} {histogram.percentile(99) * 1e3:>9.3f} "
+                f"{histogram.max * 1e3:>9.3f}"
+            )
+        lines.append(f"timeouts: {self.timeouts}")
+        return lines
+
+    def dump(self, file: Optional[TextIO] = None) -> None:
+        file = file or sys.stderr
+        for line in self.format():
+            print(line, file=file)
@@ -0,0 +1,224 @@
+# src/utils/tracing.py
+"""
+Low-overhead tracing for the game engine hot path.
+
+Call sites guard every record with a category test against the shared
+`TRACER` so that a disabled tracer costs one attribute load and one bitwise
+AND per site, with no string formatting:
+
+    if TRACER.mask & TRACE_COMBAT:
+        TRACER.record(EV_DAMAGE, self.trace_id, damage, self.health)
+
+Enabled events are written into preallocated ring arrays (frame, event code,
+subject, two numeric arguments). Nothing is formatted until `format_events()`
+or `dump()` is called, either on demand or from the crash hook installed by
+`install_crash_dump()`.
+
+The shared tracer starts with the categories listed in the AI_ARENA_TRACE
+environment variable (e.g. ``AI_ARENA_TRACE=combat,input``), disabled if unset.
+"""
+
+import os
+import sys
+from array import array
+from typing import Callable, Dict, List, NamedTuple, Optional, TextIO, Tuple
+
+# Categories (bitmask)
+TRACE_PHYSICS = 1
+TRACE_COMBAT = 2
+TRACE_INPUT = 4
+TRACE_ALL = TRACE_PHYSICS | TRACE_COMBAT | TRACE_INPUT
+CATEGORY_NAMES: Dict[str, int] = {
+    "physics": TRACE_PHYSICS,
+    "combat": TRACE_COMBAT,
+    "input": TRACE_INPUT,
+    "all": TRACE_ALL,
+}
+
+# Event codes
+EV_FRAME = 0
+EV_MOVE = 1
+EV_JUMP = 2
+EV_LAND = 3
+EV_ATTACK_START = 4
+EV_ATTACK_END = 5
+EV_MOVE_START = 6
+EV_GUARD = 7
+EV_COLLISION = 8
+EV_DAMAGE = 9
+EV_GUARD_DAMAGE = 10
+EV_STUN_END = 11
+EV_KO = 12
+EV_ROUND_OVER = 13
+EV_ACTION = 14
+EV_MOTION = 15
+
+
+class EventSpec(NamedTuple):
+    category: int
+    name: str
+    args: Tuple[str, str]
+
+
+# EVENT_SPECS[code] -> category, name and labels for the two numeric arguments
+EVENT_SPECS: Tuple[EventSpec, ...] = (
+    EventSpec(TRACE_PHYSICS, "frame", ("dt", "")),
+    EventSpec(TRACE_PHYSICS, "move", ("direction", "vel_x")),
+    EventSpec(TRACE_PHYSICS, "jump", ("vel_y", "")),
+    EventSpec(TRACE_PHYSICS, "land", ("y", "")),
+    EventSpec(TRACE_COMBAT, "attack_start", ("duration", "")),
+    EventSpec(TRACE_COMBAT, "attack_end", ("move_id", "")),
+    EventSpec(TRACE_COMBAT, "move_start", ("move_id", "")),
+    EventSpec(TRACE_COMBAT, "guard", ("", "")),
+    EventSpec(TRACE_COMBAT, "collision", ("defender", "damage")),
+    EventSpec(TRACE_COMBAT, "damage", ("damage", "health")),
+    EventSpec(TRACE_COMBAT, "guard_damage", ("damage", "health")),
+    EventSpec(TRACE_COMBAT, "stun_end", ("", "")),
+    EventSpec(TRACE_COMBAT, "ko", ("", "")),
+    EventSpec(TRACE_COMBAT, "round_over", ("p1_health", "p2_health")),
+    EventSpec(TRACE_INPUT, "action", ("action", "")),
+    EventSpec(TRACE_INPUT, "motion", ("move_id", "")),
+)
+
+
+def subject_id(color: Tuple[int, int, int]) -> int:
+    """Pack an RGB color (how the engine identifies players) into a subject id."""
+    r, g, b = color
+    return (r << 16) | (g << 8) | b
+
+
+class TraceEvent(NamedTuple):
+    frame: int
+    code: int
+    subject: int
+    a: float
+    b: float
+
+    @property
+    def name(self) -> str:
+        return EVENT_SPECS[self.code].name
+
+    def format(self) -> str:
+        spec = EVENT_SPECS[self.code]
+        subject = (self.subject >> 16, (self.subject >> 8) & 0xFF, self.subject & 0xFF)
+        parts = [f"[{self.frame:>6}] {spec.name:<12} {subject}"]
+        for label, value in zip(spec.args, (self.a, self.b)):
+            if label:
+                parts.append(f"{label}={value:g}")
+        return " ".join(parts)
+
+
+class Tracer:
+    """
+    Fixed-capacity ring buffer of typed trace events.
+
+    Attributes:
+        mask (int): Enabled categories. 0 disables tracing entirely.
+        frame (int): Frame number stamped onto recorded events.
+        capacity (int): Number of events retained; older events are overwritten.
+        total (int): Number of events recorded since the last clear.
+    """
+
+    def __init__(self, capacity: int = 4096, mask: int = 0):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.mask = mask
+        self.frame = 0
+        self.capacity = capacity
+        self.total = 0
+        self._frames = array("q", bytes(8 * capacity))
+        self._codes = array("B", bytes(capacity))
+        self._subjects = array("I", bytes(array("I").itemsize * capacity))
+        self._a = array("d", bytes(8 * capacity))
+        self._b = array("d", bytes(8 * capacity))
+
+    def enable(self, categories: int = TRACE_ALL) -> None:
+        self.mask |= categories
+
+    def disable(self, categories: int = TRACE_ALL) -> None:
+        self.mask &= ~categories
+
+    def clear(self) -> None:
+        self.total = 0
+
+    def record(self, code: int, subject: int = 0, a: float = 0, b: float = 0) -> None:
+        """
+        Store one event. Callers are expected to have checked the category
+        against `mask` already; this only writes into the ring.
+        """
+        i = self.total % self.capacity
+        self._frames[i] = self.frame
+        self._codes[i] = code
+        self._subjects[i] = subject
+        self._a[i] = a
+        self._b[i] = b
+        self.total += 1
+
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+
+    def events(self, categories: int = TRACE_ALL, last: Optional[int] = None) -> List[TraceEvent]:
+        """Return retained events, oldest first, optionally filtered by category."""
+        count = len(self)
+        start = self.total - count
+        result = []
+        for n in range(start, self.total):
+            i = n % self.capacity
+            code = self._codes[i]
+            if EVENT_SPECS[code].category & categories:
+                result.append(
+                    TraceEvent(self._frames[i], code, self._subjects[i], self._a[i], self._b[i])
+                )
+        if last is not None:
+            result = result[-last:] if last > 0 else []
+        return result
+
+    def format_events(self, categories: int = TRACE_ALL, last: Optional[int] = None) -> List[str]:
+        return [event.format() for event in self.events(categories, last)]
+
+    def dump(
+        self, file: Optional[TextIO] = None, categories: int = TRACE_ALL, last: Optional[int] = None
+    ) -> None:
+        """Write the retained events as text (defaults to stderr)."""
+        file = file if file is not None else sys.stderr
+        dropped = self.total - len(self)
+        file.write(f"--- trace: {len(self)} events ({dropped} overwritten) ---\n")
+        for line in self.format_events(categories, last):
+            file.write(line + "\n")
+        file.flush()
+
+
+def parse_categories(spec: str) -> int:
+    """Parse a comma separated category list such as "combat,input" into a mask."""
+    mask = 0
+    for name in filter(None, (part.strip().lower() for part in spec.split(","))):
+        if name not in CATEGORY_NAMES:
+            raise ValueError(f"Unknown trace category: {name!r}")
+        mask |= CATEGORY_NAMES[name]
+    return mask
+
+
+# Shared tracer used by the engine.
+TRACER = Tracer(mask=parse_categories(os.environ.get("AI_ARENA_TRACE", "")))
+
+
+def install_crash_dump(tracer: Tracer = TRACER, file: Optional[TextIO] = None) -> Callable[[], None]:
+    """
+    Dump the trace ring when an uncaught exception reaches `sys.excepthook`.
+
+    Returns:
+        Callable[[], None]: Restores the previous hook.
+    """
+    previous = sys.excepthook
+
+    def hook(exc_type, exc, tb):
+        if tracer.total:
+            tracer.dump(file)
+        previous(exc_type, exc, tb)
+
+    sys.excepthook = hook
+
+    def uninstall() -> None:
+        sys.excepthook = previous
+
+    return uninstall
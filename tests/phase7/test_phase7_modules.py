@@ -169,10 +169,11 @@ def test_mock_rl_trainer_conceptual():
     assert "models/beginner_ai_model.zip" in model_path
 
 # Test MockMultiPersonaAnalyzer (conceptual)
-def test_mock_multi_persona_analyzer_conceptual(clean_db_manager):
-    analyzer = MockMultiPersonaAnalyzer(clean_db_manager)
+def test_mock_multi_persona_analyzer_conceptual(clean_db_manager, tmp_path):
+    analyzer = MockMultiPersonaAnalyzer(clean_db_manager, log_dir=str(tmp_path))
     results = analyzer.analyze_personas(["Beginner AI", "Pro-gamer AI"], num_simulations_per_pair=1)
     assert "Beginner AI_vs_Pro-gamer AI" in results
+    assert list(tmp_path.glob("replay_*.bin"))
 
 # Test MockRLHFInterface (conceptual)
 def test_mock_rlhf_interface_conceptual(clean_db_manager):
@@ -0,0 +1,198 @@
+import numpy as np
+import pytest
+
+from src.constants import (ACTION_ATTACK, ACTION_IDLE, ACTION_JUMP,
+                           ACTION_MOVE_LEFT, ACTION_MOVE_RIGHT, FPS, INITIAL_HEALTH, NUM_ACTIONS,
+                           PLAYER_WIDTH, PUNCH_DAMAGE)
+from src.game_engine.batched import BatchedSimulation
+from src.game_engine.simulation import Simulation
+from src.game_engine.states import PlayerState
+
+
+def _assert_matches(batch: BatchedSimulation, sims, frame: int) -> None:
+    for i, sim in enumerate(sims):
+        assert batch.round_over[i] == sim.round_over, f"match {i} frame {frame}"
+        assert batch.round_timer[i] == sim.round_timer
+        for j, player in enumerate((sim.player1, sim.player2)):
+            where = f"match {i} player {j + 1} frame {frame}"
+            assert batch.rect_x[i, j] == player.rect.x, where
+            assert batch.rect_y[i, j] == player.rect.y, where
+            assert batch.pos_x[i, j] == player._pos_x, where
+            assert batch.pos_y[i, j] == player._pos_y, where
+            assert batch.vel_x[i, j] == player.vel_x, where
+            assert batch.vel_y[i, j] == player.vel_y, where
+            assert batch.health[i, j] == player.health, where
+            assert batch.state[i, j] == player.state, where
+            assert batch.facing[i, j] == player.facing, where
+            assert batch.is_jumping[i, j] == player.is_jumping, where
+            assert batch.is_attacking[i, j] == player.is_attacking, where
+            assert batch.is_guarding[i, j] == player.is_guarding, where
+            assert batch.hitbox_active[i, j] == player.attack_hitbox.active, where
+            assert batch.attack_timer[i, j] == player.attack_timer, where
+            assert batch.punch_cooldown_timer[i, j] == player.punch_cooldown_timer, where
+            assert batch.hit_stun_timer[i, j] == player.hit_stun_timer, where
+            if player.is_attacking:
+                assert batch.hitbox_x[i, j] == player.attack_hitbox.rect.x, where
+                assert batch.hitbox_y[i, j] == player.attack_hitbox.rect.y, where
+
+
+def _aggressive_actions(rng: np.random.Generator, batch: BatchedSimulation) -> np.ndarray:
+    """Random actions biased towards closing distance so that hits actually happen."""
+    actions = rng.integers(0, NUM_ACTIONS, size=(batch.num_matches, 2))
+    towards = np.where(
+        batch.rect_x[:, ::-1] > batch.rect_x, ACTION_MOVE_RIGHT, ACTION_MOVE_LEFT
+    )
+    chase = rng.random(size=actions.shape) < 0.5
+    actions[chase] = towards[chase]
+    return actions
+
+
+class TestBatchedSimulation:
+    def test_initial_state_matches_scalar(self):
+        batch = BatchedSimulation(3)
+        _assert_matches(batch, [Simulation() for _ in range(3)], frame=0)
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError):
+            BatchedSimulation(0)
+
+    def test_cross_check_against_scalar_engine(self):
+        num_matches = 8
+        rng = np.random.default_rng(1234)
+        batch = BatchedSimulation(num_matches)
+        sims = [Simulation() for _ in range(num_matches)]
+
+        for frame in range(1, 1201):
+            actions = _aggressive_actions(rng, batch)
+            batch.step(actions[:, 0], actions[:, 1])
+            for i, sim in enumerate(sims):
+                sim.step(int(actions[i, 0]), int(actions[i, 1]))
+            _assert_matches(batch, sims, frame)
+
+        # The biased policy must have exercised the combat paths
+        assert (batch.health < INITIAL_HEALTH).any()
+        assert (batch.state == PlayerState.KO).any()
+
+    def test_attack_hits_in_range(self):
+        batch = BatchedSimulation(2)
+        batch.pos_x[:, 1] = batch.pos_x[:, 0] + 60
+        batch.rect_x[:, 1] = batch.pos_x[:, 1].astype(np.int64)
+        batch.step(np.array([ACTION_ATTACK, 0]), np.array([0, 0]))
+        assert batch.health[0, 1] == INITIAL_HEALTH - PUNCH_DAMAGE
+        assert batch.health[1, 1] == INITIAL_HEALTH
+
+    def test_masked_reset(self):
+        batch = BatchedSimulation(2)
+        for _ in range(10):
+            batch.step(np.full(2, ACTION_MOVE_RIGHT), np.full(2, ACTION_MOVE_LEFT))
+        batch.reset(np.array([True, False]))
+        assert batch.frame_count.tolist() == [0, 10]
+        assert batch.rect_x[0, 0] == 100
+        assert batch.rect_x[1, 0] > 100
+
+    def test_step_repeat_matches_repeated_steps(self):
+        rng = np.random.default_rng(7)
+        repeated, stepped = BatchedSimulation(6), BatchedSimulation(6)
+        for _ in range(40):
+            actions = _aggressive_actions(rng, stepped)
+            for _ in range(4):
+                stepped.step(actions[:, 0], actions[:, 1])
+            repeated.step_repeat(actions[:, 0], actions[:, 1], 4)
+            assert not stepped.round_over.any()
+            for name in ("pos_x", "pos_y", "health", "state", "attack_timer", "frame_count"):
+                assert np.array_equal(getattr(repeated, name), getattr(stepped, name)), name
+
+    def test_step_repeat_jump_follows_frame_physics(self):
+        batch = BatchedSimulation(1)
+        ground = batch.pos_y[0, 0]
+        batch.step_repeat(np.array([ACTION_JUMP]), np.array([ACTION_IDLE]), 30)
+        assert batch.pos_y[0, 0] < ground - 50
+
+    def test_step_repeat_pools_observations(self):
+        batch, stepped = BatchedSimulation(2), BatchedSimulation(2)
+        actions = np.array([[ACTION_JUMP, ACTION_MOVE_LEFT], [ACTION_MOVE_RIGHT, ACTION_IDLE]])
+        frames = []
+        for _ in range(40):
+            stepped.step(actions[:, 0], actions[:, 1])
+            frames.append(stepped.write_observations())
+        frames = np.stack(frames)
+
+        pooled = np.empty((2, 8), dtype=np.float32)
+        batch.step_repeat(actions[:, 0], actions[:, 1], 40, pooled=pooled)
+        assert np.array_equal(pooled, frames.max(axis=0))
+        # The jump peaks inside the decision, above where it ends
+        assert pooled[0, 1] > batch.write_observations()[0, 1]
+
+        batch.reset()
+        batch.step_repeat(actions[:, 0], actions[:, 1], 40, pooled=pooled, pool="mean")
+        assert np.allclose(pooled, frames.mean(axis=0))
+
+        # Matches that are already over report their current observation
+        batch.round_over[0] = True
+        batch.step_repeat(actions[:, 0], actions[:, 1], 40, pooled=pooled)
+        assert np.array_equal(pooled[0], batch.write_observations()[0])
+        with pytest.raises(ValueError):
+            batch.step_repeat(actions[:, 0], actions[:, 1], 40, pooled=pooled, pool="min")
+
+    def test_step_repeat_stops_finished_matches(self):
+        batch = BatchedSimulation(2)
+        batch.pos_x[:, 1] = batch.pos_x[:, 0] + 60
+        batch.rect_x[:, 1] = batch.pos_x[:, 1].astype(np.int64)
+        batch.health[0, 1] = 1
+        moves = np.full(2, ACTION_MOVE_LEFT)
+
+        # Match 0 ends on the first frame and sits out the rest
+        round_over = batch.step_repeat(np.array([ACTION_ATTACK, ACTION_ATTACK]), moves, 10)
+        assert round_over.tolist() == [True, False]
+        assert batch.frame_count.tolist() == [1, 10]
+        assert batch.health[0, 1] == 0
+        x_after_ko = batch.rect_x[0].copy()
+
+        batch.step_repeat(np.zeros(2, dtype=np.int64), moves, 5)
+        assert batch.frame_count.tolist() == [1, 15]
+        assert np.array_equal(batch.rect_x[0], x_after_ko)
+
+    def test_step_repeat_coarse_substeps_are_swept(self, monkeypatch):
+        batch = BatchedSimulation(2)
+        batch.pos_x[:] = [100, 290]
+        batch.rect_x[:] = [100, 290]
+        calls = []
+        update = batch.update
+        monkeypatch.setattr(batch, "update", lambda *args: calls.append(args) or update(*args))
+
+        # P2 runs through P1's punch inside one 60-frame update; the swept check still lands it
+        batch.step_repeat(np.full(2, ACTION_ATTACK), np.full(2, ACTION_MOVE_LEFT), 60, substeps=1)
+        assert len(calls) == 1
+        assert batch.frame_count.tolist() == [60, 60]
+        assert batch.health[:, 1].tolist() == [INITIAL_HEALTH - PUNCH_DAMAGE] * 2
+
+        # Substeps split the frames, longest first
+        calls.clear()
+        batch.step_repeat(np.zeros(2, dtype=np.int64), np.zeros(2, dtype=np.int64), 8, substeps=3)
+        assert [frames for _, _, frames in calls] == [3, 3, 2]
+        assert batch.frame_count.tolist() == [68, 68]
+
+    def test_swept_hit_at_large_dt(self):
+        # P2 runs through P1's punch within one coarse update: no overlap at either end
+        batch = BatchedSimulation(1)
+        batch.pos_x[0] = [100, 290]
+        batch.rect_x[0] = [100, 290]
+        dt = 1.0
+        batch.step(np.array([ACTION_ATTACK]), np.array([ACTION_MOVE_LEFT]), dt)
+        # P1's hitbox starts at its right edge: P2 started beyond it and ended behind it
+        assert batch.rect_x[0, 1] + PLAYER_WIDTH <= batch.rect_x[0, 0] + PLAYER_WIDTH
+        assert batch.health[0, 1] == INITIAL_HEALTH - PUNCH_DAMAGE
+
+        # Frame-sized updates are not swept and keep matching the scalar engine
+        batch = BatchedSimulation(1)
+        batch.pos_x[0] = [100, 290]
+        batch.rect_x[0] = [100, 290]
+        batch.step(np.array([ACTION_ATTACK]), np.array([ACTION_MOVE_LEFT]), 1.0 / FPS)
+        assert batch.health[0, 1] == INITIAL_HEALTH
+
+    def test_swept_miss_at_large_dt(self):
+        batch = BatchedSimulation(1)
+        batch.pos_x[0] = [100, 600]
+        batch.rect_x[0] = [100, 600]
+        batch.step(np.array([ACTION_ATTACK]), np.array([ACTION_IDLE]), 0.5)
+        assert batch.health[0, 1] == INITIAL_HEALTH
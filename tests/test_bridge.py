@@ -0,0 +1,143 @@
+import asyncio
+import queue
+import threading
+import time
+
+import pytest
+
+import src.fighting_env
+import src.rl_training.environment
+from src.networking.bridge import AsyncBridgeQueue
+from src.networking.webrtc import WebRTCClient
+
+
+class FakeChannel:
+    readyState = "open"
+
+    def __init__(self):
+        self.sent = []
+        self.event = threading.Event()
+
+    def send(self, data):
+        self.sent.append(data)
+        self.event.set()
+
+
+class OfflineWebRTCClient(WebRTCClient):
+    """Runs the real event loop and sender, with a fake channel instead of signaling."""
+
+    async def connect(self):
+        self.data_channel = FakeChannel()
+        self._start_sender()
+
+
+def _wait_until(predicate, timeout=1.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.001)
+    return True
+
+
+def _settle(loop):
+    """Return once the callbacks and tasks scheduled on `loop` so far have run a step."""
+    asyncio.run_coroutine_threadsafe(asyncio.sleep(0), loop).result(timeout=1)
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield loop
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=5)
+    # Leave no pending tasks behind ("Task was destroyed but it is pending!")
+    pending = asyncio.all_tasks(loop)
+    for task in pending:
+        task.cancel()
+    if pending:
+        loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+    loop.close()
+
+
+class TestAsyncBridgeQueue:
+    def test_put_wakes_waiting_consumer(self, loop):
+        bridge = AsyncBridgeQueue()
+        loop.call_soon_threadsafe(bridge.attach, loop)
+        future = asyncio.run_coroutine_threadsafe(bridge.get_async(), loop)
+        _settle(loop)
+        assert not future.done()
+        before = time.perf_counter()
+        bridge.put("action")
+        item, enqueued_at = future.result(timeout=1)
+        assert item == "action"
+        assert before <= enqueued_at <= time.perf_counter()
+
+    def test_bounded_put_blocks(self):
+        bridge = AsyncBridgeQueue(maxsize=2)
+        bridge.put(1)
+        bridge.put(2)
+        with pytest.raises(queue.Full):
+            bridge.put(3, timeout=0.01)
+        assert bridge.get_nowait_stamped()[0] == 1
+        bridge.put(3, timeout=0.01)
+        assert [bridge.get_nowait() for _ in range(2)] == [2, 3]
+
+
+class TestWebRTCClientSender:
+    def test_sends_without_polling_delay(self, loop):
+        client = WebRTCClient(AsyncBridgeQueue(), queue.Queue(), binary=True)
+        client.loop = loop
+        client.data_channel = FakeChannel()
+        loop.call_soon_threadsafe(client.action_queue.attach, loop)
+        loop.call_soon_threadsafe(client._start_sender)
+        _settle(loop)
+
+        for step in range(20):
+            client.data_channel.event.clear()
+            client.action_queue.put({"type": "action", "p1Action": step % 6, "p2Action": 0})
+            assert client.data_channel.event.wait(timeout=1)
+        assert len(client.data_channel.sent) == 20
+        assert client.send_latency.count == 20
+        assert client.send_latency.percentile(50) < 0.005  # Well under the old 10 ms poll
+
+        # The sender is parked in get_async(); close() must cancel it and stop the loop
+        sender = client._sender_task
+        client.close()
+        assert sender.cancelled()
+        assert client._sender_task is None
+
+    def test_channel_close_cancels_waiting_sender(self, loop):
+        client = WebRTCClient(AsyncBridgeQueue(), queue.Queue(), binary=True)
+        client.loop = loop
+        client.data_channel = FakeChannel()
+        loop.call_soon_threadsafe(client.action_queue.attach, loop)
+        loop.call_soon_threadsafe(client._start_sender)
+        _settle(loop)
+        sender = client._sender_task
+        assert not sender.done()
+
+        client.data_channel.readyState = "closed"
+        loop.call_soon_threadsafe(client._on_channel_close)
+        assert _wait_until(sender.cancelled)
+        assert client._sender_task is None
+
+
+class TestFightingEnvClose:
+    @pytest.mark.parametrize("module", [src.fighting_env, src.rl_training.environment])
+    def test_close_stops_webrtc_client(self, module, monkeypatch):
+        monkeypatch.setattr(module, "WebRTCClient", OfflineWebRTCClient)
+        env = module.FightingEnv(backend_peer_id="test")
+        client = env.game_client
+        assert _wait_until(lambda: client._sender_task is not None)
+        sender = client._sender_task
+
+        start = time.monotonic()
+        env.close()
+        # The loop stops right away instead of the thread join timing out
+        assert time.monotonic() - start < 1.0
+        assert not env.game_client_thread.is_alive()
+        assert sender.cancelled()
+        assert client.loop.is_closed()
@@ -0,0 +1,100 @@
+import pytest
+
+from backend.data.game_data import MOVES_DATA
+from src.constants import ACTION_IDLE, INITIAL_HEALTH, PUNCH_DAMAGE
+from src.game_engine.frame_data import (DEFAULT_HITBOX, PHASE_ACTIVE,
+                                        PHASE_RECOVERY, PHASE_STARTUP,
+                                        compile_move, compile_roster,
+                                        load_roster, parse_frame_data)
+from src.game_engine.simulation import Simulation
+from src.game_engine.states import PlayerState
+from tests.test_simulation import _close_distance
+
+
+class TestFrameDataCompiler:
+    def test_parse_frame_data(self):
+        assert parse_frame_data("Startup: 10f, Active: 5f, Recovery: 15f") == (10, 5, 15)
+        with pytest.raises(ValueError):
+            parse_frame_data("10 frames")
+        with pytest.raises(ValueError):
+            parse_frame_data("Startup: 1f, Active: 0f, Recovery: 1f")
+
+    def test_compile_move_tables(self):
+        frames, damage = compile_move(
+            {"name": "Test", "frameData": "Startup: 2f, Active: 3f, Recovery: 1f", "damage": 12}
+        )
+        assert [f.phase for f in frames] == [PHASE_STARTUP] * 2 + [PHASE_ACTIVE] * 3 + [PHASE_RECOVERY]
+        assert [f.cancelable for f in frames] == [False, False, True, True, True, False]
+        assert frames[2].hitbox_width == DEFAULT_HITBOX[2]
+        assert frames[0].hitbox_width == 0
+        assert damage == 12
+
+    def test_compile_roster(self):
+        roster = compile_roster(MOVES_DATA)
+        assert set(roster) == set(MOVES_DATA)
+        ryu = roster[1]
+        assert ryu.names[0] == "Hadoken"
+        assert ryu.lengths[ryu.index("Shoryuken")] == 3 + 8 + 20
+        assert load_roster() is load_roster()
+
+
+class TestMoves:
+    @pytest.fixture
+    def simulation(self):
+        sim = Simulation(characters=(1, None))
+        _close_distance(sim)
+        return sim
+
+    def test_startup_active_recovery(self, simulation):
+        player1, player2 = simulation.player1, simulation.player2
+        hadoken = player1.move_table.index("Hadoken")
+        assert player1.perform_move(hadoken)
+
+        for _ in range(10):  # Startup: 10f
+            simulation.step(ACTION_IDLE, ACTION_IDLE)
+            assert player1.is_attacking and not player1.attack_hitbox.active
+        assert player2.health == INITIAL_HEALTH
+
+        simulation.step(ACTION_IDLE, ACTION_IDLE)  # First active frame connects
+        assert player2.health == INITIAL_HEALTH - PUNCH_DAMAGE
+        for _ in range(4):  # The rest of the active frames must not hit again
+            simulation.step(ACTION_IDLE, ACTION_IDLE)
+        assert player1.move_connected
+        assert player2.health == INITIAL_HEALTH - PUNCH_DAMAGE
+
+        for _ in range(15):  # Recovery: 15f
+            simulation.step(ACTION_IDLE, ACTION_IDLE)
+            assert player1.is_attacking
+        simulation.step(ACTION_IDLE, ACTION_IDLE)
+        assert not player1.is_attacking
+        assert player1.move_id == -1
+        assert player1.state == PlayerState.IDLE
+
+    def test_cancel_window(self, simulation):
+        player1 = simulation.player1
+        assert player1.perform_move(0)
+        simulation.step(ACTION_IDLE, ACTION_IDLE)
+        assert not player1.perform_move(1)  # Startup is not cancelable
+        for _ in range(10):
+            simulation.step(ACTION_IDLE, ACTION_IDLE)
+        assert player1.perform_move(1)  # Active frames are
+        assert player1.move_id == 1
+
+    def test_player_without_table(self, simulation):
+        with pytest.raises(ValueError):
+            simulation.player2.perform_move(0)
+
+    def test_snapshot_during_move(self):
+        sim = Simulation(deterministic=True, characters=(1, 2))
+        _close_distance(sim)
+        sim.player1.perform_move(1)
+        sim.step(ACTION_IDLE, ACTION_IDLE)
+        snapshot = sim.save_state()
+        for _ in range(20):
+            sim.step(ACTION_IDLE, ACTION_IDLE)
+        expected = sim.save_state()
+
+        sim.load_state(snapshot)
+        for _ in range(20):
+            sim.step(ACTION_IDLE, ACTION_IDLE)
+        assert sim.save_state() == expected
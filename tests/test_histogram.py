@@ -0,0 +1,39 @@
+import random
+
+import pytest
+
+from src.utils.histogram import LatencyHistogram
+
+
+class TestLatencyHistogram:
+    def test_percentiles_within_bucket_precision(self):
+        rng = random.Random(0)
+        samples = sorted(rng.expovariate(1000.0) for _ in range(20000))
+        histogram = LatencyHistogram()
+        for value in samples:
+            histogram.record(value)
+        assert histogram.count == len(samples)
+        assert histogram.mean == pytest.approx(sum(samples) / len(samples))
+        for p in (50, 90, 99):
+            exact = samples[int(len(samples) * p / 100) - 1]
+            assert histogram.percentile(p) == pytest.approx(exact, rel=0.07, abs=2e-6)
+
+    def test_small_values_are_exact(self):
+        histogram = LatencyHistogram()
+        for micros in (3, 3, 7, 20):
+            histogram.record(micros / 1e6)
+        assert histogram.percentile(50) == pytest.approx(3e-6)
+        assert histogram.percentile(100) == pytest.approx(20e-6)
+
+    def test_clamps_large_values_and_merges(self):
+        first, second = LatencyHistogram(max_seconds=1.0), LatencyHistogram(max_seconds=1.0)
+        first.record(0.001)
+        second.record(5.0)
+        first.merge(second)
+        assert first.count == 2
+        assert first.max == 5.0
+        assert first.percentile(100) == 5.0
+        summary = first.summary()
+        assert summary["count"] == 2 and "p99.9" in summary
+        with pytest.raises(ValueError):
+            first.merge(LatencyHistogram(max_seconds=60.0))
@@ -0,0 +1,132 @@
+import numpy as np
+import pytest
+import torch
+from stable_baselines3 import PPO
+
+from src.constants import ACTION_ATTACK, ACTION_IDLE
+from src.rl_training.callbacks import LeagueCallback
+from src.rl_training.league import (LeagueVecEnv, OpponentPool,
+                                    mirror_observations)
+from src.rl_training.observation import ObservationSchema
+from src.rl_training.vec_env import FightingVecEnv
+
+
+def _league_env(pool, num_envs=4, **kwargs):
+    return LeagueVecEnv(FightingVecEnv(num_envs), pool, seed=0, **kwargs)
+
+
+def _model(env, seed=0):
+    return PPO("MlpPolicy", env, n_steps=32, batch_size=32, n_epochs=1, seed=seed)
+
+
+def _perturbed(policy, value):
+    with torch.no_grad():
+        for param in policy.parameters():
+            param.fill_(value)
+    return policy
+
+
+class TestMirror:
+    def test_start_position_is_symmetric(self):
+        obs = FightingVecEnv(1).reset()
+        assert np.allclose(mirror_observations(obs), obs)
+
+    def test_swaps_players(self):
+        obs = np.array([[0.1, 0.2, 0.3, 0.4, 0.9, 0.6, 0.7, 0.8]], dtype=np.float32)
+        assert np.allclose(mirror_observations(obs), [[0.1, 0.6, 0.7, 0.8, 0.9, 0.2, 0.3, 0.4]])
+
+
+class TestOpponentPool:
+    def test_priority_prefers_hard_opponents(self):
+        pool = OpponentPool()
+        policy = _model(_league_env(OpponentPool())).policy
+        for name in ("easy", "hard"):
+            pool.add_policy(name, policy)
+        for _ in range(20):
+            pool.record("easy", 1.0)
+            pool.record("hard", 0.0)
+        easy, hard = pool.probabilities()
+        assert hard > 10 * easy
+        samples = pool.sample(np.random.default_rng(0), 200)
+        assert samples.count("hard") > 150
+        assert pool.stats("easy").win_rate > 0.9
+
+        uniform = OpponentPool(priority_exponent=0.0)
+        uniform.add_policy("a", policy)
+        uniform.add_policy("b", policy)
+        uniform.record("a", 1.0)
+        assert np.allclose(uniform.probabilities(), 0.5)
+
+    def test_lru_cache_reuses_modules(self):
+        policy = _model(_league_env(OpponentPool())).policy
+        pool = OpponentPool(cache_size=2)
+        for i in range(3):
+            pool.add_policy(f"v{i}", _perturbed(policy, float(i)))
+
+        for name in ("v0", "v1", "v2", "v0", "v2", "v1"):
+            module = pool.policy(name)
+            expected = float(name[1])
+            assert all(torch.all(p == expected) for p in module.parameters())
+        assert pool.modules_built == 2
+        assert (pool.cache_hits, pool.cache_misses) == (1, 5)
+        # Snapshots are copies: training the learner does not change them
+        _perturbed(policy, 9.0)
+        assert all(torch.all(p == 1.0) for p in pool.policy("v1").parameters())
+
+    def test_max_size_retires_oldest(self):
+        policy = _model(_league_env(OpponentPool())).policy
+        pool = OpponentPool(max_size=2)
+        for name in ("a", "b", "c"):
+            pool.add_policy(name, policy)
+        assert pool.names == ["b", "c"]
+
+    def test_empty_pool(self):
+        with pytest.raises(RuntimeError):
+            _league_env(OpponentPool()).reset()
+
+
+class TestLeagueVecEnv:
+    def test_opponent_drives_player_two(self):
+        learner_env = _league_env(OpponentPool())
+        pool = OpponentPool()
+        pool.add_policy("initial", _model(learner_env).policy)
+        env = _league_env(pool, num_envs=3, deterministic=True)
+        assert env.action_space.n == 6
+
+        obs = env.reset()
+        assert env.opponents == ["initial"] * 3
+        env.step(np.full(3, ACTION_ATTACK))
+        opponent_actions, _ = pool.policy("initial").predict(mirror_observations(obs), deterministic=True)
+        assert np.array_equal(env._actions[:, 0], [ACTION_ATTACK] * 3)
+        assert env._actions[0, 1] == [0, 2, 1, 3, 4, 5][opponent_actions[0]]
+        # One forward pass per distinct opponent per step, all from the cache
+        assert pool.cache_misses == 1 and pool.modules_built == 1
+
+    def test_records_results(self):
+        pool = OpponentPool()
+        pool.add_policy("initial", _model(_league_env(OpponentPool())).policy)
+        env = _league_env(pool, num_envs=2)
+        env.reset()
+        sim = env.venv.simulation
+        sim.rect_x[0] = [300, 300 + 55]
+        sim.pos_x[0] = sim.rect_x[0]
+        sim.health[0, 1] = 1
+        sim.hit_stun_timer[0, 1] = 1.0  # Opponent cannot act this frame
+        _, _, dones, infos = env.step(np.array([ACTION_ATTACK, ACTION_IDLE]))
+        assert dones.tolist() == [True, False]
+        assert infos[0]["opponent"] == "initial"
+        assert pool.stats("initial").games == 1 and pool.stats("initial").wins == 1.0
+
+    def test_requires_default_observation(self):
+        venv = FightingVecEnv(1, observation_schema=ObservationSchema(history=2))
+        with pytest.raises(ValueError):
+            LeagueVecEnv(venv, OpponentPool())
+
+    def test_trains_with_snapshots(self):
+        pool = OpponentPool(cache_size=2)
+        env = _league_env(pool, num_envs=4)
+        model = _model(env)
+        pool.add_policy("initial", model.policy)
+        model.learn(total_timesteps=512, callback=LeagueCallback(pool, snapshot_freq=128))
+        assert len(pool) >= 4
+        assert pool.modules_built <= 2
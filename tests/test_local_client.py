@@ -0,0 +1,90 @@
+import threading
+
+import numpy as np
+import pytest
+
+from src.constants import (ACTION_ATTACK, ACTION_IDLE, ACTION_JUMP,
+                           INITIAL_HEALTH, PUNCH_DAMAGE)
+from src.fighting_env import FightingEnv
+from src.game_engine.interfaces import OBSERVATION_SIZE, write_observation
+from src.game_engine.simulation import Simulation
+from src.game_engine.states import PlayerState, encode_state
+from src.networking.local_client import LocalGameClient
+from tests.test_simulation import _close_distance
+
+
+@pytest.fixture
+def env():
+    env = FightingEnv(backend_peer_id="test", in_process=True)
+    yield env
+    env.close()
+
+
+class TestWriteObservation:
+    def test_initial_observation(self):
+        sim = Simulation()
+        obs = write_observation(sim.player1, sim.player2)
+        assert obs.shape == (OBSERVATION_SIZE,) and obs.dtype == np.float32
+        assert obs[2] == obs[6] == 1.0
+        assert obs[1] == obs[5] == 0.0  # On the ground
+        assert obs[0] < obs[4]
+        assert obs[3] == encode_state(PlayerState.IDLE)
+
+    def test_writes_into_buffer(self):
+        sim = Simulation()
+        out = np.zeros(OBSERVATION_SIZE, dtype=np.float32)
+        sim.step(ACTION_JUMP, ACTION_IDLE)
+        assert write_observation(sim.player1, sim.player2, out) is out
+        assert out[1] > 0.0
+
+
+class TestInProcessEnv:
+    def test_no_threads(self):
+        before = threading.active_count()
+        env = FightingEnv(backend_peer_id="test", in_process=True)
+        assert env.game_client_thread is None
+        assert threading.active_count() == before
+        env.close()
+
+    def test_reset_and_step(self, env):
+        obs, info = env.reset()
+        assert env.observation_space.contains(obs)
+        assert info == {}
+
+        obs, reward, terminated, truncated, _ = env.step((ACTION_JUMP, ACTION_IDLE))
+        assert obs[1] > 0.0
+        assert not terminated and not truncated
+        assert env.game.frame_count == 1
+
+    def test_observations_are_not_aliased(self, env):
+        first, _ = env.reset()
+        second, *_ = env.step((ACTION_JUMP, ACTION_IDLE))
+        assert first[1] == 0.0 and second[1] > 0.0
+
+    def test_damage_reward_and_ko(self, env):
+        env.reset()
+        _close_distance(env.game)
+        env.game_client.step(ACTION_IDLE, ACTION_IDLE)
+        env._prev_obs[:] = env.game_client.observation
+
+        _, reward, *_ = env.step((ACTION_ATTACK, ACTION_IDLE))
+        assert env.game.player2.health == INITIAL_HEALTH - PUNCH_DAMAGE
+        assert reward == pytest.approx(PUNCH_DAMAGE / INITIAL_HEALTH * env.reward_calculator.damage_reward_scale)
+
+        env.game.player2.health = PUNCH_DAMAGE
+        terminated = False
+        for _ in range(200):
+            obs, reward, terminated, *_ = env.step((ACTION_ATTACK, ACTION_IDLE))
+            if terminated:
+                break
+        assert terminated
+        assert obs[6] == 0.0
+        assert reward > env.reward_calculator.win_reward / 2
+
+    def test_deterministic_client(self):
+        a, b = LocalGameClient(deterministic=True), LocalGameClient(deterministic=True)
+        a.reset(), b.reset()
+        for p1, p2 in [(1, 2), (3, 4), (4, 5)] * 20:
+            a.step(p1, p2), b.step(p1, p2)
+        assert a.simulation.state_hash() == b.simulation.state_hash()
+        assert np.array_equal(a.observation, b.observation)
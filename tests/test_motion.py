@@ -0,0 +1,188 @@
+import numpy as np
+import pytest
+
+from src.game_engine.frame_data import load_roster
+from src.game_engine.motion import (BUTTON_KICK, BUTTON_PUNCH,
+                                    DIRECTION_NEUTRAL, InputBuffer,
+                                    MotionInputReader, MotionRecognizer,
+                                    compile_automaton, compile_motions,
+                                    numpad_direction, parse_motion)
+
+
+@pytest.fixture
+def ryu():
+    return load_roster()[1]
+
+
+def _feed(reader, inputs, facing=1):
+    """inputs: (horizontal, vertical, buttons) per frame; returns the fired move ids."""
+    return [reader.feed(h, v, b, facing) for h, v, b in inputs]
+
+
+DOWN, DOWN_FORWARD, FORWARD, NEUTRAL = (0, -1, 0), (1, -1, 0), (1, 0, 0), (0, 0, 0)
+PUNCH = (0, 0, BUTTON_PUNCH)
+
+
+class TestMotionParsing:
+    def test_parse_motion(self):
+        assert parse_motion("↓↘→ + P") == ((2, 3, 6), BUTTON_PUNCH)
+        assert parse_motion("↓↙← + K") == ((2, 1, 4), BUTTON_KICK)
+        with pytest.raises(ValueError):
+            parse_motion("↓↘→")
+
+    def test_numpad_direction_is_relative_to_facing(self):
+        assert numpad_direction(1, -1, 1) == 3
+        assert numpad_direction(-1, -1, -1) == 3
+        assert numpad_direction(0, 0, 1) == DIRECTION_NEUTRAL
+
+    def test_compile_orders_longest_first(self):
+        chun_li = compile_motions(load_roster()[3])
+        assert chun_li.lengths.tolist() == [5, 3]
+        assert chun_li.move_ids.tolist() == [0, 1]
+
+
+class TestMotionRecognizer:
+    def test_quarter_circle_punch(self, ryu):
+        fired = _feed(MotionInputReader(ryu), [DOWN, DOWN_FORWARD, FORWARD, PUNCH])
+        assert fired == [-1, -1, -1, ryu.index("Hadoken")]
+
+    def test_button_on_last_direction_frame(self, ryu):
+        fired = _feed(MotionInputReader(ryu), [DOWN, DOWN_FORWARD, (1, 0, BUTTON_PUNCH)])
+        assert fired[-1] == ryu.index("Hadoken")
+
+    def test_leniency_windows(self, ryu):
+        sloppy = [DOWN, NEUTRAL, NEUTRAL, DOWN_FORWARD] + [FORWARD] * 3 + [PUNCH]
+        assert _feed(MotionInputReader(ryu), sloppy)[-1] == ryu.index("Hadoken")
+
+        too_slow = [DOWN] + [NEUTRAL] * 9 + [DOWN_FORWARD, FORWARD, PUNCH]
+        assert _feed(MotionInputReader(ryu, motion_window=8), too_slow)[-1] == -1
+
+        late_button = [DOWN, DOWN_FORWARD, FORWARD] + [NEUTRAL] * 7 + [PUNCH]
+        assert _feed(MotionInputReader(ryu, button_window=6), late_button)[-1] == -1
+
+    def test_mirrored_when_facing_left(self, ryu):
+        mirrored = [DOWN, (-1, -1, 0), (-1, 0, 0), PUNCH]
+        assert _feed(MotionInputReader(ryu), mirrored, facing=-1)[-1] == ryu.index("Hadoken")
+        assert _feed(MotionInputReader(ryu), mirrored, facing=1)[-1] == -1
+
+    def test_held_button_fires_once(self, ryu):
+        held = [DOWN, DOWN_FORWARD, (1, 0, BUTTON_PUNCH), (0, 0, BUTTON_PUNCH)]
+        assert _feed(MotionInputReader(ryu), held).count(ryu.index("Hadoken")) == 1
+
+    def test_input_buffer_ring(self):
+        buffer = InputBuffer(size=4)
+        for value in range(6):
+            buffer.push(value)
+        assert buffer.recent(10) == [2, 3, 4, 5]
+        assert buffer[0] == 5
+        with pytest.raises(IndexError):
+            buffer[4]
+
+
+def _reference_update(table, progress, timers, direction, pressed, motion_window=8, button_window=6):
+    """One progress/timer pair per motion, the rules the automaton is compiled from."""
+    fired = -1
+    for m, sequence in enumerate(table.sequences.tolist()):
+        length = int(table.lengths[m])
+        if progress[m] < length and direction == sequence[progress[m]]:
+            progress[m] += 1
+            timers[m] = 0
+        elif progress[m]:
+            timers[m] += 1
+            if timers[m] > (button_window if progress[m] >= length else motion_window):
+                progress[m] = 1 if direction == sequence[0] else 0
+                timers[m] = 0
+        if fired < 0 and progress[m] >= length and pressed & int(table.buttons[m]):
+            fired = int(table.move_ids[m])
+            progress[m] = timers[m] = 0
+    return fired
+
+
+class TestMotionAutomaton:
+    def test_matches_per_motion_rules(self, ryu):
+        num_players, frames = 64, 400
+        table = compile_motions(ryu)
+        automaton = compile_automaton(table)
+        rng = np.random.default_rng(5)
+        # Biased towards the down/forward quadrant so motions actually complete
+        directions = rng.choice([2, 3, 6, 5, 1, 4, 9], p=[0.25, 0.2, 0.25, 0.1, 0.1, 0.05, 0.05],
+                                size=(frames, num_players))
+        pressed = rng.choice([0, BUTTON_PUNCH, BUTTON_KICK], p=[0.8, 0.1, 0.1], size=(frames, num_players))
+
+        recognizers = [MotionRecognizer(automaton) for _ in range(num_players)]
+        reference = [([0] * len(table.move_ids), [0] * len(table.move_ids)) for _ in range(num_players)]
+        # The tables also step a whole batch of players with array lookups
+        states = np.zeros(num_players, dtype=np.int32)
+        total = 0
+        for frame in range(frames):
+            expected = [_reference_update(table, *ref, int(d), int(p))
+                        for ref, d, p in zip(reference, directions[frame], pressed[frame])]
+            fired = [r.update(int(d), int(p)) for r, d, p in zip(recognizers, directions[frame], pressed[frame])]
+            assert fired == expected, f"frame {frame}"
+
+            states = automaton.transitions[states, directions[frame]]
+            batch_fired = automaton.fired[states, pressed[frame]]
+            states = automaton.after_press[states, pressed[frame]]
+            assert batch_fired.tolist() == expected, f"frame {frame}"
+            total += sum(move_id >= 0 for move_id in expected)
+        assert total > 0
+
+    def test_state_count_is_bounded(self):
+        for move_table in load_roster().values():
+            automaton = compile_automaton(compile_motions(move_table))
+            assert automaton.transitions.shape[0] == automaton.fired.shape[0] < 10_000
+
+
+class TestGameMotionInput:
+    def test_reader_is_fed_once_per_tick(self, ryu):
+        from src.game_engine.game import Game
+
+        game = Game(0, 0, "", headless=True, deterministic=True, characters=(1, None))
+        tick = game.simulation.physics.tick
+        # Each rendered frame's keyboard state is held for two simulation ticks
+        for held in [DOWN, DOWN_FORWARD, FORWARD, PUNCH]:
+            game._held_input = held
+            game._update(tick)
+            game._update(tick)
+        assert game.motion_reader.buffer.frame == game.frame_count == 8
+        assert game.player1.move_id == ryu.index("Hadoken")
+
+    def test_keyboard_input_is_applied_on_the_tick(self):
+        import pygame
+
+        from src.game_engine.game import Game
+
+        def new_game():
+            return Game(0, 0, "", headless=True, deterministic=True, characters=(1, None))
+
+        def set_input(game, keys, direction):
+            game._pending_keys.extend(keys)
+            game._move_direction = direction
+            game._held_input = (direction, 0, 0)
+
+        # 렌더 프레임마다 (키 이벤트, 이동 방향, 그 프레임에 도는 틱 수)
+        frames = [
+            ([(pygame.KEYDOWN, pygame.K_UP)], 1, 0),
+            ([], 1, 2),
+            ([(pygame.KEYDOWN, pygame.K_DOWN)], 0, 0),
+            ([(pygame.KEYUP, pygame.K_DOWN)], -1, 1),
+            ([(pygame.KEYDOWN, pygame.K_SPACE)], 0, 2),
+            ([], -1, 1),
+        ]
+        game = new_game()
+        tick = game.simulation.physics.tick
+        recorded = []
+        for keys, direction, ticks in frames:
+            before = game.simulation.save_state()
+            set_input(game, keys, direction)
+            assert game.simulation.save_state() == before  # 틱 전에는 상태가 그대로입니다
+            for _ in range(ticks):
+                recorded.append((list(game._pending_keys), game._move_direction))
+                game._update(tick)
+
+        # 틱별로 기록한 입력만 재생해도 같은 상태가 됩니다
+        replay = new_game()
+        for keys, direction in recorded:
+            set_input(replay, keys, direction)
+            replay._update(tick)
+        assert replay.simulation.save_state() == game.simulation.save_state()
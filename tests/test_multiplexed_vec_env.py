@@ -0,0 +1,94 @@
+import queue
+import threading
+
+import numpy as np
+import pytest
+
+from src.networking.local_client import LocalMultiplexedClient
+from src.rl_training.multiplexed_vec_env import MultiplexedVecEnv
+from src.rl_training.vec_env import FightingVecEnv
+
+
+class CountingQueue(queue.Queue):
+    def __init__(self):
+        super().__init__()
+        self.puts = 0
+
+    def put(self, item, block=True, timeout=None):
+        self.puts += 1
+        super().put(item, block, timeout)
+
+
+@pytest.fixture
+def multiplexed():
+    num_envs = 4
+    action_queue, result_queue = CountingQueue(), queue.Queue()
+    client = LocalMultiplexedClient(num_envs)
+    thread = threading.Thread(target=client.serve, args=(action_queue, result_queue), daemon=True)
+    thread.start()
+    vec_env = MultiplexedVecEnv(num_envs, action_queue, result_queue)
+    vec_env.wait_for_connection(timeout=5)
+    yield vec_env, client
+    vec_env.close()
+    thread.join(timeout=5)
+
+
+class TestMultiplexedVecEnv:
+    def test_matches_batched_vec_env(self, multiplexed):
+        vec_env, _ = multiplexed
+        local = FightingVecEnv(vec_env.num_envs)
+        assert np.array_equal(vec_env.reset(), local.reset())
+        actions = np.random.default_rng(0).integers(0, 6, size=(300, vec_env.num_envs, 2))
+        for step_actions in actions:
+            obs, rewards, dones, infos = vec_env.step(step_actions)
+            expected_obs, expected_rewards, expected_dones, expected_infos = local.step(step_actions)
+            assert np.array_equal(obs, expected_obs)
+            assert np.array_equal(rewards, expected_rewards)
+            assert np.array_equal(dones, expected_dones)
+            for info, expected in zip(infos, expected_infos):
+                assert info.keys() == expected.keys()
+
+    def test_action_repeat_matches_batched_vec_env(self):
+        action_queue, result_queue = CountingQueue(), queue.Queue()
+        client = LocalMultiplexedClient(3)
+        thread = threading.Thread(target=client.serve, args=(action_queue, result_queue), daemon=True)
+        thread.start()
+        vec_env = MultiplexedVecEnv(3, action_queue, result_queue, action_repeat=5)
+        vec_env.wait_for_connection(timeout=5)
+        local = FightingVecEnv(3, action_repeat=5)
+
+        vec_env.reset()
+        local.reset()
+        sent = action_queue.puts
+        for step_actions in np.random.default_rng(1).integers(0, 6, size=(100, 3, 2)):
+            obs, rewards, dones, _ = vec_env.step(step_actions)
+            expected_obs, expected_rewards, expected_dones, _ = local.step(step_actions)
+            assert np.array_equal(obs, expected_obs)
+            assert np.array_equal(rewards, expected_rewards)
+            assert np.array_equal(dones, expected_dones)
+        assert action_queue.puts - sent >= 100
+        assert client.simulation.frame_count.max() > 100
+        vec_env.close()
+        thread.join(timeout=5)
+
+    def test_one_message_per_step(self, multiplexed):
+        vec_env, client = multiplexed
+        vec_env.reset()
+        sent = vec_env.action_queue.puts
+        for _ in range(10):
+            vec_env.step(np.zeros((vec_env.num_envs, 2), dtype=np.int64))
+        assert vec_env.action_queue.puts - sent == 10
+
+        # Finished matches are reset with a single extra message for the batch
+        client.simulation.health[:2, 1] = 0
+        sent = vec_env.action_queue.puts
+        obs, _, dones, infos = vec_env.step(np.zeros((vec_env.num_envs, 2), dtype=np.int64))
+        assert dones.tolist() == [True, True, False, False]
+        assert vec_env.action_queue.puts - sent == 2
+        assert infos[0]["terminal_observation"][6] == 0.0
+        assert obs[0, 6] == 1.0
+
+    def test_times_out_without_client(self):
+        vec_env = MultiplexedVecEnv(2, queue.Queue(), queue.Queue(), timeout=0.05)
+        with pytest.raises(TimeoutError):
+            vec_env.reset()
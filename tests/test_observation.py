@@ -0,0 +1,166 @@
+import numpy as np
+import pytest
+from gymnasium import spaces
+
+from src.constants import ACTION_ATTACK, ACTION_GUARD, ACTION_JUMP, ACTION_MOVE_RIGHT
+from src.game_engine.interfaces import get_game_state, write_observation
+from src.game_engine.simulation import Simulation
+from src.rhythm_analyzer import BatchedRhythmAnalyzer
+from src.rl_training.observation import (RHYTHM_SCALE, ObservationBuilder,
+                                         ObservationSchema)
+from src.rl_training.vec_env import RHYTHM_WINDOW, FightingVecEnv
+
+
+class TestObservationSchema:
+    def test_default_matches_env_observation(self):
+        schema = ObservationSchema()
+        assert schema.size == 8
+        assert schema.space() == spaces.Box(low=0.0, high=1.0, shape=(8,), dtype=np.float32)
+
+    def test_sizes(self):
+        schema = ObservationSchema(fields=("p1_x", "p2_x", "distance"), rhythm=True, history=4)
+        assert schema.game_size == 3
+        assert schema.frame_size == 3 + 8
+        assert schema.size == 4 * 11
+        assert schema.names[3] == "p1_apm"
+        assert schema.space().shape == (44,)
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            ObservationSchema(fields=("p1_mana",))
+        with pytest.raises(ValueError):
+            ObservationSchema(history=0)
+
+
+class TestObservationBuilder:
+    def test_push_state_matches_write_observation(self):
+        sim = Simulation()
+        builder = ObservationBuilder()
+        for action in (ACTION_MOVE_RIGHT, ACTION_JUMP, ACTION_ATTACK, ACTION_GUARD):
+            sim.step(action, ACTION_GUARD)
+            obs = builder.push_state(get_game_state(sim.player1, sim.player2))
+            assert np.allclose(obs, write_observation(sim.player1, sim.player2))
+
+    def test_frame_stacking(self):
+        schema = ObservationSchema(history=3)
+        builder = ObservationBuilder(schema)
+        builder.reset(np.full(8, 0.5))
+        assert np.allclose(builder.observation, 0.5)
+
+        frames = [np.full(8, i / 10) for i in range(5)]
+        for i, frame in enumerate(frames):
+            obs = builder.push(frame)
+            expected = ([np.full(8, 0.5)] * 3 + frames)[i + 1 : i + 4]
+            assert np.allclose(obs.reshape(3, 8), expected)
+            assert np.shares_memory(obs, builder._frames)
+            assert obs is builder.observation
+
+    def test_batched_reset_mask_keeps_other_envs(self):
+        builder = ObservationBuilder(ObservationSchema(history=2), num_envs=3)
+        builder.reset(np.zeros((3, 8)))
+        builder.push(np.ones((3, 8)))
+        before = builder.observation.copy()
+
+        obs = builder.reset(np.full((3, 8), 0.25), mask=np.array([False, True, False]))
+        assert np.allclose(obs[1], 0.25)
+        assert np.allclose(obs[[0, 2]], before[[0, 2]])
+        obs = builder.push(np.full((3, 8), 0.75))
+        assert np.allclose(obs[0], [1.0] * 8 + [0.75] * 8)
+        assert np.allclose(obs[1], [0.25] * 8 + [0.75] * 8)
+
+    def test_rhythm_features_are_scaled(self):
+        builder = ObservationBuilder(ObservationSchema(rhythm=True), num_envs=2)
+        analyzer = BatchedRhythmAnalyzer(4, window_size=10, fps=60)
+        for frame in range(10):
+            analyzer.add_actions([[ACTION_ATTACK, ACTION_GUARD], [ACTION_ATTACK, ACTION_ATTACK]], frame)
+        analyzer.get_feature_vectors(out=builder.rhythm_input)
+        obs = builder.push(np.zeros((2, 8)))
+        raw = analyzer.get_feature_vectors().reshape(2, 8)
+        assert np.allclose(obs[:, 8:], raw * np.tile(RHYTHM_SCALE, 2))
+
+
+class TestVecEnvObservationSchema:
+    def test_matches_builder_replay(self):
+        schema = ObservationSchema(rhythm=True, history=2)
+        vec_env = FightingVecEnv(2, observation_schema=schema)
+        assert vec_env.observation_space == schema.space()
+
+        # Serve-time pipeline fed the same game observations and actions
+        builder = ObservationBuilder(schema)
+        analyzer = BatchedRhythmAnalyzer(2, RHYTHM_WINDOW, 60)
+        obs = vec_env.reset()
+        analyzer.get_feature_vectors(out=builder.rhythm_input)
+        assert np.allclose(obs[0], builder.reset(vec_env._obs[0]))
+
+        rng = np.random.default_rng(0)
+        for frame in range(1, 30):
+            actions = rng.integers(0, 6, size=(2, 2))
+            obs, _, dones, _ = vec_env.step(actions)
+            assert not dones.any()
+            analyzer.add_actions(actions[0], frame)
+            analyzer.get_feature_vectors(out=builder.rhythm_input)
+            assert np.allclose(obs[0], builder.push(vec_env._obs[0]))
+
+    def test_terminal_observation_and_reset(self):
+        vec_env = FightingVecEnv(2, observation_schema=ObservationSchema(rhythm=True, history=2))
+        vec_env.reset()
+        vec_env.simulation.health[0, 1] = 1
+        vec_env.simulation.rect_x[0] = [300, 355]
+        vec_env.simulation.pos_x[0] = vec_env.simulation.rect_x[0]
+
+        obs, _, dones, infos = vec_env.step(np.array([[ACTION_ATTACK, 0], [ACTION_ATTACK, 0]]))
+        assert dones.tolist() == [True, False]
+        terminal = infos[0]["terminal_observation"]
+        assert terminal.shape == (32,) and terminal[16 + 6] == 0.0  # P2 KO in the newest frame
+        # Env 0 restarts with a full-health history and no rhythm; env 1 keeps its attack
+        assert np.allclose(obs[0].reshape(2, 16)[:, [2, 6]], 1.0)
+        assert np.allclose(obs[0, 8:16], 0.0)
+        assert obs[1, 16 + 8] > 0.0
+
+
+class _EpisodeEnv:
+    """Stands in for the test-mode FightingEnv: observations only, no `game` attribute."""
+
+    def __init__(self, *args, steps=5, **kwargs):
+        self.steps = steps
+        self.t = 0
+
+    def reset(self):
+        self.t = 0
+        return np.full(8, 0.5, dtype=np.float32), {}
+
+    def step(self, action):
+        self.t += 1
+        obs = np.full(8, 0.5, dtype=np.float32)
+        obs[6] = 1.0 - 0.1 * self.t  # Player 2 keeps losing health
+        return obs, 0.0, self.t >= self.steps, False, {}
+
+
+class TestGameRunnerObservation:
+    def test_rhythm_schema_without_game_object(self, monkeypatch, tmp_path):
+        import asyncio
+
+        from backend.core import game_runner
+
+        monkeypatch.setattr(game_runner, "FightingEnv", _EpisodeEnv)
+        monkeypatch.setattr(game_runner, "MODEL_DIR", str(tmp_path))  # No saved model to load
+        schema = ObservationSchema(rhythm=True, history=2)
+        runner = game_runner.GameRunner("match", "1", "2", "peer", observation_schema=schema)
+        assert not hasattr(runner.env, "game")
+
+        seen = []
+
+        class Model:
+            def predict(self, obs, deterministic=True):
+                seen.append(obs.copy())
+                return np.array([ACTION_ATTACK, ACTION_GUARD]), None
+
+        runner.model = Model()
+        asyncio.run(runner.run_grpc_stream())
+
+        assert len(seen) == 5 and all(obs.shape == (schema.size,) for obs in seen)
+        analyzer = runner.rhythm_analyzer
+        assert analyzer.lengths.tolist() == [5, 5]
+        assert analyzer.frames[0, :5].tolist() == [1, 2, 3, 4, 5]
+        # Player 1 attacked every frame, Player 2 guarded: offense/defense ratio 5 / 0
+        assert runner.observation_builder.rhythm_input[0, 2] == 5.0
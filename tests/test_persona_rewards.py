@@ -0,0 +1,132 @@
+import numpy as np
+import pytest
+
+from src.constants import ACTION_ATTACK, ACTION_IDLE
+from src.qa_evaluator.ai_personas import PERSONAS
+from src.rl_training.persona_rewards import (COMBO_WINDOW, FEATURE_INDEX,
+                                             FEATURES, MAX_FRAMES_PER_STEP,
+                                             PersonaRewardKernel)
+from src.rl_training.vec_env import FightingVecEnv
+
+
+def _close_distance(vec_env, env_index=0):
+    sim = vec_env.simulation
+    sim.rect_x[env_index] = [300, 300 + 55]
+    sim.pos_x[env_index] = sim.rect_x[env_index]
+    vec_env._prev_obs[:] = sim.write_observations()
+
+
+def _run(vec_env, frames, p1_action):
+    features = []
+    for _ in range(frames):
+        vec_env.step(np.array([[p1_action, ACTION_IDLE]] * vec_env.num_envs))
+        features.append(vec_env.persona_kernel.features.copy())
+    return np.stack(features)
+
+
+class TestPersonaRewardKernel:
+    def test_weight_matrix(self):
+        kernel = PersonaRewardKernel(PERSONAS, num_envs=1)
+        assert kernel.weights.shape == (len(FEATURES), len(PERSONAS))
+        slugger = kernel.names.index("Slugger AI")
+        # light + powerful attack hits both map onto the single punch
+        assert kernel.weights[FEATURE_INDEX["hit"], slugger] == pytest.approx(5.1)
+        assert kernel.unsupported == {"Pro-gamer AI": ["FunScore"], "Troll AI": ["opponent_frustration"]}
+
+    def test_hits_and_combos(self):
+        vec_env = FightingVecEnv(1, personas=PERSONAS)
+        vec_env.reset()
+        _close_distance(vec_env)
+        features = _run(vec_env, 40, ACTION_ATTACK)[:, 0]  # env 0
+
+        p1, p2 = features[:, 0], features[:, 1]
+        hits = np.flatnonzero(p1[:, FEATURE_INDEX["hit"]])
+        assert len(hits) == 2
+        assert p1[hits[0], FEATURE_INDEX["damage"]] == pytest.approx(0.3)
+        assert p2[hits[0], FEATURE_INDEX["damage_taken"]] == pytest.approx(0.3)
+        assert p1[hits, FEATURE_INDEX["close_range_attack_hit"]].all()
+        assert p1[hits, FEATURE_INDEX["combo_success"]].tolist() == [0.0, 1.0]
+        assert p1[:, FEATURE_INDEX["attack_frequency"]].sum() == 2
+        assert not p1[:, FEATURE_INDEX["attack_miss"]].any()
+
+    def test_miss_and_evade(self):
+        vec_env = FightingVecEnv(1, personas=PERSONAS)
+        vec_env.reset()
+        features = _run(vec_env, 20, ACTION_ATTACK)[:, 0]
+        assert features[:, 0, FEATURE_INDEX["attack_miss"]].sum() == 1
+        assert features[:, 1, FEATURE_INDEX["evade_success"]].sum() == 1
+        assert not features[:, 0, FEATURE_INDEX["hit"]].any()
+
+    @pytest.mark.parametrize("frames, combo", [(1, True), (COMBO_WINDOW // 2, False)])
+    def test_combo_window_counts_frames(self, frames, combo):
+        kernel = PersonaRewardKernel(PERSONAS, num_envs=1)
+        prev = np.array([[0.4, 0.0, 1.0, 0.0, 0.5, 0.0, 1.0, 0.0]])
+        combos = []
+        # Hit, two quiet steps, hit: 3 * frames apart
+        for damage in (0.1, 0.0, 0.0, 0.1):
+            obs = prev.copy()
+            obs[0, 6] -= damage
+            features = kernel.compute_features(obs, prev, np.zeros(1, dtype=bool), frames)
+            combos.append(features[0, 0, FEATURE_INDEX["combo_success"]])
+            prev = obs
+        assert combos == [0.0, 0.0, 0.0, float(combo)]
+
+    def test_attacks_seen_with_action_repeat(self):
+        vec_env = FightingVecEnv(1, personas=PERSONAS, action_repeat=4)
+        vec_env.reset()
+        features = _run(vec_env, 5, ACTION_ATTACK)[:, 0]
+        assert features[:, 0, FEATURE_INDEX["attack_frequency"]].sum() == 1
+        assert features[:, 0, FEATURE_INDEX["attack_miss"]].sum() == 1
+        assert features[:, 1, FEATURE_INDEX["evade_success"]].sum() == 1
+
+    def test_rewards_match_weighted_sums(self):
+        vec_env = FightingVecEnv(3, personas=PERSONAS)
+        vec_env.reset()
+        _close_distance(vec_env, 1)
+        actions = np.random.default_rng(0).integers(0, 6, size=(100, 3, 2))
+        kernel = vec_env.persona_kernel
+        for step_actions in actions:
+            vec_env.step(step_actions)
+            for column, name in enumerate(kernel.names):
+                expected = np.zeros(3)
+                for key, weight in PERSONAS[name].reward_weights.items():
+                    if key not in kernel.unsupported.get(name, []):
+                        feature = FEATURE_INDEX[{"jab_hit": "hit", "light_attack_hit": "hit",
+                                                 "powerful_attack_hit": "hit",
+                                                 "rapid_combo_hit": "combo_success",
+                                                 "powerful_attack_miss": "attack_miss",
+                                                 "repeated_defense_induce": "guard_induced",
+                                                 "explore": "movement"}.get(key, key)]
+                        expected += weight * kernel.features[:, 0, feature]
+                assert np.allclose(vec_env.persona_rewards[:, column], expected)
+
+
+class TestPersonaVecEnv:
+    def test_assignment_trains_on_persona_reward(self):
+        names = list(PERSONAS)[:2]
+        vec_env = FightingVecEnv(2, personas=PERSONAS, persona_assignment=names)
+        vec_env.reset()
+        sim = vec_env.simulation
+        sim.rect_x[:] = [300, 300 + 55]
+        sim.pos_x[:] = sim.rect_x
+        sim.health[:, 1] = 1
+        vec_env._prev_obs[:] = sim.write_observations()
+
+        _, rewards, dones, infos = vec_env.step(np.array([[ACTION_ATTACK, ACTION_IDLE]] * 2))
+        assert dones.all()
+        columns = [vec_env.persona_kernel.names.index(name) for name in names]
+        for i, column in enumerate(columns):
+            assert rewards[i] == pytest.approx(vec_env.persona_rewards[i, column])
+            assert infos[i]["persona_returns"][names[i]] == pytest.approx(rewards[i])
+        assert set(infos[0]["persona_returns"]) == set(PERSONAS)
+
+    def test_assignment_requires_known_personas(self):
+        with pytest.raises(ValueError):
+            FightingVecEnv(2, persona_assignment=["Beginner AI"] * 2)
+        with pytest.raises(ValueError):
+            FightingVecEnv(2, personas=PERSONAS, persona_assignment=["Beginner AI"])
+
+    def test_rejects_steps_longer_than_an_attack(self):
+        FightingVecEnv(1, personas=PERSONAS, action_repeat=MAX_FRAMES_PER_STEP)
+        with pytest.raises(ValueError):
+            FightingVecEnv(1, personas=PERSONAS, action_repeat=MAX_FRAMES_PER_STEP + 1)
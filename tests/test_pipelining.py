@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+from src.fighting_env import FightingEnv
+
+
+def _result(seq, value, round_over=False):
+    observation = [value, 0.0, 1.0, 0.0, 0.8, 0.0, 1.0, 0.0]
+    state = {
+        "observation": observation,
+        "p1_health": 1.0,
+        "p2_health": 1.0,
+        "p1_pos_x": value,
+        "p2_pos_x": 0.8,
+        "round_over": round_over,
+    }
+    return {"type": "action_result", "seq": seq, "state": state}
+
+
+def _make_env(**kwargs):
+    return FightingEnv(backend_peer_id="test", headless_mode=True, **kwargs)
+
+
+def _close(env):
+    env.action_queue.put({"type": "close"})
+    env.close()
+
+
+@pytest.fixture
+def manual_env():
+    """An env whose results are fed by the test instead of MockGameClient."""
+    env = _make_env(pipeline_depth=3, step_timeout=0.2)
+    env.reset()
+    env.action_queue.put({"type": "close"})
+    env.game_client._thread.join(timeout=5)
+    yield env
+    env.close()
+
+
+class TestPipelinedStepping:
+    def test_pipelined_matches_serial(self):
+        actions = [(1, 4), (4, 0), (2, 4), (4, 4), (0, 1), (3, 2), (4, 0), (1, 1)]
+        serial, pipelined = _make_env(), _make_env(pipeline_depth=3)
+        try:
+            assert np.array_equal(serial.reset()[0], pipelined.reset()[0])
+            expected = [serial.step(action) for action in actions]
+
+            results = []
+            for action in actions[:3]:
+                pipelined.step_async(action)
+            for action in actions[3:]:
+                results.append(pipelined.step_wait())
+                pipelined.step_async(action)
+            while len(results) < len(actions):
+                results.append(pipelined.step_wait())
+
+            for got, want in zip(results, expected):
+                assert np.array_equal(got[0], want[0])
+                assert got[1:4] == want[1:4]
+        finally:
+            _close(serial)
+            _close(pipelined)
+
+    def test_depth_limit(self, manual_env):
+        for _ in range(3):
+            manual_env.step_async((0, 0))
+        with pytest.raises(RuntimeError):
+            manual_env.step_async((0, 0))
+
+    def test_out_of_order_results_are_matched_by_seq(self, manual_env):
+        manual_env.step_async((1, 0))
+        manual_env.step_async((1, 0))
+        first, second = [seq for seq, _ in manual_env._pending]
+        manual_env.result_queue.put(_result(second, 0.3))
+        manual_env.result_queue.put(_result(first, 0.2))
+
+        assert manual_env.step_wait()[0][0] == pytest.approx(0.2)
+        assert manual_env.step_wait()[0][0] == pytest.approx(0.3)
+        assert manual_env.reordered_results == 1
+
+    def test_timeout_does_not_end_episode(self, manual_env):
+        manual_env.step_async((1, 0))
+        timed_out = manual_env._pending[0][0]
+        obs, reward, terminated, truncated, info = manual_env.step_wait()
+        assert info["timeout"] and info["seq"] == timed_out
+        assert not terminated and not truncated and reward == 0.0
+        assert manual_env.step_timeouts == 1
+
+        # The late reply is dropped; the next step gets its own result
+        manual_env.step_async((1, 0))
+        manual_env.result_queue.put(_result(timed_out, 0.9))
+        manual_env.result_queue.put(_result(manual_env._pending[0][0], 0.25))
+        assert manual_env.step_wait()[0][0] == pytest.approx(0.25)
+        assert manual_env.stale_results == 1
+
+    def test_in_process_step_async(self):
+        env = FightingEnv(backend_peer_id="test", in_process=True, pipeline_depth=2)
+        reference = FightingEnv(backend_peer_id="test", in_process=True)
+        env.reset()
+        reference.reset()
+        env.step_async((1, 2))
+        env.step_async((4, 0))
+        for action in ((1, 2), (4, 0)):
+            got, want = env.step_wait(), reference.step(action)
+            assert np.array_equal(got[0], want[0]) and got[1] == want[1]
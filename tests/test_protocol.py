@@ -0,0 +1,87 @@
+import json
+
+import numpy as np
+import pytest
+
+from src.networking import protocol
+from src.networking.protocol import (MSG_ACTION, MSG_ACTION_RESULT, MSG_RESET,
+                                     ProtocolError, decode, encode_action,
+                                     encode_message, encode_result,
+                                     message_to_dict)
+
+OBS = [0.25, 0.0, 0.9, 0.5, 0.75, 0.1, 1.0, 0.0]
+
+
+class TestBinaryProtocol:
+    def test_action_roundtrip(self):
+        data = encode_action(4, 5, seq=123456, env_id=7)
+        assert len(data) == protocol.HEADER.size + 2
+        message = decode(data)
+        assert (message.msg_type, message.seq, message.env_id) == (MSG_ACTION, 123456, 7)
+        assert (message.p1_action, message.p2_action) == (4, 5)
+
+    def test_result_roundtrip_without_copy(self):
+        data = encode_result(MSG_ACTION_RESULT, OBS, round_over=True, seq=9)
+        message = decode(data)
+        assert message.round_over
+        assert message.observation.dtype == np.float32
+        assert np.allclose(message.observation, OBS)
+        assert message.observation.base is not None  # A view over the received bytes
+
+    def test_dict_compatibility(self):
+        data = encode_message({"type": "action_result", "state": {"observation": OBS, "round_over": False}}, seq=3)
+        result = message_to_dict(decode(data))
+        assert result["type"] == "action_result" and result["seq"] == 3
+        assert result["state"]["p1_health"] == pytest.approx(0.9)
+        assert result["state"]["p2_pos_x"] == pytest.approx(0.75)
+        assert not result["state"]["round_over"]
+
+        action = {"type": "action", "p1Action": 1, "p2Action": 2}
+        assert message_to_dict(decode(encode_message(action)))["p2Action"] == 2
+        assert decode(encode_message({"type": "reset", "seq": 11})).seq == 11
+        assert decode(encode_message({"type": "reset"})).msg_type == MSG_RESET
+
+    def test_smaller_than_json(self):
+        state = {"observation": OBS, "p1_health": 90, "p2_health": 100, "p1_pos_x": 200.0,
+                 "p2_pos_x": 600.0, "round_over": False}
+        as_json = json.dumps({"type": "action_result", "state": state})
+        assert len(encode_result(MSG_ACTION_RESULT, OBS)) * 4 < len(as_json)
+
+    def test_rejects_malformed(self):
+        with pytest.raises(ProtocolError):
+            decode(b"\x01\x03")
+        with pytest.raises(ProtocolError):
+            decode(b"\x02" + encode_action(0, 0)[1:])  # Wrong version
+        with pytest.raises(ProtocolError):
+            decode(encode_result(MSG_ACTION_RESULT, OBS)[:-4])
+        with pytest.raises(ProtocolError):
+            encode_message({"type": "chat"})
+
+    def test_batch_action_roundtrip(self):
+        actions = np.array([[1, 4], [5, 0], [3, 2]])
+        message = protocol.decode_batch(protocol.encode_batch_action(actions, seq=11))
+        assert (message.msg_type, message.seq, message.count) == (protocol.MSG_BATCH_ACTION, 11, 3)
+        assert np.array_equal(message.actions, actions)
+        assert message.repeat == 1
+
+    def test_batch_action_repeat(self):
+        data = protocol.encode_batch_action(np.zeros((2, 2)), seq=3, repeat=4)
+        assert protocol.decode_batch(data).repeat == 4
+        assert len(data) == len(protocol.encode_batch_action(np.zeros((2, 2))))
+
+    def test_batch_result_roundtrip(self):
+        observations = np.stack([OBS] * 5).astype(np.float32)
+        round_over = np.array([False, True, False, False, True])
+        data = protocol.encode_batch_result(observations, round_over, seq=3)
+        assert protocol.is_batch(data)
+        message = protocol.decode_batch(data)
+        assert message.count == 5
+        assert np.array_equal(message.observations, observations)
+        assert message.flags.astype(bool).tolist() == round_over.tolist()
+
+    def test_batch_rejects_malformed(self):
+        data = protocol.encode_batch_reset(np.ones(4, dtype=bool))
+        with pytest.raises(ProtocolError):
+            protocol.decode_batch(data[:-1])
+        with pytest.raises(ProtocolError):
+            protocol.decode_batch(encode_action(0, 0))
@@ -0,0 +1,109 @@
+import json
+import random
+
+import pytest
+
+from src.constants import (ACTION_GUARD, ACTION_JUMP, ACTION_MOVE_LEFT,
+                           ACTION_MOVE_RIGHT, NUM_ACTIONS)
+from src.game_engine.simulation import Simulation
+from src.log_collector.log_collector import LogCollector
+from src.log_collector.replay import (Replay, ReplayRecorder, ReplaySimulator,
+                                      pack_inputs, unpack_inputs)
+
+
+def _record(frames: int = 1500, interval: int = 300):
+    rng = random.Random(42)
+    recorder = ReplayRecorder(seed=42, p1_character=1, p2_character=2, checkpoint_interval=interval)
+    hashes = []
+    for frame in range(frames):
+        if frame < 45:
+            actions = (ACTION_MOVE_RIGHT, ACTION_MOVE_LEFT)
+        else:
+            actions = (rng.randrange(NUM_ACTIONS), rng.randrange(NUM_ACTIONS))
+        recorder.step(*actions)
+        hashes.append(recorder.simulation.state_hash())
+    return recorder.finish(), hashes
+
+
+class TestReplay:
+    def test_pack_round_trip(self):
+        for p1_action in range(NUM_ACTIONS):
+            for p2_action in range(NUM_ACTIONS):
+                assert unpack_inputs(pack_inputs(p1_action, p2_action)) == (p1_action, p2_action)
+        with pytest.raises(ValueError):
+            pack_inputs(NUM_ACTIONS, 0)
+
+    def test_serialization_round_trip(self):
+        replay, _ = _record()
+        data = replay.to_bytes()
+        loaded = Replay.from_bytes(data)
+        assert (loaded.seed, loaded.p1_character, loaded.p2_character) == (42, 1, 2)
+        assert loaded.inputs == replay.inputs
+        assert loaded.checkpoints == replay.checkpoints
+        assert loaded.final_hash == replay.final_hash
+        # One byte per frame plus a checkpoint every 300 frames
+        assert len(data) < 2 * replay.frame_count
+        with pytest.raises(ValueError):
+            Replay.from_bytes(data[:-1])
+        with pytest.raises(ValueError):
+            Replay.from_bytes(b"XXXX" + data[4:])
+
+    def test_resimulation_reproduces_every_frame(self):
+        replay, hashes = _record()
+        player = ReplaySimulator(Replay.from_bytes(replay.to_bytes()))
+        replayed = []
+        while player.step():
+            replayed.append(player.simulation.state_hash())
+        assert replayed == hashes
+        assert player.verify()
+
+    def test_seek(self):
+        replay, hashes = _record()
+        player = ReplaySimulator(replay)
+        for frame in (1200, 7, 301, 300, 1500, 0, 899):
+            sim = player.seek(frame)
+            assert sim.frame_count == frame
+            expected = hashes[frame - 1] if frame else Simulation(deterministic=True).state_hash()
+            assert sim.state_hash() == expected
+        with pytest.raises(IndexError):
+            player.seek(1501)
+
+    def test_seek_backwards_past_first_checkpoint(self):
+        replay, hashes = _record()
+        player = ReplaySimulator(replay)
+        player.seek(1200)
+        assert player.seek(5).state_hash() == hashes[4]
+        # Without embedded checkpoints seeking back re-simulates from the start
+        replay.checkpoints.clear()
+        player = ReplaySimulator(replay)
+        player.seek(900)
+        assert player.seek(299).state_hash() == hashes[298]
+        assert player.seek(0).state_hash() == Simulation(deterministic=True).state_hash()
+
+    def test_engine_version_mismatch(self):
+        replay, _ = _record(frames=10)
+        replay.engine_version += 1
+        with pytest.raises(ValueError):
+            ReplaySimulator(replay)
+
+    def test_recorder_requires_deterministic_simulation(self):
+        with pytest.raises(ValueError):
+            ReplayRecorder(Simulation())
+
+    def test_log_collector_saves_binary_replay(self, tmp_path):
+        recorder = ReplayRecorder(seed=3)
+        for _ in range(120):
+            recorder.step(ACTION_JUMP, ACTION_GUARD)
+        replay = recorder.finish()
+
+        collector = LogCollector(log_dir=str(tmp_path), compress_after_session=False)
+        collector.start_session()
+        path = collector.save_replay_data(replay)
+        log_path = collector.current_log_filepath
+        collector.end_session()
+
+        assert Replay.load(path).inputs == replay.inputs
+        with open(log_path) as f:
+            events = [json.loads(line) for line in f]
+        saved = next(e for e in events if e["event_type"] == "REPLAY_SAVED")
+        assert saved["data"]["frame_count"] == 120
@@ -1,7 +1,8 @@
 import numpy as np
 import pytest
 
-from src.rhythm_analyzer import RhythmAnalyzer
+from src.constants import ACTION_ATTACK, ACTION_GUARD, NUM_ACTIONS
+from src.rhythm_analyzer import BatchedRhythmAnalyzer, RhythmAnalyzer
 
 
 @pytest.fixture
@@ -95,3 +96,106 @@ class TestRhythmAnalyzer:
             ]
         )
         assert np.allclose(feature_vector, expected_vector)
+
+    def test_incremental_metrics_match_full_rescan(self):
+        from scipy.stats import entropy
+
+        analyzer = RhythmAnalyzer(window_size=7, fps=60)
+        actions = ["light_punch", "heavy_kick", "guard", "IDLE", "MOVE"]
+        rng = np.random.default_rng(0)
+        for frame in range(200):
+            analyzer.add_action(actions[rng.integers(len(actions))], frame * 3)
+            window = [log["action"] for log in analyzer.action_log]
+            offense = sum(a in analyzer.offensive_actions for a in window)
+            defense = sum(a in analyzer.defensive_actions for a in window)
+            _, counts = np.unique(window, return_counts=True)
+
+            metrics = analyzer.get_metrics()
+            assert np.isclose(metrics["rhythm_entropy"], entropy(counts, base=2))
+            expected_ratio = offense / defense if defense else offense
+            assert np.isclose(metrics["offense_defense_ratio"], expected_ratio)
+            assert sum(analyzer.action_counts.values()) == len(window)
+
+    def test_entropy_sum_does_not_drift(self):
+        from scipy.stats import entropy
+
+        analyzer = RhythmAnalyzer(window_size=50, fps=60)
+        actions = ["light_punch", "heavy_kick", "guard", "IDLE", "MOVE", "JUMP"]
+        rng = np.random.default_rng(1)
+        choices = rng.integers(len(actions), size=200_000)
+        for frame, choice in enumerate(choices):
+            analyzer.add_action(actions[choice], frame)
+            if frame % 10_000 == 9_999:
+                # The running sum equals a full recompute from the counts, bit for bit
+                assert analyzer._count_entropy_sum == sum(analyzer._xlog2x[c] for c in analyzer.action_counts.values())
+                _, counts = np.unique([log["action"] for log in analyzer.action_log], return_counts=True)
+                assert np.isclose(analyzer.get_metrics()["rhythm_entropy"], entropy(counts, base=2), rtol=1e-10)
+        # Back to a single action type: exactly zero, not a clamped rounding error
+        for frame in range(50):
+            analyzer.add_action("guard", len(choices) + frame)
+        assert analyzer._count_entropy_sum == analyzer._xlog2x[50]
+        assert analyzer.get_metrics()["rhythm_entropy"] == 0.0
+
+    def test_get_feature_vector_reuses_buffer(self, analyzer):
+        first = analyzer.get_feature_vector()
+        analyzer.add_action("guard", 0)
+        second = analyzer.get_feature_vector()
+        assert first is second
+        assert second[2] == 0.0
+
+
+# Batched ids -> names the scalar analyzer classifies the same way
+ACTION_NAMES = {ACTION_ATTACK: "light_punch", ACTION_GUARD: "guard"}
+
+
+def _name(action_id):
+    return ACTION_NAMES.get(int(action_id), f"action_{action_id}")
+
+
+class TestBatchedRhythmAnalyzer:
+
+    def test_initialization(self):
+        batched = BatchedRhythmAnalyzer(num_players=4, window_size=10, fps=60)
+        assert batched.actions.shape == (4, 10)
+        assert batched.action_counts.shape == (4, NUM_ACTIONS)
+        assert np.array_equal(batched.get_feature_vectors(), np.zeros((4, 4)))
+        with pytest.raises(ValueError):
+            BatchedRhythmAnalyzer(num_players=0, window_size=10, fps=60)
+        with pytest.raises(ValueError):
+            BatchedRhythmAnalyzer(num_players=2, window_size=0, fps=60)
+
+    def test_matches_scalar_analyzers(self):
+        num_players, window = 6, 5
+        batched = BatchedRhythmAnalyzer(num_players, window, fps=60)
+        scalar = [RhythmAnalyzer(window, fps=60) for _ in range(num_players)]
+        rng = np.random.default_rng(0)
+        frame = 0
+        for step in range(60):
+            frame += int(rng.integers(0, 3))
+            actions = rng.integers(0, NUM_ACTIONS, size=num_players)
+            mask = rng.random(num_players) < 0.7
+            batched.add_actions(actions, frame, mask)
+            for i in np.flatnonzero(mask):
+                scalar[i].add_action(_name(actions[i]), frame)
+            if step == 30:
+                batched.reset(mask)
+                for i in np.flatnonzero(mask):
+                    scalar[i] = RhythmAnalyzer(window, fps=60)
+
+            expected = np.stack([analyzer.get_feature_vector() for analyzer in scalar])
+            assert np.allclose(batched.get_feature_vectors(), expected)
+
+    def test_feeds_batched_observations(self):
+        num_matches = 3
+        batched = BatchedRhythmAnalyzer(num_matches * 2, window_size=4, fps=60)
+        actions = np.array([[ACTION_ATTACK, ACTION_GUARD]] * num_matches)
+        for frame in range(0, 40, 10):
+            batched.add_actions(actions, frame)
+
+        obs = np.zeros((num_matches, 8 + 8))
+        batched.get_feature_vectors(out=obs[:, 8:].reshape(num_matches, 2, 4))
+        p1, p2 = obs[:, 8:12], obs[:, 12:]
+        assert np.allclose(p1[:, 1], 4 / 0.5)  # 4 actions over 30 frames
+        assert np.allclose(p1[:, 2], 4)  # offense only
+        assert np.allclose(p2[:, 2], 0)
+        assert np.allclose(obs[:, 8:], batched.get_feature_vectors().reshape(num_matches, 8))
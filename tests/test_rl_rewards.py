@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from src.constants import ACTION_ATTACK, ACTION_IDLE
+from src.rl_training.rewards import REWARD_COMPONENTS, RewardCalculator
+from src.rl_training.vec_env import FightingVecEnv
+
+
+def _random_inputs(n, seed=0):
+    rng = np.random.default_rng(seed)
+    health = rng.choice([0.0, 0.25, 0.5, 0.9, 1.0], size=(4, n))
+    x = rng.random((2, n)).astype(np.float32).astype(np.float64)
+    last_distance = np.where(rng.random(n) < 0.2, np.abs(x[0] - x[1]), rng.random(n))
+    return {
+        "player_health": health[0],
+        "opponent_health": health[1],
+        "player_x": x[0],
+        "opponent_x": x[1],
+        "round_over": rng.random(n) < 0.3,
+        "player_won": rng.random(n) < 0.5,
+        "actions": rng.integers(0, 6, size=n),
+        "last_player_health": health[2],
+        "last_opponent_health": health[3],
+        "last_distance": last_distance,
+    }
+
+
+class TestBatchRewards:
+    @pytest.mark.parametrize("idle_penalty", [0.0, -0.01])
+    def test_identical_to_scalar(self, idle_penalty):
+        calculator = RewardCalculator(idle_penalty=idle_penalty)
+        inputs = _random_inputs(500)
+        rewards = calculator.calculate_rewards(**inputs)
+        for i in range(500):
+            expected = calculator.calculate_reward(
+                {"health": inputs["player_health"][i], "x": inputs["player_x"][i]},
+                {"health": inputs["opponent_health"][i], "x": inputs["opponent_x"][i]},
+                {"round_over": inputs["round_over"][i], "player_won": inputs["player_won"][i]},
+                inputs["actions"][i],
+                inputs["last_player_health"][i],
+                inputs["last_opponent_health"][i],
+                inputs["last_distance"][i],
+            )
+            assert rewards[i] == expected
+
+    def test_components_add_up(self):
+        calculator = RewardCalculator(idle_penalty=-0.01)
+        rewards, components = calculator.calculate_rewards(**_random_inputs(200, seed=1), return_components=True)
+        assert tuple(components) == REWARD_COMPONENTS
+        assert np.allclose(sum(components.values()), rewards)
+
+    def test_vec_env_episode_components(self):
+        vec_env = FightingVecEnv(2, log_reward_components=True)
+        vec_env.reset()
+        sim = vec_env.simulation
+        sim.rect_x[0] = [300, 300 + 55]
+        sim.pos_x[0] = sim.rect_x[0]
+        sim.health[0, 1] = 1
+
+        _, rewards, dones, infos = vec_env.step(np.array([[ACTION_ATTACK, ACTION_IDLE]] * 2))
+        assert dones[0]
+        components = infos[0]["reward_components"]
+        assert components["win_loss"] == 100.0
+        assert sum(components.values()) == pytest.approx(infos[0]["episode"]["r"], abs=1e-4)
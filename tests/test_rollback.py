@@ -0,0 +1,81 @@
+import pytest
+
+from src.constants import ACTION_ATTACK, ACTION_JUMP, ACTION_MOVE_LEFT, ACTION_MOVE_RIGHT
+from src.game_engine.simulation import Simulation
+from src.networking.rollback import RollbackSession
+from src.simulation.rollback_harness import run_rollback_match
+
+
+def _p1_action(frame: int) -> int:
+    return ACTION_MOVE_RIGHT if frame < 40 else (ACTION_ATTACK if frame % 7 == 0 else ACTION_JUMP)
+
+
+def _p2_action(frame: int) -> int:
+    return ACTION_MOVE_LEFT if frame % 20 < 15 else ACTION_ATTACK
+
+
+class TestRollbackSession:
+    def test_delayed_inputs_converge_to_reference(self):
+        delay, latency, frames = 2, 5, 120
+        p1, p2 = RollbackSession(1, delay), RollbackSession(2, delay)
+        in_flight = []  # (arrival_tick, receiver, packet)
+
+        for tick in range(frames):
+            for session, action in ((p1, _p1_action(tick)), (p2, _p2_action(tick))):
+                session.add_local_input(action)
+            for item in [item for item in in_flight if item[0] <= tick]:
+                item[1].receive_packet(item[2])
+                in_flight.remove(item)
+            assert p1.advance_frame() and p2.advance_frame()
+            in_flight.append((tick + latency, p2, p1.outgoing_packet()))
+            in_flight.append((tick + latency, p1, p2.outgoing_packet()))
+
+        # Flush the link and let both peers catch up on the confirmed inputs
+        for _, receiver, packet in in_flight:
+            receiver.receive_packet(packet)
+        p1._apply_rollback()
+        p2._apply_rollback()
+
+        reference = Simulation(deterministic=True)
+        for frame in range(frames):
+            p1_action = 0 if frame < delay else _p1_action(frame - delay)
+            p2_action = 0 if frame < delay else _p2_action(frame - delay)
+            reference.step(p1_action, p2_action)
+
+        assert p1.stats.rollbacks > 0
+        assert p1.simulation.state_hash() == reference.state_hash()
+        assert p2.simulation.state_hash() == reference.state_hash()
+
+    def test_stalls_beyond_rollback_window(self):
+        session = RollbackSession(1, input_delay=0, max_rollback=4)
+        advanced = 0
+        for _ in range(10):
+            session.add_local_input(ACTION_MOVE_RIGHT)
+            advanced += session.advance_frame()
+        assert advanced == 4
+        assert session.stats.stalls == 6
+        assert not session.add_local_input(ACTION_MOVE_RIGHT)
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            RollbackSession(3)
+        with pytest.raises(ValueError):
+            RollbackSession(1, simulation=Simulation())
+
+
+class TestRollbackHarness:
+    def test_perfect_link_never_rolls_back(self):
+        report = run_rollback_match(frames=300, latency_mean=0, latency_std=0,
+                                    packet_loss_probability=0.0)
+        for peer in report["peers"]:
+            assert peer["rollbacks"] == 0
+            assert peer["frames"] == 300
+        assert report["desyncs"] == 0
+
+    def test_lossy_link_stays_in_sync(self):
+        report = run_rollback_match(frames=600, latency_mean=100, latency_std=20,
+                                    packet_loss_probability=0.1, seed=3)
+        assert report["packets_lost"][0] > 0
+        assert report["peers"][0]["rollbacks"] > 0
+        assert report["checked_frames"] > 100
+        assert report["desyncs"] == 0
@@ -0,0 +1,104 @@
+import os
+
+import gymnasium as gym
+import numpy as np
+import pytest
+
+from src.fighting_env import FightingEnv
+from src.rl_training.shm_vec_env import SharedMemoryVecEnv, WorkerCrashedError
+from src.rl_training.wrappers import FlattenActionSpaceWrapper
+
+
+def make_env():
+    return FlattenActionSpaceWrapper(FightingEnv(backend_peer_id="test", in_process=True))
+
+
+class CrashingEnv(gym.Wrapper):
+    """Kills its worker process on the given step."""
+
+    def __init__(self, env, crash_on_step):
+        super().__init__(env)
+        self.crash_on_step = crash_on_step
+        self.steps = 0
+
+    def step(self, action):
+        self.steps += 1
+        if self.steps == self.crash_on_step:
+            os._exit(1)
+        return self.env.step(action)
+
+
+def make_crashing_env():
+    return CrashingEnv(make_env(), crash_on_step=3)
+
+
+@pytest.fixture
+def actions():
+    return np.random.default_rng(0).integers(0, 6, size=(50, 3, 2))
+
+
+class TestSharedMemoryVecEnv:
+    def test_matches_local_envs(self, actions):
+        vec_env = SharedMemoryVecEnv([make_env] * 3, start_method="fork")
+        local = [make_env() for _ in range(3)]
+        try:
+            obs = vec_env.reset()
+            assert np.array_equal(obs, np.stack([env.reset()[0] for env in local]))
+            for step_actions in actions:
+                obs, rewards, dones, infos = vec_env.step(step_actions)
+                for i, env in enumerate(local):
+                    expected_obs, expected_reward, terminated, *_ = env.step(step_actions[i])
+                    assert np.array_equal(obs[i], expected_obs)
+                    assert rewards[i] == pytest.approx(expected_reward, abs=1e-6)
+                    assert dones[i] == terminated
+            assert vec_env.get_attr("in_process") == [True] * 3
+        finally:
+            vec_env.close()
+
+    def test_restarts_crashed_worker(self, actions):
+        vec_env = SharedMemoryVecEnv([make_env, make_crashing_env], start_method="fork", step_timeout=10.0)
+        try:
+            vec_env.reset()
+            for step in range(4):
+                obs, rewards, dones, infos = vec_env.step(actions[step, :2])
+                if step == 2:
+                    assert dones.tolist() == [False, True]
+                    assert infos[1]["worker_restarted"]
+                    assert infos[1]["terminal_observation"].shape == (8,)
+                    assert rewards[1] == 0.0
+                else:
+                    assert not dones.any()
+            assert vec_env.restarts == 1
+            assert obs[1, 2] == 1.0  # Fresh match after the restart
+        finally:
+            vec_env.close()
+
+    def test_restarts_worker_killed_between_steps(self, actions):
+        vec_env = SharedMemoryVecEnv([make_env, make_env], start_method="fork", step_timeout=10.0)
+        try:
+            vec_env.reset()
+            vec_env.processes[0].kill()
+            vec_env.processes[0].join(timeout=5)
+            obs, rewards, dones, infos = vec_env.step(actions[0, :2])
+            assert dones.tolist() == [True, False]
+            assert infos[0]["worker_restarted"]
+            assert vec_env.restarts == 1
+
+            vec_env.processes[1].kill()
+            vec_env.processes[1].join(timeout=5)
+            obs = vec_env.reset()
+            assert vec_env.restarts == 2
+            assert obs[:, 2].tolist() == [1.0, 1.0]
+            vec_env.step(actions[1, :2])
+        finally:
+            vec_env.close()
+
+    def test_gives_up_after_max_restarts(self, actions):
+        vec_env = SharedMemoryVecEnv([make_crashing_env], start_method="fork", step_timeout=10.0, max_restarts=0)
+        try:
+            vec_env.reset()
+            with pytest.raises(WorkerCrashedError):
+                for step in range(3):
+                    vec_env.step(actions[step, :1])
+        finally:
+            vec_env.close()
@@ -0,0 +1,208 @@
+import random
+
+import pytest
+
+from src.constants import (ACTION_ATTACK, ACTION_GUARD, ACTION_IDLE,
+                           ACTION_JUMP, ACTION_MOVE_LEFT, ACTION_MOVE_RIGHT,
+                           ATTACK_DURATION, FPS, HIT_STUN_DURATION,
+                           INITIAL_HEALTH, NUM_ACTIONS, PUNCH_DAMAGE,
+                           ROUND_TIME, SCREEN_HEIGHT)
+from src.game_engine.rect import Rect
+from src.game_engine.simulation import Simulation
+from src.game_engine.states import (EVENT_HIT, EVENT_SETTLE, NUM_EVENTS,
+                                    TRANSITIONS, PlayerState)
+
+
+@pytest.fixture
+def simulation():
+    return Simulation()
+
+
+def _close_distance(sim: Simulation) -> None:
+    """Walk both players towards each other until their bodies overlap range."""
+    while sim.player2.rect.x - sim.player1.rect.right > 10:
+        sim.step(ACTION_MOVE_RIGHT, ACTION_MOVE_LEFT)
+
+
+class TestRect:
+    def test_properties(self):
+        rect = Rect(10, 20, 30, 40)
+        assert (rect.left, rect.right, rect.top, rect.bottom) == (10, 40, 20, 60)
+        assert (rect.centerx, rect.centery) == (25, 40)
+        rect.right = 100
+        assert rect.x == 70
+        rect.bottom = 200
+        assert rect.y == 160
+        assert tuple(rect) == (70, 160, 30, 40)
+
+    def test_colliderect_matches_pygame_semantics(self):
+        rect = Rect(0, 0, 10, 10)
+        assert rect.colliderect(Rect(5, 5, 10, 10))
+        assert not rect.colliderect(Rect(10, 0, 10, 10))  # Touching edges
+        assert not rect.colliderect(Rect(5, 5, 0, 10))  # Zero width
+
+
+class TestSimulation:
+    def test_initial_state(self, simulation):
+        assert simulation.player1.health == INITIAL_HEALTH
+        assert simulation.player2.health == INITIAL_HEALTH
+        assert simulation.player1.rect.bottom == SCREEN_HEIGHT
+        assert simulation.player1.font is None
+        assert simulation.round_timer == ROUND_TIME
+        assert not simulation.round_over
+
+    def test_step_moves_players(self, simulation):
+        p1_x = simulation.player1.rect.x
+        p2_x = simulation.player2.rect.x
+        simulation.step(ACTION_MOVE_RIGHT, ACTION_MOVE_LEFT)
+        assert simulation.player1.rect.x > p1_x
+        assert simulation.player2.rect.x < p2_x
+        assert simulation.frame_count == 1
+
+    def test_attack_hits_opponent(self, simulation):
+        _close_distance(simulation)
+        simulation.step(ACTION_ATTACK, ACTION_IDLE)
+        assert simulation.player2.health == INITIAL_HEALTH - PUNCH_DAMAGE
+        assert simulation.player2.state == PlayerState.HIT
+        assert not simulation.player1.attack_hitbox.active
+
+    def test_round_ends_on_ko(self, simulation):
+        _close_distance(simulation)
+        frames = 0
+        while not simulation.round_over and frames < 10 * FPS:
+            simulation.step(ACTION_ATTACK, ACTION_IDLE)
+            frames += 1
+        assert simulation.round_over
+        assert simulation.player2.health == 0
+        assert simulation.player2.state == PlayerState.KO
+
+    def test_round_ends_on_time_out(self, simulation):
+        for _ in range((ROUND_TIME + 1) * FPS + 1):
+            if simulation.step(ACTION_IDLE, ACTION_IDLE):
+                break
+        assert simulation.round_over
+        assert simulation.round_timer == 0
+
+    def test_reset(self, simulation):
+        simulation.step(ACTION_MOVE_RIGHT, ACTION_MOVE_LEFT)
+        simulation.reset()
+        assert simulation.frame_count == 0
+        assert simulation.player1.rect.x == 100
+        assert simulation.player2.rect.bottom == SCREEN_HEIGHT
+
+
+class TestStateMachine:
+    def test_transition_table_is_complete(self):
+        assert len(TRANSITIONS) == len(PlayerState)
+        assert all(len(row) == NUM_EVENTS for row in TRANSITIONS)
+
+    def test_ko_is_absorbing(self):
+        assert set(TRANSITIONS[PlayerState.KO]) == {PlayerState.KO}
+
+    def test_hit_reaction_survives_settle(self):
+        assert TRANSITIONS[PlayerState.HIT][EVENT_SETTLE] == PlayerState.HIT
+        assert TRANSITIONS[PlayerState.ATTACK][EVENT_SETTLE] == PlayerState.IDLE
+        assert TRANSITIONS[PlayerState.GUARD][EVENT_HIT] == PlayerState.HIT
+
+
+class TestStateSnapshot:
+    def test_round_trip_restores_in_place(self, simulation):
+        _close_distance(simulation)
+        simulation.step(ACTION_ATTACK, ACTION_IDLE)
+        snapshot = simulation.save_state()
+        assert len(snapshot) == Simulation.STATE_SIZE
+
+        player1 = simulation.player1
+        hitbox = player1.attack_hitbox
+        for _ in range(30):
+            simulation.step(ACTION_MOVE_LEFT, ACTION_ATTACK)
+        simulation.load_state(snapshot)
+
+        assert simulation.player1 is player1
+        assert simulation.player1.attack_hitbox is hitbox
+        assert simulation.save_state() == snapshot
+        assert simulation.player2.state == PlayerState.HIT
+        assert simulation.player2.hurtbox.rect.topleft == simulation.player2.rect.topleft
+
+    def test_resimulation_after_restore_is_identical(self, simulation):
+        actions = [(ACTION_MOVE_RIGHT, ACTION_MOVE_LEFT)] * 40 + [
+            (ACTION_ATTACK, ACTION_GUARD),
+            (ACTION_IDLE, ACTION_ATTACK),
+        ] * 20
+        simulation.step(ACTION_MOVE_RIGHT, ACTION_IDLE)
+        buffer = bytearray(Simulation.STATE_SIZE)
+        simulation.save_state(buffer)
+
+        for p1_action, p2_action in actions:
+            simulation.step(p1_action, p2_action)
+        expected = simulation.save_state()
+
+        simulation.load_state(buffer)
+        for p1_action, p2_action in actions:
+            simulation.step(p1_action, p2_action)
+        assert simulation.save_state() == expected
+
+
+class TestDeterministicMode:
+    @staticmethod
+    def _run(actions, sim: Simulation):
+        hashes = []
+        for p1_action, p2_action in actions:
+            sim.step(p1_action, p2_action)
+            hashes.append(sim.state_hash())
+        return hashes
+
+    @pytest.fixture
+    def actions(self):
+        rng = random.Random(7)
+        towards = [(ACTION_MOVE_RIGHT, ACTION_MOVE_LEFT)] * 45
+        return towards + [
+            (rng.randrange(NUM_ACTIONS), rng.randrange(NUM_ACTIONS)) for _ in range(600)
+        ]
+
+    def test_same_inputs_same_hashes(self, actions):
+        first = self._run(actions, Simulation(deterministic=True))
+        second = self._run(actions, Simulation(deterministic=True))
+        assert first == second
+
+    def test_different_inputs_diverge(self, actions):
+        first = self._run(actions, Simulation(deterministic=True))
+        changed = list(actions)
+        changed[10] = (ACTION_JUMP, ACTION_IDLE)
+        second = self._run(changed, Simulation(deterministic=True))
+        assert first[:10] == second[:10]
+        assert first[-1] != second[-1]
+
+    def test_integer_state_and_frame_timers(self):
+        sim = Simulation(deterministic=True)
+        _close_distance(sim)
+        sim.step(ACTION_ATTACK, ACTION_IDLE)
+        player1, player2 = sim.player1, sim.player2
+        assert isinstance(player1._pos_x, int) and isinstance(player1.vel_y, int)
+        assert player1.attack_timer == round(ATTACK_DURATION * FPS) - 1
+        assert player2.hit_stun_timer == round(HIT_STUN_DURATION * FPS)
+        assert player2.health == INITIAL_HEALTH - PUNCH_DAMAGE
+
+        snapshot = sim.save_state()
+        sim.step(ACTION_IDLE, ACTION_IDLE)
+        sim.load_state(snapshot)
+        assert isinstance(player1._pos_x, int) and isinstance(sim.timer_accumulator, int)
+        assert sim.save_state() == snapshot
+
+    def test_round_timer_counts_frames(self):
+        sim = Simulation(deterministic=True)
+        for _ in range(FPS - 1):
+            sim.step(ACTION_IDLE, ACTION_IDLE)
+        assert sim.round_timer == ROUND_TIME
+        sim.step(ACTION_IDLE, ACTION_IDLE, dt=5.0)  # dt is ignored in deterministic mode
+        assert sim.round_timer == ROUND_TIME - 1
+        assert sim.timer_accumulator == 0
+
+    def test_jump_lands_back_on_ground(self):
+        sim = Simulation(deterministic=True)
+        sim.step(ACTION_JUMP, ACTION_IDLE)
+        assert sim.player1.rect.bottom < SCREEN_HEIGHT
+        for _ in range(2 * FPS):
+            sim.step(ACTION_IDLE, ACTION_IDLE)
+        assert sim.player1.rect.bottom == SCREEN_HEIGHT
+        assert not sim.player1.is_jumping
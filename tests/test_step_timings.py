@@ -0,0 +1,115 @@
+import asyncio
+import io
+import queue
+import threading
+
+from stable_baselines3 import PPO
+from stable_baselines3.common.vec_env import DummyVecEnv
+
+from src.fighting_env import STEP_STAGES, FightingEnv
+from src.networking import protocol
+from src.networking.bridge import AsyncBridgeQueue
+from src.networking.webrtc import WebRTCClient
+from src.rl_training.callbacks import StepTimingCallback
+from src.rl_training.wrappers import FlattenActionSpaceWrapper
+from src.utils.histogram import StageTimings
+
+
+class EchoChannel:
+    """Data channel stub that answers every action with an action_result."""
+
+    readyState = "open"
+
+    def __init__(self):
+        self.handlers = {}
+
+    def on(self, event):
+        def register(handler):
+            self.handlers[event] = handler
+            return handler
+        return register
+
+    def send(self, data):
+        message = protocol.decode(data)
+        reply = protocol.encode_result(protocol.MSG_ACTION_RESULT, [0.5] * 8, seq=message.seq)
+        asyncio.get_running_loop().call_soon(self.handlers["message"], reply)
+
+
+class TestStageTimings:
+    def test_pop_merge_and_dump(self):
+        timings = StageTimings(("send", "reward"))
+        timings.record("send", 0.002)
+        timings.record("reward", 0.0001)
+        timings.timeouts = 2
+        snapshot = timings.pop()
+        assert timings.histograms["send"].count == 0 and timings.timeouts == 0
+
+        total = StageTimings()
+        total.merge(snapshot)
+        total.merge(snapshot)
+        assert total.histograms["send"].count == 2
+        assert total.timeouts == 4
+        out = io.StringIO()
+        total.dump(out)
+        assert "send" in out.getvalue() and "timeouts: 4" in out.getvalue()
+
+
+class TestFightingEnvTimings:
+    def test_in_process_stages(self):
+        env = FightingEnv(backend_peer_id="test", in_process=True)
+        env.reset()
+        for _ in range(10):
+            env.step((1, 0))
+        timings = env.pop_timings()
+        assert set(STEP_STAGES) <= set(timings.histograms)
+        assert timings.histograms["remote"].count == 10
+        assert timings.histograms["reward"].count == 10
+        assert env.timings.histograms["remote"].count == 0
+
+    def test_timeouts_are_counted_separately(self):
+        env = FightingEnv(backend_peer_id="test", headless_mode=True, step_timeout=0.05)
+        try:
+            env.reset()
+            env.action_queue.put({"type": "close"})
+            env.game_client._thread.join(timeout=5)
+            env.step((0, 0))
+            assert env.timings.timeouts == env.step_timeouts == 1
+            assert env.timings.histograms["enqueue"].count == 1
+            assert env.timings.histograms["reward"].count == 0
+        finally:
+            env.close()
+
+    def test_webrtc_client_transport_stages(self):
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        try:
+            timings = StageTimings(STEP_STAGES)
+            client = WebRTCClient(AsyncBridgeQueue(), queue.Queue(), binary=True, timings=timings)
+            client.loop = loop
+            client.data_channel = EchoChannel()
+            loop.call_soon_threadsafe(client.action_queue.attach, loop)
+            loop.call_soon_threadsafe(client._setup_channel_events)
+
+            client.action_queue.put({"type": "action", "p1Action": 1, "p2Action": 0, "seq": 42})
+            result = client.result_queue.get(timeout=1)
+            assert result["seq"] == 42 and "received_at" in result
+            for stage in ("send", "remote", "decode"):
+                assert timings.histograms[stage].count == 1, stage
+            client.action_queue.put({"type": "close"})
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=5)
+
+
+class TestStepTimingCallback:
+    def test_logs_timings_during_training(self):
+        vec_env = DummyVecEnv(
+            [lambda: FlattenActionSpaceWrapper(FightingEnv(backend_peer_id="test", in_process=True))] * 2
+        )
+        out = io.StringIO()
+        callback = StepTimingCallback(dump_file=out)
+        PPO("MlpPolicy", vec_env, n_steps=32, batch_size=32, n_epochs=1, seed=0).learn(64, callback=callback)
+        assert callback.enabled
+        assert callback.total_timings.histograms["remote"].count == 64
+        assert "remote" in out.getvalue()
@@ -0,0 +1,101 @@
+import io
+import sys
+
+import pytest
+
+from src.constants import ACTION_ATTACK, ACTION_IDLE, ACTION_JUMP, BLUE
+from src.game_engine.simulation import Simulation
+from src.utils.tracing import (EV_ACTION, EV_COLLISION, EV_DAMAGE, EV_JUMP,
+                               EV_LAND, TRACE_ALL, TRACE_COMBAT, TRACE_INPUT,
+                               TRACE_PHYSICS, TRACER, Tracer,
+                               install_crash_dump, parse_categories,
+                               subject_id)
+from tests.test_simulation import _close_distance
+
+
+@pytest.fixture
+def tracer():
+    saved = TRACER.mask
+    TRACER.mask = 0
+    TRACER.clear()
+    yield TRACER
+    TRACER.mask = saved
+    TRACER.clear()
+
+
+class TestTracer:
+    def test_ring_keeps_latest_events(self):
+        ring = Tracer(capacity=4, mask=TRACE_ALL)
+        for value in range(6):
+            ring.frame = value
+            ring.record(EV_ACTION, 0, value)
+        assert len(ring) == 4
+        assert [event.a for event in ring.events()] == [2, 3, 4, 5]
+        assert [event.frame for event in ring.events(last=2)] == [4, 5]
+
+    def test_category_filter_on_read(self):
+        ring = Tracer(capacity=8, mask=TRACE_ALL)
+        ring.record(EV_JUMP, 0, -15)
+        ring.record(EV_DAMAGE, 0, 10, 90)
+        assert [event.code for event in ring.events(TRACE_COMBAT)] == [EV_DAMAGE]
+        assert ring.format_events(TRACE_COMBAT) == ["[     0] damage       (0, 0, 0) damage=10 health=90"]
+
+    def test_parse_categories(self):
+        assert parse_categories("combat, input") == TRACE_COMBAT | TRACE_INPUT
+        assert parse_categories("") == 0
+        with pytest.raises(ValueError):
+            parse_categories("audio")
+
+
+class TestEngineTracing:
+    def test_disabled_records_nothing(self, tracer, capsys):
+        sim = Simulation()
+        for _ in range(30):
+            sim.step(ACTION_ATTACK, ACTION_JUMP)
+        assert tracer.total == 0
+        assert capsys.readouterr().out == ""
+
+    def test_combat_events(self, tracer):
+        tracer.enable(TRACE_COMBAT)
+        sim = Simulation()
+        _close_distance(sim)
+        tracer.clear()
+        sim.step(ACTION_ATTACK, ACTION_IDLE)
+        sim.step(ACTION_IDLE, ACTION_IDLE)
+
+        events = tracer.events()
+        codes = [event.code for event in events]
+        assert EV_COLLISION in codes and EV_DAMAGE in codes
+        assert EV_ACTION not in codes and EV_JUMP not in codes
+        collision = events[codes.index(EV_COLLISION)]
+        assert collision.subject == sim.player1.trace_id
+        assert collision.a == sim.player2.trace_id
+        assert events[codes.index(EV_DAMAGE)].b == sim.player2.health
+
+    def test_physics_and_input_events(self, tracer):
+        tracer.enable(TRACE_PHYSICS | TRACE_INPUT)
+        sim = Simulation()
+        sim.step(ACTION_JUMP, ACTION_IDLE)
+        while sim.player1.is_jumping:
+            sim.step(ACTION_IDLE, ACTION_IDLE)
+
+        codes = [event.code for event in tracer.events()]
+        assert codes.count(EV_JUMP) == 1 and codes.count(EV_LAND) == 1
+        jump = tracer.events()[codes.index(EV_JUMP)]
+        assert jump.subject == subject_id(BLUE) and jump.frame == 1
+        assert tracer.events()[codes.index(EV_LAND)].frame == sim.frame_count
+        assert EV_ACTION in codes
+
+    def test_crash_dump(self, tracer, monkeypatch):
+        tracer.enable(TRACE_INPUT)
+        Simulation().step(ACTION_JUMP, ACTION_IDLE)
+        called = []
+        monkeypatch.setattr(sys, "excepthook", lambda *args: called.append(args))
+        out = io.StringIO()
+        uninstall = install_crash_dump(tracer, out)
+        try:
+            sys.excepthook(RuntimeError, RuntimeError("boom"), None)
+        finally:
+            uninstall()
+        assert "action" in out.getvalue()
+        assert len(called) == 1
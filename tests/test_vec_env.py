@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+from stable_baselines3.common.callbacks import EvalCallback
+
+from src.constants import ACTION_ATTACK, ACTION_IDLE, ACTION_JUMP
+from src.fighting_env import FightingEnv
+from src.rl_training.policies import PolicyManager
+from src.rl_training.vec_env import FightingVecEnv
+
+
+def _random_actions(num_envs, frames, seed=0):
+    return np.random.default_rng(seed).integers(0, 6, size=(frames, num_envs, 2))
+
+
+class TestFightingVecEnv:
+    def test_matches_in_process_env(self):
+        num_envs, frames = 4, 300
+        vec_env = FightingVecEnv(num_envs)
+        envs = [FightingEnv(backend_peer_id="test", in_process=True) for _ in range(num_envs)]
+
+        obs = vec_env.reset()
+        assert np.array_equal(obs, np.stack([env.reset()[0] for env in envs]))
+        for frame, actions in enumerate(_random_actions(num_envs, frames)):
+            obs, rewards, dones, _ = vec_env.step(actions)
+            for i, env in enumerate(envs):
+                expected_obs, expected_reward, terminated, *_ = env.step(tuple(actions[i]))
+                assert dones[i] == terminated
+                assert rewards[i] == pytest.approx(expected_reward, rel=1e-5, abs=1e-6), f"frame {frame}"
+                if terminated:
+                    expected_obs, _ = env.reset()
+                assert np.array_equal(obs[i], expected_obs), f"frame {frame}"
+
+    def test_auto_reset_and_episode_info(self):
+        vec_env = FightingVecEnv(2)
+        vec_env.reset()
+        sim = vec_env.simulation
+        sim.rect_x[0] = [300, 300 + 55]
+        sim.pos_x[0] = sim.rect_x[0]
+        sim.health[0, 1] = 1
+
+        obs, rewards, dones, infos = vec_env.step(np.array([[ACTION_ATTACK, ACTION_IDLE]] * 2))
+        assert dones.tolist() == [True, False]
+        assert infos[0]["player_won"]
+        assert infos[0]["episode"]["l"] == 1
+        assert infos[0]["episode"]["r"] == pytest.approx(rewards[0])
+        assert infos[0]["terminal_observation"][6] == 0.0
+        assert obs[0, 6] == 1.0  # Already reset
+        assert infos[1] == {}
+
+    def test_action_repeat(self):
+        vec_env = FightingVecEnv(2, action_repeat=4)
+        vec_env.reset()
+        sim = vec_env.simulation
+        sim.rect_x[0] = [300, 300 + 55]
+        sim.pos_x[0] = sim.rect_x[0]
+        sim.health[0, 1] = 1
+        for _ in range(3):
+            obs, rewards, dones, infos = vec_env.step(np.array([[ACTION_ATTACK, ACTION_IDLE]] * 2))
+            if dones[0]:
+                break
+        assert dones.tolist() == [True, False]
+        assert infos[0]["episode"]["l"] == 1
+        assert infos[0]["terminal_observation"][6] == 0.0
+        assert sim.frame_count[1] == 4
+        with pytest.raises(ValueError):
+            FightingVecEnv(1, action_repeat=0)
+
+    def test_observation_pooling(self):
+        vec_env = FightingVecEnv(2, action_repeat=40, observation_pooling="max")
+        vec_env.reset()
+        sim = vec_env.simulation
+        sim.health[1, 1] = 1
+        sim.rect_x[1] = [300, 300 + 55]
+        sim.pos_x[1] = sim.rect_x[1]
+        obs, _, dones, infos = vec_env.step(np.array([[ACTION_JUMP, ACTION_IDLE], [ACTION_ATTACK, ACTION_IDLE]]))
+        # The policy sees the peak of the jump; rewards use the last frame
+        assert obs[0, 1] > vec_env._obs[0, 1]
+        assert dones.tolist() == [False, True]
+        assert infos[1]["terminal_observation"][6] == 0.0
+        assert np.array_equal(obs[1], vec_env._obs[1])  # Reset match: one frame
+        with pytest.raises(ValueError):
+            FightingVecEnv(1, observation_pooling="median")
+
+    def test_trains_with_policy_manager_and_eval_callback(self, tmp_path):
+        vec_env = FightingVecEnv(8)
+        eval_callback = EvalCallback(
+            FightingVecEnv(1), eval_freq=64, n_eval_episodes=1, log_path=str(tmp_path), warn=False
+        )
+        manager = PolicyManager("PPO", vec_env, {"n_steps": 32, "batch_size": 64, "n_epochs": 1}, seed=0)
+        manager.get_current_policy().learn(total_timesteps=512, callback=eval_callback)
+        assert eval_callback.n_calls > 0
+        assert np.isfinite(eval_callback.last_mean_reward)